@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+'''
+Per-node tick overhead of py_trees generators versus py_branches.fast.
+
+Ticks two trees and reports nanoseconds per node per tick:
+
+    chain       `depth` py_branches decorators around a single leaf
+    sequence    a py_trees Sequence of `depth` RunEveryX(leaf) branches
+
+for each of:
+
+    generator   root.tick_once(), i.e. one generator per node
+    fast_tick   fast_tick(root)
+    tree.tick   BehaviourTree.tick() (no visitors)
+    tick_tree   fast.tick_tree() on the same tree
+
+py_trees composites have no generator-free path, so in the sequence tree
+fast_tick() ticks the Sequence and everything below it through generators
+and only saves the cost of the dispatch check.
+
+Usage:
+    python benchmarks/fast_tick.py [--ticks N] [--depths 1 4 16 64]
+'''
+import argparse
+import os
+import sys
+import time
+
+import py_trees
+
+# Run from a checkout without installing the package.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from py_branches.alternating import ActivateBehavior
+from py_branches.alternating import RunEveryX
+from py_branches.fast import fast_tick
+from py_branches.fast import tick_tree
+from py_branches.timeout import Timeout
+
+
+def build_chain(depth: int) -> py_trees.behaviour.Behaviour:
+    node = py_trees.behaviours.Success('leaf')
+    for i in range(depth):
+        kind = i % 3
+        if kind == 0:
+            node = RunEveryX(node, f'every_x_{i}', (1, 1))
+        elif kind == 1:
+            node = ActivateBehavior(node, f'activate_{i}', True)
+        else:
+            node = Timeout(node, f'timeout_{i}', 1e9)
+    return node
+
+
+def build_sequence(depth: int) -> py_trees.behaviour.Behaviour:
+    children = [RunEveryX(py_trees.behaviours.Success(f'leaf_{i}'), f'every_x_{i}', (1, 1)) for i in range(depth)]
+    return py_trees.composites.Sequence('sequence', memory=False, children=children)
+
+
+def per_node_ns(tick, nodes: int, ticks: int) -> float:
+    for _ in range(min(ticks, 1000)):
+        tick()
+    start = time.perf_counter_ns()
+    for _ in range(ticks):
+        tick()
+    return (time.perf_counter_ns() - start) / (ticks * nodes)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--ticks', type=int, default=20000)
+    parser.add_argument('--depths', type=int, nargs='+', default=[1, 4, 16, 64])
+    args = parser.parse_args()
+
+    print(f'{"tree":>8} {"depth":>5} {"generator":>10} {"fast_tick":>10} {"tree.tick":>10} {"tick_tree":>10}'
+          '  (ns per node per tick)')
+    for kind, build in (('chain', build_chain), ('sequence', build_sequence)):
+        for depth in args.depths:
+            root = build(depth)
+            nodes = sum(1 for _ in root.iterate())
+            tree = py_trees.trees.BehaviourTree(root)
+            generator = per_node_ns(root.tick_once, nodes, args.ticks)
+            fast = per_node_ns(lambda: fast_tick(root), nodes, args.ticks)
+            tree_tick = per_node_ns(tree.tick, nodes, args.ticks)
+            fast_tree = per_node_ns(lambda: tick_tree(tree), nodes, args.ticks)
+            print(f'{kind:>8} {depth:>5} {generator:>10.0f} {fast:>10.0f} {tree_tick:>10.0f} {fast_tree:>10.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,10 +1,36 @@
-from . import alternating
-from . import blackboard
-from . import cooldown
-from . import counter
-from . import latch
-from . import pause
-from . import random
-from . import retry
-from . import timeout
-from . import visitors
+import importlib
+
+# Submodules are imported on first attribute access so that, e.g., using
+# py_branches.latch does not pay for numpy/scikit-learn via py_branches.pause.
+_SUBMODULES = (
+    'activity',
+    'alternating',
+    'blackboard',
+    'clock',
+    'cooldown',
+    'counter',
+    'fast',
+    'latch',
+    'numeric',
+    'pause',
+    'random',
+    'retry',
+    'rng',
+    'runner',
+    'timeout',
+    'visitors',
+)
+
+__all__ = list(_SUBMODULES)
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        module = importlib.import_module(f'.{name}', __name__)
+        globals()[name] = module
+        return module
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_SUBMODULES))
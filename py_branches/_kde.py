@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+'''
+1-D Gaussian KDE samplers used by pause.PausePDF.
+
+Kept in their own module so that numpy (and optionally scikit-learn) are only
+imported once a PausePDF is actually built.
+'''
+import math
+import os
+import threading
+import warnings
+from collections import OrderedDict
+from typing import Dict
+from typing import Tuple
+
+import numpy as np
+
+
+# Acklam's rational approximation of the standard normal quantile function
+# (relative error < 1.2e-9 over (0, 1)).
+_PPF_A = (-3.969683028665376e+01, 2.209460984245205e+02, -2.759285104469687e+02,
+          1.383577518672690e+02, -3.066479806614716e+01, 2.506628277459239e+00)
+_PPF_B = (-5.447609879822406e+01, 1.615858368580409e+02, -1.556989798598866e+02,
+          6.680131188771972e+01, -1.328068155288572e+01)
+_PPF_C = (-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e+00,
+          -2.549732539343734e+00, 4.374664141464968e+00, 2.938163982698783e+00)
+_PPF_D = (7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e+00,
+          3.754408661907416e+00)
+_PPF_P_LOW = 0.02425
+
+# Abramowitz & Stegun 7.1.26 approximation of erf (absolute error < 1.5e-7).
+_ERF_P = 0.3275911
+_ERF_A = (0.254829592, -0.284496736, 1.421413741, -1.453152027, 1.061405429)
+
+# Sampling maps uniforms into the open interval (0, 1) so the quantile stays finite.
+_U_EPS = np.finfo(np.float64).eps
+
+
+def _polyval(coeffs, x):
+    result = np.full_like(x, coeffs[0])
+    for c in coeffs[1:]:
+        result = result * x + c
+    return result
+
+
+def norm_cdf(z: np.ndarray) -> np.ndarray:
+    '''Standard normal CDF, vectorized.  Accepts +/-inf.'''
+    z = np.asarray(z, dtype=np.float64)
+    x = np.abs(z) / math.sqrt(2.0)
+    t = 1.0 / (1.0 + _ERF_P * x)
+    with np.errstate(over='ignore', invalid='ignore'):
+        erf = 1.0 - t * _polyval(_ERF_A[::-1], t) * np.exp(-x * x)
+    erf = np.where(np.isinf(x), 1.0, erf)
+    return 0.5 * (1.0 + np.copysign(erf, z))
+
+
+def norm_ppf(u: np.ndarray) -> np.ndarray:
+    '''Standard normal quantile function, vectorized, for u in (0, 1).'''
+    u = np.asarray(u, dtype=np.float64)
+    x = np.empty_like(u)
+
+    low = u < _PPF_P_LOW
+    high = u > 1.0 - _PPF_P_LOW
+    mid = ~(low | high)
+
+    q = u[mid] - 0.5
+    r = q * q
+    x[mid] = _polyval(_PPF_A, r) * q / (_polyval(_PPF_B, r) * r + 1.0)
+
+    q = np.sqrt(-2.0 * np.log(u[low]))
+    x[low] = _polyval(_PPF_C, q) / (_polyval(_PPF_D, q) * q + 1.0)
+
+    q = np.sqrt(-2.0 * np.log1p(-u[high]))
+    x[high] = -_polyval(_PPF_C, q) / (_polyval(_PPF_D, q) * q + 1.0)
+    return x
+
+
+# Truncations cached per sampler; bounds that keep changing (e.g. derived from a
+# schedule) evict the least recently used ones.
+_MAX_TRUNCATIONS = 8
+
+
+class GaussianKDESampler(object):
+    '''
+    numpy-only sampler for a 1-D Gaussian KDE truncated to [min_t, max_t].
+
+    A draw picks a kernel (sample point) with probability proportional to the
+    kernel's mass inside the bounds, then inverts that kernel's truncated normal
+    CDF.  This matches rejection sampling from the untruncated KDE without ever
+    rejecting a draw.  Per-bound kernel masses are cached for the most recently
+    used bounds.
+    '''
+    def __init__(self, samples: np.ndarray, bandwidth: float):
+        if bandwidth <= 0.0:
+            raise ValueError(f'bandwidth({bandwidth}) must be positive.')
+        self._samples = np.asarray(samples, dtype=np.float64).ravel()
+        self._bandwidth = float(bandwidth)
+        self._truncations: 'OrderedDict[Tuple[float, float], Tuple[np.ndarray, np.ndarray, np.ndarray]]' = \
+            OrderedDict()
+
+    def _truncation(self, min_t: float, max_t: float):
+        key = (min_t, max_t)
+        truncation = self._truncations.get(key)
+        if truncation is not None:
+            self._truncations.move_to_end(key)
+        else:
+            cdf_low = norm_cdf((min_t - self._samples) / self._bandwidth)
+            mass = norm_cdf((max_t - self._samples) / self._bandwidth) - cdf_low
+            np.clip(mass, 0.0, None, out=mass)
+            truncation = (cdf_low, mass, np.cumsum(mass))
+            self._truncations[key] = truncation
+            if len(self._truncations) > _MAX_TRUNCATIONS:
+                self._truncations.popitem(last=False)
+        return truncation
+
+    def sample(self, n: int, rng: np.random.Generator, min_t: float, max_t: float) -> np.ndarray:
+        cdf_low, mass, cumulative = self._truncation(min_t, max_t)
+        total = cumulative[-1]
+        if not total > 0.0:
+            raise ValueError(f'KDE has no probability mass within [{min_t}, {max_t}].')
+        kernels = np.searchsorted(cumulative, rng.random(n) * total, side='right')
+        np.minimum(kernels, len(cumulative) - 1, out=kernels)
+        u = cdf_low[kernels] + rng.random(n) * mass[kernels]
+        np.clip(u, _U_EPS, 1.0 - _U_EPS, out=u)
+        draws = self._samples[kernels] + self._bandwidth * norm_ppf(u)
+        return np.clip(draws, min_t, max_t, out=draws)
+
+
+# Rejection sampling from sklearn gives up after this many batches, each at most this many
+# times the requested size.
+_SKLEARN_MAX_BATCHES = 32
+_SKLEARN_MAX_BATCH_FACTOR = 64
+
+
+class SklearnKDESampler(object):
+    '''
+    Sampler backed by sklearn.neighbors.KernelDensity.
+
+    Draws in batches and filters them against [min_t, max_t], sizing each
+    batch (with some headroom) from the acceptance rate seen so far.
+    '''
+    def __init__(self, samples: np.ndarray, bandwidth: float):
+        from sklearn.neighbors import KernelDensity
+        self._model = KernelDensity(bandwidth=bandwidth, kernel='gaussian')
+        self._model.fit(np.asarray(samples, dtype=np.float64).reshape(-1, 1))
+
+    def sample(self, n: int, rng: np.random.Generator, min_t: float, max_t: float) -> np.ndarray:
+        needed = n
+        draws = n
+        drawn = 0
+        accepted = []
+        for _ in range(_SKLEARN_MAX_BATCHES):
+            batch = self._model.sample(draws, random_state=int(rng.integers(2**32 - 1)))[:, 0]
+            batch = batch[(batch >= min_t) & (batch <= max_t)]
+            drawn += draws
+            accepted.append(batch[:needed])
+            needed -= len(accepted[-1])
+            if needed <= 0:
+                break
+            acceptance = max(n - needed, 1) / drawn
+            draws = min(int(1.25 * needed / acceptance) + 1, _SKLEARN_MAX_BATCH_FACTOR * n)
+        if needed == n:
+            raise ValueError(f'could not sample within [{min_t}, {max_t}] after {drawn} draws.')
+        return np.concatenate(accepted)
+
+
+KDE_BACKENDS = {
+    'numpy': GaussianKDESampler,
+    'sklearn': SklearnKDESampler,
+}
+
+
+# Process-wide caches shared by every PausePDF.  Entries are keyed by the resolved path and
+# remember the file's (mtime_ns, size) so an edited file is re-read on the next lookup.
+_cache_lock = threading.Lock()
+_samples_cache: Dict[str, Tuple[Tuple[int, int], np.ndarray]] = {}
+_sampler_cache: Dict[Tuple[str, float, str], Tuple[Tuple[int, int], object]] = {}
+
+
+def load_samples(filepath: str) -> np.ndarray:
+    '''
+    Read a 1-D array of float samples.
+
+    ``.npy`` files are memory-mapped instead of parsed.  Any other file is read
+    as text with one float per line; blank lines and ``#`` comments are ignored.
+    '''
+    if filepath.endswith('.npy'):
+        samples = np.load(filepath, mmap_mode='r')
+        if samples.dtype != np.float64:
+            samples = samples.astype(np.float64)
+        return samples.ravel()
+    with warnings.catch_warnings():
+        # An empty file is reported by the caller, not as a numpy warning.
+        warnings.simplefilter('ignore', UserWarning)
+        return np.loadtxt(filepath, dtype=np.float64, comments='#', ndmin=1)
+
+
+def _file_version(path: str) -> Tuple[int, int]:
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def shared_samples(filepath: str) -> np.ndarray:
+    '''Cached load_samples(), shared across callers until the file changes.'''
+    path = os.path.realpath(filepath)
+    version = _file_version(path)
+    with _cache_lock:
+        cached = _samples_cache.get(path)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+    samples = load_samples(path)
+    samples.setflags(write=False)
+    with _cache_lock:
+        _samples_cache[path] = (version, samples)
+    return samples
+
+
+def shared_sampler(filepath: str, bandwidth: float, backend: str):
+    '''
+    Sampler for (filepath, bandwidth, backend), built once and shared until the file changes.
+
+    Returns None when the file contains no samples.
+    '''
+    path = os.path.realpath(filepath)
+    version = _file_version(path)
+    key = (path, float(bandwidth), backend)
+    with _cache_lock:
+        cached = _sampler_cache.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+    samples = shared_samples(path)
+    if not len(samples):
+        return None
+    sampler = KDE_BACKENDS[backend](samples, bandwidth)
+    with _cache_lock:
+        _sampler_cache[key] = (version, sampler)
+    return sampler
+
+
+def clear_cache() -> None:
+    with _cache_lock:
+        _samples_cache.clear()
+        _sampler_cache.clear()
@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+'''
+Fixed-memory recorder for blackboard activity.
+
+py_trees records blackboard activity into an ActivityStream of ActivityItem
+objects that keep references to every value written.  ActivityRecorder is a
+drop-in replacement that keeps the last `capacity` activities in a
+preallocated ring of compact tuples: keys and clients are interned to integer
+ids and values are stored as a type tag plus a number or a truncated text
+field.  Memory use is bounded at construction, so the stream can stay enabled
+in long-running agents.  The numpy structured array is only built when the
+records are read or dumped.
+
+    recorder = enable_activity_recorder(capacity=100000)
+    recorder.install_crash_dump('/var/log/robot/blackboard.act')
+    ...
+    recorder.dump('blackboard.act')
+    replay = ActivityRecorder.load('blackboard.act')
+'''
+import json
+import logging
+import struct
+import sys
+import threading
+import uuid
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import numpy as np
+import py_trees
+
+from .clock import Clock
+from .clock import get_default_clock
+
+
+_MAGIC = b'PYBRACT1'
+_HEADER_LENGTH = struct.Struct('<I')
+
+_ACTIVITY_TYPES = [activity_type.value for activity_type in py_trees.blackboard.ActivityType]
+_ACTIVITY_TYPE_IDS = {value: index for index, value in enumerate(_ACTIVITY_TYPES)}
+
+# Value tags.  Anything that is not None/bool/int/float/str/bytes is stored as its repr().
+_TAG_NONE = 0
+_TAG_BOOL = 1
+_TAG_INT = 2
+_TAG_FLOAT = 3
+_TAG_STR = 4
+_TAG_BYTES = 5
+_TAG_REPR = 6
+
+_INT64_MIN = -2**63
+_INT64_MAX = 2**63 - 1
+
+_logger = logging.getLogger(__name__)
+
+
+def _record_dtype(text_size: int) -> np.dtype:
+    return np.dtype([
+        ('seq', '<u8'),
+        ('time', '<f8'),
+        ('key', '<u4'),
+        ('client', '<u4'),
+        ('activity', 'u1'),
+        ('previous_tag', 'u1'),
+        ('current_tag', 'u1'),
+        ('previous_number', '<f8'),
+        ('current_number', '<f8'),
+        ('previous_int', '<i8'),
+        ('current_int', '<i8'),
+        ('previous_text', f'S{text_size}'),
+        ('current_text', f'S{text_size}'),
+    ])
+
+
+def _stored_value(tag: int, number: float, integer: int, text: bytes):
+    if tag == _TAG_BOOL or tag == _TAG_INT:
+        return integer
+    if tag == _TAG_FLOAT:
+        return number
+    if tag >= _TAG_STR:
+        return text
+    return 0
+
+
+class ActivityRecorder(py_trees.blackboard.ActivityStream):
+    '''
+    Bounded blackboard activity stream backed by a preallocated ring buffer.
+
+    push() stores one tuple per activity; records() assembles them into a
+    numpy structured array.
+
+    Install it with enable_activity_recorder() (or by assigning it to
+    py_trees.blackboard.Blackboard.activity_stream).  Once full, each new
+    activity overwrites the oldest one.
+
+    Values are encoded compactly: None, bool, int and float are stored
+    exactly (ints outside 64 bits fall back to text), str and bytes are
+    stored truncated to text_size bytes, and any other object is stored as a
+    truncated repr().  Decoded items therefore hold copies, not references to
+    the live objects.
+
+    Args:
+        capacity (int): Number of activities kept.
+        text_size (int): Bytes kept for each str, bytes or repr() value.
+        clock (Clock): Time source for the per-activity timestamp.  Defaults
+            to the process default clock.
+    '''
+    def __init__(self, capacity: int = 4096,
+                       text_size: int = 32,
+                       clock: Optional[Clock] = None):
+        if capacity <= 0:
+            raise ValueError(f'capacity({capacity}) must be positive.')
+        if text_size <= 0:
+            raise ValueError(f'text_size({text_size}) must be positive.')
+        # ActivityStream.__init__ is not called: data is a property here.
+        self.maximum_size = capacity
+        self.clock = clock if clock is not None else get_default_clock()
+        self._capacity = capacity
+        self._text_size = text_size
+        # (seq, time, key, client, activity, previous_tag, previous_value, current_tag, current_value)
+        self._ring: List[Optional[tuple]] = [None] * capacity
+        self._count = 0
+        self._keys: List[str] = []
+        self._key_ids: Dict[str, int] = {}
+        self._clients: List[Tuple[str, str]] = []
+        self._client_ids: Dict[Tuple[str, uuid.UUID], int] = {}
+        self._crash_dump_path: Optional[str] = None
+        self._previous_excepthook = None
+        self._previous_threading_excepthook = None
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def dropped(self) -> int:
+        '''Number of activities overwritten since the last clear().'''
+        return max(self._count - self._capacity, 0)
+
+    def __len__(self) -> int:
+        return min(self._count, self._capacity)
+
+    def _intern_key(self, key: str) -> int:
+        key_id = self._key_ids.get(key)
+        if key_id is None:
+            key_id = self._key_ids[key] = len(self._keys)
+            self._keys.append(key)
+        return key_id
+
+    def _intern_client(self, client_name: str, client_id: uuid.UUID) -> int:
+        client_key = (client_name, client_id)
+        index = self._client_ids.get(client_key)
+        if index is None:
+            index = self._client_ids[client_key] = len(self._clients)
+            self._clients.append((client_name, str(client_id)))
+        return index
+
+    def _encode(self, value) -> Tuple[int, object]:
+        value_type = type(value)
+        if value is None:
+            return _TAG_NONE, 0
+        if value_type is bool:
+            return _TAG_BOOL, value
+        if value_type is int and _INT64_MIN <= value <= _INT64_MAX:
+            return _TAG_INT, value
+        if value_type is float:
+            return _TAG_FLOAT, value
+        if value_type is str:
+            return _TAG_STR, value.encode('utf-8')[:self._text_size]
+        if value_type is bytes:
+            return _TAG_BYTES, value[:self._text_size]
+        return _TAG_REPR, repr(value).encode('utf-8')[:self._text_size]
+
+    def push(self, activity_item: py_trees.blackboard.ActivityItem) -> None:
+        '''Record an activity, overwriting the oldest one once full.'''
+        count = self._count
+        self._ring[count % self._capacity] = (
+            count, self.clock.now(), self._intern_key(activity_item.key),
+            self._intern_client(activity_item.client_name, activity_item.client_id),
+            _ACTIVITY_TYPE_IDS[activity_item.activity_type],
+            *self._encode(activity_item.previous_value), *self._encode(activity_item.current_value))
+        self._count = count + 1
+
+    def clear(self) -> None:
+        '''Forget all recorded activities.  Interned keys and clients are kept.'''
+        self._count = 0
+
+    def _entries(self) -> List[tuple]:
+        if self._count <= self._capacity:
+            return self._ring[:self._count]
+        start = self._count % self._capacity
+        return self._ring[start:] + self._ring[:start]
+
+    def records(self) -> np.ndarray:
+        '''The recorded activities as a new structured array, earliest first.'''
+        entries = self._entries()
+        records = np.zeros(len(entries), dtype=_record_dtype(self._text_size))
+        if not entries:
+            return records
+        columns = list(zip(*entries))
+        for index, field in enumerate(('seq', 'time', 'key', 'client', 'activity')):
+            records[field] = columns[index]
+        for prefix, tags, values in (('previous', columns[5], columns[6]), ('current', columns[7], columns[8])):
+            records[f'{prefix}_tag'] = tags
+            records[f'{prefix}_int'] = [
+                value if tag == _TAG_BOOL or tag == _TAG_INT else 0 for tag, value in zip(tags, values)]
+            records[f'{prefix}_number'] = [
+                value if tag == _TAG_FLOAT else 0.0 for tag, value in zip(tags, values)]
+            records[f'{prefix}_text'] = [
+                value if tag >= _TAG_STR else b'' for tag, value in zip(tags, values)]
+        return records
+
+    @property
+    def keys(self) -> List[str]:
+        '''Interned keys, indexed by the 'key' field of records().'''
+        return list(self._keys)
+
+    @staticmethod
+    def _decode(tag: int, value):
+        if tag == _TAG_NONE:
+            return None
+        if tag == _TAG_BOOL:
+            return bool(value)
+        if tag == _TAG_INT or tag == _TAG_FLOAT or tag == _TAG_BYTES:
+            return value
+        return value.decode('utf-8', errors='ignore')
+
+    @property
+    def data(self) -> List[py_trees.blackboard.ActivityItem]:
+        '''
+        Recorded activities decoded into ActivityItems, earliest first.
+
+        Compatible with py_trees.display and other readers of
+        ActivityStream.data.  Values are decoded copies (see class docs).
+        '''
+        items = []
+        for _, _, key, client, activity, previous_tag, previous, current_tag, current in self._entries():
+            client_name, client_id = self._clients[client]
+            items.append(py_trees.blackboard.ActivityItem(
+                key=self._keys[key],
+                client_name=client_name,
+                client_id=uuid.UUID(client_id),
+                activity_type=_ACTIVITY_TYPES[activity],
+                previous_value=self._decode(previous_tag, previous),
+                current_value=self._decode(current_tag, current),
+            ))
+        return items
+
+    def dump(self, filepath: str) -> int:
+        '''
+        Write the recorded activities to a binary file readable by load().
+
+        The file is a magic string, a length-prefixed JSON header (record
+        dtype, interned keys and clients, activity type names) and the raw
+        records, earliest first.
+
+        Returns:
+            int: Number of activities written.
+        '''
+        records = self.records()
+        header = json.dumps({
+            'dtype': records.dtype.descr,
+            'count': len(records),
+            'dropped': self.dropped,
+            'text_size': self._text_size,
+            'keys': self._keys,
+            'clients': self._clients,
+            'activity_types': _ACTIVITY_TYPES,
+        }).encode('utf-8')
+        with open(filepath, 'wb') as f:
+            f.write(_MAGIC)
+            f.write(_HEADER_LENGTH.pack(len(header)))
+            f.write(header)
+            f.write(records.tobytes())
+        return len(records)
+
+    @classmethod
+    def load(cls, filepath: str) -> 'ActivityRecorder':
+        '''Read a file written by dump() into a new recorder sized to its contents.'''
+        with open(filepath, 'rb') as f:
+            if f.read(len(_MAGIC)) != _MAGIC:
+                raise ValueError(f'{filepath} is not an activity dump.')
+            (header_length,) = _HEADER_LENGTH.unpack(f.read(_HEADER_LENGTH.size))
+            header = json.loads(f.read(header_length).decode('utf-8'))
+            dtype = np.dtype([tuple(field) for field in header['dtype']])
+            records = np.frombuffer(f.read(), dtype=dtype, count=header['count'])
+        recorder = cls(capacity=max(len(records), 1), text_size=header['text_size'])
+        # Activity types are stored by index; remap if py_trees has reordered them since.
+        type_map = [_ACTIVITY_TYPE_IDS.get(name, 0) for name in header['activity_types']]
+        for index, record in enumerate(records.tolist()):
+            (seq, time, key, client, activity, previous_tag, current_tag,
+             previous_number, current_number, previous_int, current_int, previous_text, current_text) = record
+            recorder._ring[index] = (
+                seq, time, key, client, type_map[activity],
+                previous_tag, _stored_value(previous_tag, previous_number, previous_int, previous_text),
+                current_tag, _stored_value(current_tag, current_number, current_int, current_text))
+        recorder._count = len(records)
+        recorder._keys = list(header['keys'])
+        recorder._key_ids = {key: index for index, key in enumerate(recorder._keys)}
+        recorder._clients = [tuple(client) for client in header['clients']]
+        recorder._client_ids = {(name, uuid.UUID(client_id)): index
+                                for index, (name, client_id) in enumerate(recorder._clients)}
+        return recorder
+
+    def install_crash_dump(self, filepath: str) -> None:
+        '''
+        dump() to filepath when an exception goes unhandled in any thread.
+
+        Chains to the previously installed sys.excepthook and
+        threading.excepthook.
+        '''
+        if self._crash_dump_path is None:
+            self._previous_excepthook = sys.excepthook
+            self._previous_threading_excepthook = threading.excepthook
+            sys.excepthook = self._excepthook
+            threading.excepthook = self._threading_excepthook
+        self._crash_dump_path = filepath
+
+    def uninstall_crash_dump(self) -> None:
+        if self._crash_dump_path is None:
+            return
+        if sys.excepthook == self._excepthook:
+            sys.excepthook = self._previous_excepthook
+        if threading.excepthook == self._threading_excepthook:
+            threading.excepthook = self._previous_threading_excepthook
+        self._crash_dump_path = None
+
+    def _crash_dump(self) -> None:
+        try:
+            self.dump(self._crash_dump_path)
+        except Exception:  # never mask the original exception
+            _logger.exception(f'Failed to dump blackboard activity to {self._crash_dump_path}')
+
+    def _excepthook(self, exc_type, exc_value, exc_traceback):
+        self._crash_dump()
+        self._previous_excepthook(exc_type, exc_value, exc_traceback)
+
+    def _threading_excepthook(self, args):
+        self._crash_dump()
+        self._previous_threading_excepthook(args)
+
+
+def enable_activity_recorder(capacity: int = 4096,
+                             text_size: int = 32,
+                             clock: Optional[Clock] = None) -> ActivityRecorder:
+    '''
+    Replace the blackboard activity stream with a new ActivityRecorder.
+
+    Use instead of Blackboard.enable_activity_stream().  Any existing stream is
+    discarded; disable with Blackboard.disable_activity_stream() as usual.
+    '''
+    recorder = ActivityRecorder(capacity=capacity, text_size=text_size, clock=clock)
+    py_trees.blackboard.Blackboard.activity_stream = recorder
+    return recorder
+
+
+__all__ = ['ActivityRecorder', 'enable_activity_recorder']
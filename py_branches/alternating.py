@@ -1,8 +1,35 @@
 #!/usr/bin/env python3
+import bisect
+import heapq
+import itertools
+import os
 import py_trees
 import random
+from typing import Iterable
 from typing import List
+from typing import Optional
+from typing import Sequence
 from typing import Tuple
+from typing import Union
+
+from .fast import fast_tick
+from .fast import tick_decorator
+
+
+def _skip(decorator: py_trees.decorators.Decorator, success_if_skip: bool) -> None:
+    '''
+    Finish a skipped tick like decorator.stop(SUCCESS/FAILURE).
+
+    When neither the decorator nor its child is RUNNING, stop() would only
+    log, call terminate() and set the status, so do just the last two.
+    '''
+    new_status = py_trees.common.Status.SUCCESS if success_if_skip else py_trees.common.Status.FAILURE
+    if (decorator.status == py_trees.common.Status.RUNNING
+            or decorator.decorated.status == py_trees.common.Status.RUNNING):
+        decorator.stop(new_status)
+    else:
+        decorator.terminate(new_status)
+        decorator.status = new_status
 
 
 class ActivateBehavior(py_trees.decorators.Decorator):
@@ -33,15 +60,18 @@ class ActivateBehavior(py_trees.decorators.Decorator):
 
     def tick(self):
         if not self._activate:
-            if self._success_if_skip:
-                self.stop(py_trees.common.Status.SUCCESS)
-            else:
-                self.stop(py_trees.common.Status.FAILURE)
+            _skip(self, self._success_if_skip)
             yield self
         else:
             for node in super().tick():
                 yield node
 
+    def tick_fast(self) -> py_trees.common.Status:
+        if not self._activate:
+            _skip(self, self._success_if_skip)
+            return self.status
+        return tick_decorator(self)
+
     def update(self) -> py_trees.common.Status:
         return self.decorated.status
 
@@ -67,6 +97,157 @@ class _RunAlternatingHelper(py_trees.behaviour.Behaviour):
     def update(self) -> py_trees.common.Status:
         return py_trees.common.Status.FAILURE
 
+class _RotatingSelector(py_trees.composites.Composite):
+    '''
+    Composite that ticks exactly one child per tick and returns its status.
+
+    Subclasses implement _next_index(), called once per tick to pick the
+    child.  A child that is still RUNNING when another one is picked is
+    stopped.
+    '''
+    def _next_index(self) -> int:
+        raise NotImplementedError
+
+    def _enter(self) -> Optional[py_trees.behaviour.Behaviour]:
+        if not self.children:
+            self.stop(py_trees.common.Status.FAILURE)
+            return None
+        if self.status != py_trees.common.Status.RUNNING:
+            self.initialise()
+
+        child = self.children[self._next_index()]
+        previous = self.current_child
+        if previous is not None and previous is not child and previous.status == py_trees.common.Status.RUNNING:
+            previous.stop(py_trees.common.Status.INVALID)
+        self.current_child = child
+        return child
+
+    def _leave(self, child: py_trees.behaviour.Behaviour) -> None:
+        if child.status == py_trees.common.Status.RUNNING:
+            self.status = py_trees.common.Status.RUNNING
+        else:
+            self.stop(child.status)
+
+    def tick(self):
+        self.logger.debug(f'{self.__class__.__name__}.tick()')
+        child = self._enter()
+        if child is not None:
+            for node in child.tick():
+                yield node
+            self._leave(child)
+        yield self
+
+    def tick_fast(self) -> py_trees.common.Status:
+        child = self._enter()
+        if child is not None:
+            fast_tick(child)
+            self._leave(child)
+        return self.status
+
+
+class AlternatingSelector(_RotatingSelector):
+    '''
+    Cycles through its children, ticking each for a number of consecutive ticks.
+
+    Only the active child is ticked and its status is returned.  Every tick
+    of this composite counts towards the active child's run count, RUNNING or
+    not; when the rotation moves on, a child that is still RUNNING is stopped.
+    The cursor (index, runs) survives being stopped, so the rotation carries
+    on where it left off.
+
+    Args:
+        name(str): Name of this composite.
+        children(List[Behavior]): Behaviors to cycle through.
+        counts(List[int]): How many consecutive ticks each child gets.  Defaults
+            to 1 each.
+
+    Example:
+        A with children [a, b, c] and counts [3, 2, 4] ticks a 3 times, b 2 times
+        and c 4 times before repeating.
+    '''
+    def __init__(self, name: str,
+                       children: Optional[List[py_trees.behaviour.Behaviour]] = None,
+                       counts: Optional[List[int]] = None):
+        super(AlternatingSelector, self).__init__(name=name, children=None)
+        self._counts: List[int] = []
+        self._index = 0
+        self._runs = 0
+        children = list(children) if children is not None else []
+        if counts is None:
+            counts = [1] * len(children)
+        if len(counts) != len(children):
+            raise ValueError('len(counts) != len(children), two lists must be of same length.')
+        for child, count in zip(children, counts):
+            self.add_child(child, count)
+
+    @property
+    def counts(self) -> List[int]:
+        return list(self._counts)
+
+    @property
+    def cursor(self) -> Tuple[int, int]:
+        '''(index of the active child, ticks it has had so far in this turn).'''
+        return self._index, self._runs
+
+    @staticmethod
+    def _check_count(count: int) -> int:
+        if count < 1:
+            raise ValueError(f'count({count}) must be greater or equal to 1.')
+        return count
+
+    def add_child(self, child: py_trees.behaviour.Behaviour, count: int = 1):
+        count = self._check_count(count)
+        child_id = super(AlternatingSelector, self).add_child(child)
+        self._counts.append(count)
+        return child_id
+
+    def insert_child(self, child: py_trees.behaviour.Behaviour, index: int, count: int = 1):
+        count = self._check_count(count)
+        child_id = super(AlternatingSelector, self).insert_child(child, index)
+        index = self.children.index(child)
+        self._counts.insert(index, count)
+        if index <= self._index and len(self.children) > 1:
+            self._index += 1
+        return child_id
+
+    def prepend_child(self, child: py_trees.behaviour.Behaviour, count: int = 1):
+        return self.insert_child(child, 0, count)
+
+    def replace_child(self, child: py_trees.behaviour.Behaviour,
+                            replacement: py_trees.behaviour.Behaviour) -> None:
+        '''Replace child with replacement, which takes over its count and place in the rotation.'''
+        index = self.children.index(child)
+        count = self._counts[index]
+        cursor = self._index, self._runs
+        super(AlternatingSelector, self).replace_child(child, replacement)
+        self._counts[index] = count
+        self._index, self._runs = cursor
+
+    def remove_child(self, child: py_trees.behaviour.Behaviour) -> int:
+        index = super(AlternatingSelector, self).remove_child(child)
+        del self._counts[index]
+        if index < self._index:
+            self._index -= 1
+        elif index == self._index:
+            self._runs = 0  # the next child starts a fresh turn
+            if self._index >= len(self.children):
+                self._index = 0
+        return index
+
+    def remove_all_children(self) -> None:
+        super(AlternatingSelector, self).remove_all_children()
+        self._counts = []
+        self._index = 0
+        self._runs = 0
+
+    def _next_index(self) -> int:
+        if self._runs >= self._counts[self._index]:
+            self._index = (self._index + 1) % len(self.children)
+            self._runs = 0
+        self._runs += 1
+        return self._index
+
+
 def run_alternating(name: str, behaviors: List[py_trees.behaviour.Behaviour], counts: List[int]):
     '''
     Args:
@@ -78,6 +259,9 @@ def run_alternating(name: str, behaviors: List[py_trees.behaviour.Behaviour], co
                 A if behaviors is [behavior_a, behavior_b, behavior_c] and count is [3,2,4] then
                 behavior_a will run 3 times in a row, behavior_b will run 2 times in a row, and
                 behavior_c will run 4 times in a row before repeating.
+
+    AlternatingSelector does the same with a single composite that ticks only
+    the active behavior.
     '''
     if 0 in counts:
         raise ValueError(f'counts({counts}) can not have 0 in the list.')
@@ -97,6 +281,361 @@ def run_alternating(name: str, behaviors: List[py_trees.behaviour.Behaviour], co
     run_alternating_selector = py_trees.composites.Selector(name, False, children)
     return run_alternating_selector
 
+class RunLengthPattern(object):
+    '''
+    Repeating rotation stored as run-length segments, e.g. A x3, B x1, A x2, C x7.
+
+    The end tick of every segment is precomputed, so the segment of any tick
+    index is found with a bisect instead of replaying the pattern.
+
+    Args:
+        segments(Iterable[Tuple[int or str, int]]): (child, count) pairs, where
+            child is a child index or name and count >= 1 is the number of
+            consecutive ticks it gets.
+    '''
+    def __init__(self, segments: Iterable[Tuple[Union[int, str], int]]):
+        self._children: List[Union[int, str]] = []
+        self._counts: List[int] = []
+        for child, count in segments:
+            count = int(count)
+            if count < 1:
+                raise ValueError(f'count({count}) of segment {len(self._counts)} must be greater or equal to 1.')
+            self._children.append(child if isinstance(child, str) else int(child))
+            self._counts.append(count)
+        if not self._counts:
+            raise ValueError('pattern must have at least one segment.')
+        self._ends = list(itertools.accumulate(self._counts))
+
+    @property
+    def period(self) -> int:
+        '''Number of ticks before the pattern repeats.'''
+        return self._ends[-1]
+
+    @property
+    def segments(self) -> List[Tuple[Union[int, str], int]]:
+        return list(zip(self._children, self._counts))
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def locate(self, tick_index: int) -> Tuple[int, int]:
+        '''(segment, ticks already spent in it) for a tick index counted from 0.'''
+        tick = tick_index % self._ends[-1]
+        segment = bisect.bisect_right(self._ends, tick)
+        return segment, tick - (self._ends[segment - 1] if segment else 0)
+
+    def child_at(self, tick_index: int) -> Union[int, str]:
+        '''Child (index or name) that runs on a tick index counted from 0.'''
+        return self._children[self.locate(tick_index)[0]]
+
+    def save(self, filepath: str) -> None:
+        '''Write to YAML, or to .npy if the path ends in .npy and every child is an index.'''
+        if filepath.endswith('.npy'):
+            import numpy as np
+            if not all(isinstance(child, int) for child in self._children):
+                raise ValueError('only patterns of child indices can be saved as .npy')
+            np.save(filepath, np.array([self._children, self._counts], dtype=np.int64).T)
+        else:
+            import yaml
+            with open(filepath, 'w') as pattern_file:
+                yaml.safe_dump([[child, count] for child, count in self.segments], pattern_file,
+                               default_flow_style=None)
+
+
+def load_pattern_file(pattern_filepath: str) -> RunLengthPattern:
+    '''
+    Load a RunLengthPattern.
+
+    A .npy file holds an integer array of shape (segments, 2) with a child
+    index and a count per row.  Any other file is read as YAML: a list of
+    [child, count] pairs, where child is a child index or name.
+
+        - [approach, 3]
+        - [scan, 1]
+        - [approach, 2]
+    '''
+    if not os.path.isfile(pattern_filepath):
+        raise FileNotFoundError(f'pattern_filepath: {pattern_filepath} is not a valid file')
+
+    if pattern_filepath.endswith('.npy'):
+        import numpy as np
+        segments = np.load(pattern_filepath)
+        if segments.ndim != 2 or segments.shape[1] != 2 or segments.dtype.kind not in 'iu':
+            raise ValueError(f'{pattern_filepath} must hold an integer array of shape (segments, 2)')
+        return RunLengthPattern(segments.tolist())
+
+    import yaml
+    with open(pattern_filepath, 'r') as pattern_file:
+        segments = yaml.safe_load(pattern_file)
+    if not isinstance(segments, list) or not all(isinstance(s, list) and len(s) == 2 for s in segments):
+        raise ValueError(f'{pattern_filepath} must hold a list of [child, count] pairs')
+    return RunLengthPattern(segments)
+
+
+class RunLengthSelector(_RotatingSelector):
+    '''
+    Ticks one child per tick, following a run-length encoded pattern.
+
+    Generalises AlternatingSelector to patterns that revisit children, e.g.
+    A x3, B x1, A x2, C x7, with thousands of segments.  Each tick is O(1);
+    seek() jumps to any tick index with one bisect, so a rotation can be
+    resumed after a restart (save tick_index, seek() to it) or skipped ahead
+    without replaying it.
+
+    The pattern refers to children by index or name.  After children are
+    added, removed or replaced it is resolved against the new children on
+    the next tick, so name references follow their child while index
+    references keep meaning a position.
+
+    Args:
+        name(str): Name of this composite.
+        children(List[Behavior]): Behaviors the pattern refers to.
+        pattern(RunLengthPattern, str or list): The pattern, a file for
+            load_pattern_file(), or a list of (child, count) pairs.
+        tick_index(int): Tick index to start at.
+
+    Example:
+        selector = RunLengthSelector('Patrol', [a, b, c], [('a', 3), ('b', 1), ('a', 2), ('c', 7)])
+    '''
+    def __init__(self, name: str,
+                       children: List[py_trees.behaviour.Behaviour],
+                       pattern: Union[RunLengthPattern, str, Sequence[Tuple[Union[int, str], int]]],
+                       tick_index: int = 0):
+        super(RunLengthSelector, self).__init__(name=name, children=children)
+        if isinstance(pattern, str):
+            pattern = load_pattern_file(pattern)
+        elif not isinstance(pattern, RunLengthPattern):
+            pattern = RunLengthPattern(pattern)
+        self._pattern = pattern
+        self._segment_children = self._resolve_segments()
+        self._counts = [count for _, count in pattern.segments]
+        self.seek(tick_index)
+
+    def _resolve_segments(self) -> List[int]:
+        return [self._resolve(child) for child, _ in self._pattern.segments]
+
+    def _resolve(self, child: Union[int, str]) -> int:
+        if isinstance(child, int):
+            if not 0 <= child < len(self.children):
+                raise ValueError(f'child index({child}) out of range for {len(self.children)} children.')
+            return child
+        indices = [index for index, behavior in enumerate(self.children) if behavior.name == child]
+        if len(indices) != 1:
+            raise ValueError(f'child name({child!r}) must match exactly one child, matched {len(indices)}.')
+        return indices[0]
+
+    @property
+    def pattern(self) -> RunLengthPattern:
+        return self._pattern
+
+    @property
+    def tick_index(self) -> int:
+        '''Number of ticks so far, i.e. the index of the next tick.'''
+        return self._tick_index
+
+    def seek(self, tick_index: int) -> None:
+        '''Make tick_index the next tick.'''
+        if tick_index < 0:
+            raise ValueError(f'tick_index({tick_index}) must be >= 0.')
+        self._tick_index = tick_index
+        self._segment, self._offset = self._pattern.locate(tick_index)
+
+    def skip_ticks(self, ticks: int) -> None:
+        '''Advance the pattern by ticks without ticking any child.'''
+        self.seek(self._tick_index + ticks)
+
+    def add_child(self, child: py_trees.behaviour.Behaviour):
+        child_id = super(RunLengthSelector, self).add_child(child)
+        self._segment_children = None
+        return child_id
+
+    def insert_child(self, child: py_trees.behaviour.Behaviour, index: int):
+        child_id = super(RunLengthSelector, self).insert_child(child, index)
+        self._segment_children = None
+        return child_id
+
+    def remove_child(self, child: py_trees.behaviour.Behaviour) -> int:
+        index = super(RunLengthSelector, self).remove_child(child)
+        self._segment_children = None
+        return index
+
+    def remove_all_children(self) -> None:
+        super(RunLengthSelector, self).remove_all_children()
+        self._segment_children = None
+
+    def _next_index(self) -> int:
+        if self._segment_children is None:
+            # Children changed since the pattern was last resolved.
+            self._segment_children = self._resolve_segments()
+        segment = self._segment
+        self._offset += 1
+        if self._offset == self._counts[segment]:
+            self._segment = segment + 1 if segment + 1 < len(self._counts) else 0
+            self._offset = 0
+        self._tick_index += 1
+        return self._segment_children[segment]
+
+
+class _Share(object):
+    __slots__ = ('weight', 'stride', 'pass_', 'version')
+
+    def __init__(self, weight: float):
+        self.weight = weight
+        self.stride = 1.0 / weight if weight > 0.0 else 0.0
+        self.pass_ = 0.0
+        self.version = 0
+
+
+class FairShareSelector(_RotatingSelector):
+    '''
+    Ticks one child per tick, giving each child a share of ticks proportional
+    to its weight.
+
+    Uses stride scheduling: each child advances a virtual "pass" by 1/weight
+    every time it is ticked and the child with the lowest pass goes next.
+    Over any window a child's tick count stays within about one tick of its
+    exact share, so ticks are spread out rather than handed out in bursts
+    (weights 5:3:2 give A B A C A B A C B A, not A A A A A B B B C C).
+
+    Passes are kept in a heap, so each pick is O(log n).  Weight changes take
+    effect on the next tick without rebuilding the tree: the child's
+    remaining pass is rescaled and its old heap entry is dropped lazily.  A
+    child with weight 0 is never ticked.
+
+    Args:
+        name(str): Name of this composite.
+        children(List[Behavior]): Behaviors to share ticks between.
+        weights(List[float]): Non-negative weight per child.  Defaults to 1 each.
+
+    Example:
+        selector = FairShareSelector('Share', [a, b, c], [0.5, 0.3, 0.2])
+        selector.set_weight(c, 0.4)
+    '''
+    def __init__(self, name: str,
+                       children: Optional[List[py_trees.behaviour.Behaviour]] = None,
+                       weights: Optional[Sequence[float]] = None):
+        self._shares = {}
+        self._positions = {}
+        self._heap = []
+        self._sequence = itertools.count()
+        self._virtual_pass = 0.0
+        super(FairShareSelector, self).__init__(name=name, children=None)
+        children = list(children) if children is not None else []
+        if weights is None:
+            weights = [1.0] * len(children)
+        if len(weights) != len(children):
+            raise ValueError('len(weights) != len(children), two lists must be of same length.')
+        for child, weight in zip(children, weights):
+            self.add_child(child, weight)
+
+    @property
+    def weights(self) -> List[float]:
+        return [self._shares[child.id].weight for child in self.children]
+
+    @staticmethod
+    def _check_weight(weight: float) -> float:
+        weight = float(weight)
+        if not weight >= 0.0 or weight == float('inf'):
+            raise ValueError(f'weight({weight}) must be finite and >= 0.')
+        return weight
+
+    def _push(self, child_id, share: _Share) -> None:
+        if share.weight > 0.0:
+            heapq.heappush(self._heap, (share.pass_, next(self._sequence), share.version, child_id))
+
+    def _reindex(self) -> None:
+        self._positions = {child.id: index for index, child in enumerate(self.children)}
+
+    def set_weight(self, child: Union[int, py_trees.behaviour.Behaviour], weight: float) -> None:
+        '''Set the weight of a child (by index or object).  Takes effect on the next tick.'''
+        weight = self._check_weight(weight)
+        child = self.children[child] if isinstance(child, int) else child
+        share = self._shares[child.id]
+        new_stride = 1.0 / weight if weight > 0.0 else 0.0
+        if share.weight > 0.0 and weight > 0.0:
+            remaining = share.pass_ - self._virtual_pass
+            share.pass_ = self._virtual_pass + remaining * new_stride / share.stride
+        else:
+            share.pass_ = self._virtual_pass + new_stride
+        share.weight = weight
+        share.stride = new_stride
+        share.version += 1
+        self._push(child.id, share)
+        self._compact()
+
+    def set_weights(self, weights: Sequence[float]) -> None:
+        if len(weights) != len(self.children):
+            raise ValueError('len(weights) != len(children), two lists must be of same length.')
+        for child, weight in zip(self.children, weights):
+            self.set_weight(child, weight)
+
+    def _join(self, child: py_trees.behaviour.Behaviour, weight: float) -> None:
+        share = _Share(weight)
+        share.pass_ = self._virtual_pass + share.stride
+        self._shares[child.id] = share
+        self._push(child.id, share)
+
+    def add_child(self, child: py_trees.behaviour.Behaviour, weight: float = 1.0):
+        weight = self._check_weight(weight)
+        child_id = super(FairShareSelector, self).add_child(child)
+        self._positions[child.id] = len(self.children) - 1
+        self._join(child, weight)
+        return child_id
+
+    def insert_child(self, child: py_trees.behaviour.Behaviour, index: int, weight: float = 1.0):
+        weight = self._check_weight(weight)
+        child_id = super(FairShareSelector, self).insert_child(child, index)
+        self._reindex()
+        self._join(child, weight)
+        return child_id
+
+    def prepend_child(self, child: py_trees.behaviour.Behaviour, weight: float = 1.0):
+        return self.insert_child(child, 0, weight)
+
+    def replace_child(self, child: py_trees.behaviour.Behaviour,
+                            replacement: py_trees.behaviour.Behaviour) -> None:
+        '''Replace child with replacement, which takes over its weight and place in the schedule.'''
+        share = self._shares[child.id]
+        super(FairShareSelector, self).replace_child(child, replacement)
+        share.version += 1
+        self._shares[replacement.id] = share
+        self._push(replacement.id, share)
+
+    def remove_child(self, child: py_trees.behaviour.Behaviour) -> int:
+        index = super(FairShareSelector, self).remove_child(child)
+        del self._shares[child.id]  # its heap entries are dropped when they surface
+        self._reindex()
+        self._compact()
+        return index
+
+    def remove_all_children(self) -> None:
+        super(FairShareSelector, self).remove_all_children()
+        self._shares = {}
+        self._positions = {}
+        self._heap = []
+
+    def _compact(self) -> None:
+        # Stale entries are normally skipped when popped; rebuild if they pile up.
+        if len(self._heap) > 2 * len(self._shares) + 16:
+            self._heap = [(share.pass_, next(self._sequence), share.version, child_id)
+                          for child_id, share in self._shares.items() if share.weight > 0.0]
+            heapq.heapify(self._heap)
+
+    def _next_index(self) -> int:
+        heap = self._heap
+        while heap:
+            pass_, _, version, child_id = heap[0]
+            share = self._shares.get(child_id)
+            if share is None or share.version != version:
+                heapq.heappop(heap)
+                continue
+            self._virtual_pass = pass_
+            share.pass_ = pass_ + share.stride
+            heapq.heapreplace(heap, (share.pass_, next(self._sequence), version, child_id))
+            return self._positions[child_id]
+        raise ValueError(f'{self.name}: at least one weight must be positive.')
+
+
 class RunEveryRange(py_trees.decorators.Decorator):
     '''
     Enables the activation of child every for a range of calls within
@@ -116,6 +655,9 @@ class RunEveryRange(py_trees.decorators.Decorator):
                 S, S, S, E, E, E, S, S, S, E, E, E, S, S, S, ...
             6 and (2,4) then the child will run on the 2nd, 3rd, and 4th cycle.
                 S, E, E, E, S, S, S, E, E, E, S, S, S, E, E, ...
+
+    ticks_until_next_run() gives the number of skips before the child runs
+    again, so a caller can skip_ticks() them instead of ticking.
     '''
     def __init__(self, child: py_trees.behaviour.Behaviour,
                        name: str,
@@ -135,21 +677,44 @@ class RunEveryRange(py_trees.decorators.Decorator):
         self._success_if_skip = success_if_skip
         self._iteration = 1
 
+    def ticks_until_next_run(self) -> int:
+        '''Number of upcoming ticks that will be skipped before the child is ticked.'''
+        if self._iteration < self._run_range[0]:
+            return self._run_range[0] - self._iteration
+        if self._iteration > self._run_range[1]:
+            return self._max_range - self._iteration + self._run_range[0]
+        return 0
+
+    def skip_ticks(self, ticks: int) -> None:
+        '''
+        Account for skipped ticks without ticking, e.g. by a parent that did
+        not tick this subtree.  Can not skip past the next run.
+        '''
+        if not (0 <= ticks <= self.ticks_until_next_run()):
+            raise ValueError(f'ticks({ticks}) must be in range [0, {self.ticks_until_next_run()}].')
+        if ticks:
+            _skip(self, self._success_if_skip)
+            self._advance(ticks - 1)
+
+    def _advance(self, ticks: int) -> None:
+        self._iteration = (self._iteration - 1 + ticks) % self._max_range + 1
+
     def tick(self):
         if self._run_range[0] <= self._iteration <= self._run_range[1]:
             for node in super().tick():
                 yield node
         else:
-            if self._success_if_skip:
-                self.stop(py_trees.common.Status.SUCCESS)
-            else:
-                self.stop(py_trees.common.Status.FAILURE)
+            _skip(self, self._success_if_skip)
             yield self
 
+    def tick_fast(self) -> py_trees.common.Status:
+        if self._run_range[0] <= self._iteration <= self._run_range[1]:
+            return tick_decorator(self)
+        _skip(self, self._success_if_skip)
+        return self.status
+
     def terminate(self, new_status: py_trees.common.Status) -> None:
-        self._iteration += 1
-        if self._iteration > self._max_range:
-            self._iteration = 1
+        self._advance(1)
 
     def update(self) -> py_trees.common.Status:
         return self.decorated.status
@@ -164,6 +729,8 @@ class RunEveryX(py_trees.decorators.Decorator):
         name(str): Name of this behavior
         every_x_range(Tuple[int, int]): Run the child ever however many cycles. Number of
         cycles is within a range. Range is inclusive.
+        rng: Source of random numbers, e.g. a RandomStream. Defaults to the global
+        random module.
 
     Example:
         E: Executes that cycle.
@@ -181,11 +748,15 @@ class RunEveryX(py_trees.decorators.Decorator):
                     5: S, S, S, S, E
                     1: E
                     4: S, S, S, E
+
+    ticks_until_next_run() gives the number of skips before the child runs
+    again, so a caller can skip_ticks() them instead of ticking.
     '''
     def __init__(self, child: py_trees.behaviour.Behaviour,
                        name: str,
                        every_x_range: Tuple[int, int],
-                       success_if_skip:bool=False):
+                       success_if_skip:bool=False,
+                       rng=None):
         if every_x_range[0] > every_x_range[1]:
             raise ValueError('every_x_range must be a tuple with (smaller_number, bigger_number)')
         if every_x_range[0] < 1:
@@ -193,23 +764,46 @@ class RunEveryX(py_trees.decorators.Decorator):
 
         super(RunEveryX, self).__init__(name=name, child=child)
         self._every_x_range = every_x_range
-        self._cycles_remaining = random.randint(*self._every_x_range)-1
+        self.rng = rng if rng is not None else random
+        # Drawn on first use, so an rng installed after construction (set_tree_rng) decides it.
+        self._cycles_remaining: Optional[int] = None
         self._success_if_skip = success_if_skip
 
     def initialise(self):
-        self._cycles_remaining = random.randint(*self._every_x_range)-1
+        self._cycles_remaining = self.rng.randint(*self._every_x_range)-1
+
+    def ticks_until_next_run(self) -> int:
+        '''Number of upcoming ticks that will be skipped before the child is ticked.'''
+        if self._cycles_remaining is None:
+            self._cycles_remaining = self.rng.randint(*self._every_x_range)-1
+        return self._cycles_remaining
+
+    def skip_ticks(self, ticks: int) -> None:
+        '''
+        Account for skipped ticks without ticking, e.g. by a parent that did
+        not tick this subtree.  Can not skip past the next run.
+        '''
+        if not (0 <= ticks <= self.ticks_until_next_run()):
+            raise ValueError(f'ticks({ticks}) must be in range [0, {self._cycles_remaining}].')
+        if ticks:
+            self._cycles_remaining -= ticks
+            _skip(self, self._success_if_skip)
 
     def tick(self):
-        if self._cycles_remaining > 0:
+        if self.ticks_until_next_run() > 0:
             self._cycles_remaining -= 1
-            if self._success_if_skip:
-                self.stop(py_trees.common.Status.SUCCESS)
-            else:
-                self.stop(py_trees.common.Status.FAILURE)
+            _skip(self, self._success_if_skip)
             yield self
         else:
             for node in super().tick():
                 yield node
 
+    def tick_fast(self) -> py_trees.common.Status:
+        if self.ticks_until_next_run() > 0:
+            self._cycles_remaining -= 1
+            _skip(self, self._success_if_skip)
+            return self.status
+        return tick_decorator(self)
+
     def update(self):
         return self.decorated.status
@@ -1,8 +1,16 @@
 #!/usr/bin/env python3
+import ast
+import operator
+import weakref
 from typing import Any
+from typing import Callable
+from typing import Dict
 from typing import Optional
 import py_trees
 
+from .fast import tick_decorator
+from .fast import tick_leaf
+
 
 def _get_and_check(bb: py_trees.blackboard.Client, var: str, types: Optional[list], logger):
     try:
@@ -19,16 +27,288 @@ def _get_and_check(bb: py_trees.blackboard.Client, var: str, types: Optional[lis
         return None
     return value
 
+
+_MISSING = object()
+# Values of these types can not change without being replaced, so a predicate result can be
+# reused for as long as the stored object is the same one.
+_IMMUTABLE_TYPES = frozenset((bool, int, float, complex, str, bytes, type(None)))
+
+
+def _resolve_storage_key(client: py_trees.blackboard.Client, variable_name: str):
+    '''(key in Blackboard.storage, nested attribute path) for a client's variable name.'''
+    key, _, key_attributes = variable_name.partition('.')
+    key = py_trees.blackboard.Blackboard.absolute_name(client.namespace, key)
+    return client.remappings.get(key, key), key_attributes
+
+
+class BlackboardKeyHandle(object):
+    '''
+    Direct, pre-resolved read access to one blackboard variable.
+
+    The client's namespace and remapping are resolved once at construction, so
+    get() is a single dict lookup on Blackboard.storage instead of a trip
+    through Client.get() and its access checks.  While the activity stream is
+    enabled reads still go through the client so they are recorded.
+
+    A missing variable is reported with one warning, repeated only after the
+    variable has reappeared and gone missing again.
+
+    Args:
+        client (Client): Client with read or write access to variable_name.
+        variable_name (str): Variable to read, can be nested, e.g. battery.percentage.
+        logger: Logger for the missing-variable warning.
+    '''
+    def __init__(self, client: py_trees.blackboard.Client, variable_name: str, logger):
+        self._client = client
+        self._variable_name = variable_name
+        self._storage_key, key_attributes = _resolve_storage_key(client, variable_name)
+        self._attrgetter = operator.attrgetter(key_attributes) if key_attributes else None
+        self._logger = logger
+        self._warned = False
+        self._last_read = _MISSING
+        self._last_value = _MISSING
+        self._last_result = False
+
+    @property
+    def variable_name(self) -> str:
+        return self._variable_name
+
+    @property
+    def storage_key(self) -> str:
+        '''Key in Blackboard.storage that holds the variable (or its parent object).'''
+        return self._storage_key
+
+    @property
+    def stable(self) -> bool:
+        '''
+        True if the last value read can only change by a write to storage_key,
+        i.e. it is immutable and not a nested attribute.
+        '''
+        return self._attrgetter is None and type(self._last_read) in _IMMUTABLE_TYPES
+
+    def get(self) -> Any:
+        '''Current value, or None if the variable does not exist.'''
+        if py_trees.blackboard.Blackboard.activity_stream is not None:
+            try:
+                value = self._client.get(self._variable_name)
+            except KeyError:
+                value = None
+        else:
+            value = py_trees.blackboard.Blackboard.storage.get(self._storage_key, None)
+            if value is not None and self._attrgetter is not None:
+                try:
+                    value = self._attrgetter(value)
+                except AttributeError:
+                    value = None
+        if value is None:
+            if not self._warned:
+                self._warned = True
+                self._logger.warning(
+                    f'Tried to access blackboard variable {self._variable_name} but it does not exist.')
+        else:
+            self._warned = False
+        self._last_read = value
+        return value
+
+    def evaluate(self, predicate: Callable[[Any], bool]) -> bool:
+        '''
+        predicate(get()), reusing the previous result while the same immutable
+        value is stored.  predicate must always be the same function.
+        '''
+        value = self.get()
+        if value is self._last_value and type(value) in _IMMUTABLE_TYPES:
+            return self._last_result
+        self._last_value = value
+        self._last_result = bool(predicate(value))
+        return self._last_result
+
+
+class WatchedStorage(dict):
+    '''
+    Blackboard storage that tells subscribers when a key is written or removed.
+
+    Installed on py_trees.blackboard.Blackboard.storage by watch_blackboard().
+    Every write made through py_trees (clients, Blackboard.set/unset/clear and
+    the behaviors in this module) goes through this dict, so a subscriber is
+    notified of any change to a key short of an in-place mutation of the
+    stored object.  Subscribers are held weakly and must implement
+    blackboard_changed(key).
+    '''
+    def __init__(self, *args, **kwargs):
+        super(WatchedStorage, self).__init__(*args, **kwargs)
+        self._subscribers: Dict[str, weakref.WeakSet] = {}
+
+    def subscribe(self, key: str, subscriber) -> None:
+        self._subscribers.setdefault(key, weakref.WeakSet()).add(subscriber)
+
+    def unsubscribe(self, key: str, subscriber) -> None:
+        subscribers = self._subscribers.get(key)
+        if subscribers is not None:
+            subscribers.discard(subscriber)
+
+    def _notify(self, key: str) -> None:
+        subscribers = self._subscribers.get(key)
+        if subscribers:
+            for subscriber in list(subscribers):
+                subscriber.blackboard_changed(key)
+
+    def __setitem__(self, key, value):
+        super(WatchedStorage, self).__setitem__(key, value)
+        self._notify(key)
+
+    def __delitem__(self, key):
+        super(WatchedStorage, self).__delitem__(key)
+        self._notify(key)
+
+    def pop(self, key, *default):
+        value = super(WatchedStorage, self).pop(key, *default)
+        self._notify(key)
+        return value
+
+    def popitem(self):
+        key, value = super(WatchedStorage, self).popitem()
+        self._notify(key)
+        return key, value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def clear(self):
+        super(WatchedStorage, self).clear()
+        for key in list(self._subscribers):
+            self._notify(key)
+
+
+def watch_blackboard() -> WatchedStorage:
+    '''
+    Make Blackboard.storage a WatchedStorage (keeping its contents) if it is
+    not one already, and return it.
+    '''
+    storage = py_trees.blackboard.Blackboard.storage
+    if not isinstance(storage, WatchedStorage):
+        storage = WatchedStorage(storage)
+        py_trees.blackboard.Blackboard.storage = storage
+    return storage
+
+
+class BlackboardWriteBuffer(object):
+    '''
+    Collects blackboard writes during a tick and applies them once at the end.
+
+    Writes are coalesced per blackboard key: a set() replaces anything pending
+    for the key, increment() deltas are summed, and an increment after a set
+    is added to the set value.  flush() then makes one Client.set() per key,
+    so the activity stream records one write per key per tick however many
+    behaviors wrote it.  Pass the buffer to the write behaviors in this module
+    and flush it from a post-tick handler:
+
+        buffer = BlackboardWriteBuffer()
+        tree.add_post_tick_handler(buffer.flush)
+        IncrementBlackboardVariableIfCondition(child, 'count', 'n', Status.SUCCESS,
+                                               write_buffer=buffer)
+
+    Buffered writes are not visible to reads made in the same tick.  Buffered
+    increments do not read the variable through the client when they are
+    made.  IncrementBlackboardVariable only checks that the key exists in
+    storage, which records no activity.  flush() reads and type-checks each
+    key once, and drops (with a warning) an increment of a non-numeric value.
+    '''
+    def __init__(self):
+        # storage key -> [client, variable_name, set value or _MISSING, summed delta]
+        self._pending: Dict[str, list] = {}
+        self.logger = py_trees.logging.Logger('BlackboardWriteBuffer')
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def _entry(self, client: py_trees.blackboard.Client, variable_name: str) -> list:
+        storage_key, key_attributes = _resolve_storage_key(client, variable_name)
+        if key_attributes:
+            storage_key = f'{storage_key}.{key_attributes}'
+        entry = self._pending.get(storage_key)
+        if entry is None:
+            entry = self._pending[storage_key] = [client, variable_name, _MISSING, 0]
+        else:
+            entry[0] = client
+            entry[1] = variable_name
+        return entry
+
+    def set(self, client: py_trees.blackboard.Client, variable_name: str, value: Any) -> None:
+        entry = self._entry(client, variable_name)
+        entry[2] = value
+        entry[3] = 0
+
+    def increment(self, client: py_trees.blackboard.Client, variable_name: str, delta: float) -> None:
+        entry = self._entry(client, variable_name)
+        entry[3] += delta
+
+    def flush(self, tree: Optional[py_trees.trees.BehaviourTree] = None) -> int:
+        '''
+        Apply and clear the pending writes.  Signature matches a py_trees tick handler.
+
+        Returns:
+            int: Number of keys written.
+        '''
+        pending = self._pending
+        self._pending = {}
+        written = 0
+        for client, variable_name, value, delta in pending.values():
+            if value is _MISSING:
+                current_value = _get_and_check(client, variable_name, [int, float], self.logger)
+                if current_value is None:
+                    self.logger.warning(
+                        f'Failed to increment blackboard variable {variable_name}: value missing or invalid.')
+                    continue
+                value = current_value + delta
+            elif delta:
+                if type(value) not in (int, float):
+                    self.logger.warning(
+                        f'Failed to increment blackboard variable {variable_name}: '
+                        f'value {value!r} is not an int or float.')
+                    continue
+                value = value + delta
+            client.set(variable_name, value, overwrite=True)
+            written += 1
+        return written
+
+    def discard(self) -> None:
+        '''Drop the pending writes without applying them.'''
+        self._pending.clear()
+
+
 class IncrementBlackboardVariable(py_trees.behaviour.Behaviour):
-    def __init__(self, name: str, variable_name: str, increment_by: float=1.0):
+    def __init__(self, name: str, variable_name: str, increment_by: float=1.0,
+                 write_buffer: Optional[BlackboardWriteBuffer]=None):
         super(IncrementBlackboardVariable, self).__init__(name)
         self._variable_name = variable_name
         self._increment_by = increment_by
+        self._write_buffer = write_buffer
         self._return_sucess = False
         self._blackboard = py_trees.blackboard.Client()
         self._blackboard.register_key(key=variable_name, access=py_trees.common.Access.WRITE)
+        self._storage_key, _ = _resolve_storage_key(self._blackboard, variable_name)
 
     def initialise(self):
+        if self._write_buffer is not None:
+            # Checked directly on storage so no read is recorded; the buffer
+            # type-checks the value once per key when it flushes.
+            self._return_sucess = py_trees.blackboard.Blackboard.storage.get(self._storage_key) is not None
+            if self._return_sucess:
+                self._write_buffer.increment(self._blackboard, self._variable_name, self._increment_by)
+            else:
+                self.logger.warning(
+                    f'Failed to increment blackboard variable {self._variable_name}: value missing.')
+            return
         self._return_sucess = False
         current_value = _get_and_check(self._blackboard, self._variable_name, [int, float], self.logger)
         if current_value is None:
@@ -46,52 +326,70 @@ class IncrementBlackboardVariable(py_trees.behaviour.Behaviour):
             return py_trees.common.Status.FAILURE
 
 class IncrementBlackboardVariableIfCondition(py_trees.decorators.Decorator):
-    def __init__(self, child, name: str, variable_name: str, condition: py_trees.common.Status, increment_by: float=1.0):
+    def __init__(self, child, name: str, variable_name: str, condition: py_trees.common.Status, increment_by: float=1.0,
+                 write_buffer: Optional[BlackboardWriteBuffer]=None):
         super(IncrementBlackboardVariableIfCondition, self).__init__(name=name, child=child)
         self._variable_name = variable_name
         self._condition = condition
         self._increment_by = increment_by
+        self._write_buffer = write_buffer
         self._blackboard = py_trees.blackboard.Client()
         self._blackboard.register_key(key=variable_name, access=py_trees.common.Access.WRITE)
 
     def update(self):
         if self.decorated.status == self._condition:
-            current_value = _get_and_check(self._blackboard, self._variable_name, [int, float], self.logger)
-            if current_value is not None:
-                self._blackboard.set(self._variable_name, current_value+self._increment_by, overwrite=True)
+            if self._write_buffer is not None:
+                self._write_buffer.increment(self._blackboard, self._variable_name, self._increment_by)
+            else:
+                current_value = _get_and_check(self._blackboard, self._variable_name, [int, float], self.logger)
+                if current_value is not None:
+                    self._blackboard.set(self._variable_name, current_value+self._increment_by, overwrite=True)
 
         return self.decorated.status
 
 class SetBlackboardVariableIfCondition(py_trees.decorators.Decorator):
-    def __init__(self, child, name: str, variable_name: str, condition: py_trees.common.Status, set_to: Any):
+    def __init__(self, child, name: str, variable_name: str, condition: py_trees.common.Status, set_to: Any,
+                 write_buffer: Optional[BlackboardWriteBuffer]=None):
         super(SetBlackboardVariableIfCondition, self).__init__(name=name, child=child)
         self._variable_name = variable_name
         self._condition = condition
         self._set_to = set_to
+        self._write_buffer = write_buffer
         self._blackboard = py_trees.blackboard.Client()
         self._blackboard.register_key(key=variable_name, access=py_trees.common.Access.WRITE)
 
     def update(self):
         if self.decorated.status == self._condition:
-            self._blackboard.set(self._variable_name, self._set_to, overwrite=True)
+            if self._write_buffer is not None:
+                self._write_buffer.set(self._blackboard, self._variable_name, self._set_to)
+            else:
+                self._blackboard.set(self._variable_name, self._set_to, overwrite=True)
 
         return self.decorated.status
 
-class RunIfBlackboardVariableEquals(py_trees.decorators.Decorator):
-    def __init__(self, child, name: str, variable_name: str, equals: Any, success_if_skip: bool=True):
-        super(RunIfBlackboardVariableEquals, self).__init__(name=name, child=child)
-        self._variable_name = variable_name
-        self._equals = equals
-        self._blackboard = py_trees.blackboard.Client()
-        self._blackboard.register_key(key=variable_name, access=py_trees.common.Access.READ)
+class _Gate(py_trees.decorators.Decorator):
+    '''
+    Runs its child only while _should_run() is True.
+
+    The condition is re-evaluated on each fresh entry and held while the child
+    is RUNNING.  When skipped, the gate returns SUCCESS or FAILURE without
+    ticking the child.
+    '''
+    def __init__(self, child, name: str, success_if_skip: bool=True):
+        super(_Gate, self).__init__(name=name, child=child)
         self._run_child = False
         self._ret_status_on_failure = py_trees.common.Status.SUCCESS if success_if_skip else py_trees.common.Status.FAILURE
 
+    def _should_run(self) -> bool:
+        raise NotImplementedError
+
+    def _decide(self) -> bool:
+        return self._should_run()
+
     def tick(self):
         # Re-evaluate the condition on each fresh entry; preserve it while child is RUNNING.
         if self.status != py_trees.common.Status.RUNNING:
-            current_value = _get_and_check(self._blackboard, self._variable_name, None, self.logger)
-            self._run_child = current_value == self._equals
+            self._run_child = self._decide()
 
         if self._run_child:
             for node in py_trees.decorators.Decorator.tick(self):
@@ -100,6 +398,13 @@ class RunIfBlackboardVariableEquals(py_trees.decorators.Decorator):
             for node in py_trees.behaviour.Behaviour.tick(self):
                 yield node
 
+    def tick_fast(self) -> py_trees.common.Status:
+        if self.status != py_trees.common.Status.RUNNING:
+            self._run_child = self._decide()
+        if self._run_child:
+            return tick_decorator(self)
+        return tick_leaf(self)
+
     def update(self):
         if self._run_child:
             if self.decorated.status != py_trees.common.Status.RUNNING:
@@ -110,65 +415,197 @@ class RunIfBlackboardVariableEquals(py_trees.decorators.Decorator):
             return self._ret_status_on_failure
 
 
-class RunIfBlackboardVariableLessThan(py_trees.decorators.Decorator):
-    def __init__(self, child, name: str, variable_name: str, less_than: Any, success_if_skip: bool=True):
-        super(RunIfBlackboardVariableLessThan, self).__init__(name=name, child=child)
-        self._variable_name = variable_name
-        self._less_than = less_than
+class _BlackboardGate(_Gate):
+    '''
+    _Gate whose condition reads the blackboard through its own client.
+
+    Subclasses read variables through the handles passed to _watch().  The gate
+    subscribes to their keys on the WatchedStorage and reuses its last decision
+    until one of them is written, as long as every value read was immutable and
+    not nested.  It always re-evaluates while the activity stream is enabled,
+    so reads keep being recorded.
+    '''
+    def __init__(self, child, name: str, success_if_skip: bool=True):
+        super(_BlackboardGate, self).__init__(child, name, success_if_skip)
         self._blackboard = py_trees.blackboard.Client()
+        self._handles = []
+        self._storage = None
+        self._dirty = True
+        self._decision = False
+
+    def _watch(self, handles) -> None:
+        self._handles = list(handles)
+        self._storage = watch_blackboard()
+        for handle in self._handles:
+            self._storage.subscribe(handle.storage_key, self)
+
+    def blackboard_changed(self, key: str) -> None:
+        self._dirty = True
+
+    def _decide(self) -> bool:
+        if (not self._dirty and py_trees.blackboard.Blackboard.storage is self._storage
+                and py_trees.blackboard.Blackboard.activity_stream is None):
+            return self._decision
+        # Cleared first so a write made while evaluating marks the gate dirty again.
+        self._dirty = False
+        self._decision = self._should_run()
+        for handle in self._handles:
+            if not handle.stable:
+                self._dirty = True
+                break
+        return self._decision
+
+
+class _BlackboardVariableGate(_BlackboardGate):
+    def __init__(self, child, name: str, variable_name: str, predicate: Callable[[Any], bool],
+                 success_if_skip: bool=True):
+        super(_BlackboardVariableGate, self).__init__(child, name, success_if_skip)
+        self._variable_name = variable_name
         self._blackboard.register_key(key=variable_name, access=py_trees.common.Access.READ)
-        self._run_child = False
-        self._ret_status_on_failure = py_trees.common.Status.SUCCESS if success_if_skip else py_trees.common.Status.FAILURE
+        self._handle = BlackboardKeyHandle(self._blackboard, variable_name, self.logger)
+        self._predicate = predicate
+        self._watch([self._handle])
 
-    def tick(self):
-        if self.status != py_trees.common.Status.RUNNING:
-            current_value = _get_and_check(self._blackboard, self._variable_name, None, self.logger)
-            self._run_child = current_value is not None and current_value < self._less_than
+    def _should_run(self) -> bool:
+        return self._handle.evaluate(self._predicate)
 
-        if self._run_child:
-            for node in py_trees.decorators.Decorator.tick(self):
-                yield node
-        else:
-            for node in py_trees.behaviour.Behaviour.tick(self):
-                yield node
 
-    def update(self):
-        if self._run_child:
-            if self.decorated.status != py_trees.common.Status.RUNNING:
-                self._run_child = False
-            return self.decorated.status
-        else:
-            self._run_child = False
-            return self._ret_status_on_failure
+class RunIfBlackboardVariableEquals(_BlackboardVariableGate):
+    def __init__(self, child, name: str, variable_name: str, equals: Any, success_if_skip: bool=True):
+        super(RunIfBlackboardVariableEquals, self).__init__(
+            child, name, variable_name, lambda value: value == equals, success_if_skip)
+        self._equals = equals
+
 
+class RunIfBlackboardVariableLessThan(_BlackboardVariableGate):
+    def __init__(self, child, name: str, variable_name: str, less_than: Any, success_if_skip: bool=True):
+        super(RunIfBlackboardVariableLessThan, self).__init__(
+            child, name, variable_name,
+            lambda value: value is not None and value < less_than, success_if_skip)
+        self._less_than = less_than
 
-class RunIfBlackboardVariableGreaterThan(py_trees.decorators.Decorator):
+
+class RunIfBlackboardVariableGreaterThan(_BlackboardVariableGate):
     def __init__(self, child, name: str, variable_name: str, greater_than: Any, success_if_skip: bool=True):
-        super(RunIfBlackboardVariableGreaterThan, self).__init__(name=name, child=child)
-        self._variable_name = variable_name
+        super(RunIfBlackboardVariableGreaterThan, self).__init__(
+            child, name, variable_name,
+            lambda value: value is not None and value > greater_than, success_if_skip)
         self._greater_than = greater_than
-        self._blackboard = py_trees.blackboard.Client()
-        self._blackboard.register_key(key=variable_name, access=py_trees.common.Access.READ)
-        self._run_child = False
-        self._ret_status_on_failure = py_trees.common.Status.SUCCESS if success_if_skip else py_trees.common.Status.FAILURE
 
-    def tick(self):
-        if self.status != py_trees.common.Status.RUNNING:
-            current_value = _get_and_check(self._blackboard, self._variable_name, None, self.logger)
-            self._run_child = current_value is not None and current_value > self._greater_than
 
-        if self._run_child:
-            for node in py_trees.decorators.Decorator.tick(self):
-                yield node
-        else:
-            for node in py_trees.behaviour.Behaviour.tick(self):
-                yield node
+# Syntax accepted in RunIfBlackboard predicates: comparisons, boolean logic, arithmetic,
+# literals and attribute/item access on variables.  No calls, so a predicate can not run code.
+_PREDICATE_NODES = (
+    ast.Expression, ast.BoolOp, ast.And, ast.Or, ast.UnaryOp, ast.Not, ast.USub, ast.UAdd,
+    ast.Compare, ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE, ast.In, ast.NotIn,
+    ast.Is, ast.IsNot, ast.BinOp, ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod,
+    ast.Pow, ast.IfExp, ast.Name, ast.Load, ast.Constant, ast.Attribute, ast.Subscript,
+    ast.Slice, ast.Tuple, ast.List, ast.Set,
+)
+_PREDICATE_ERRORS = (TypeError, ValueError, AttributeError, LookupError, ArithmeticError)
 
-    def update(self):
-        if self._run_child:
-            if self.decorated.status != py_trees.common.Status.RUNNING:
-                self._run_child = False
-            return self.decorated.status
+
+def compile_predicate(predicate: str):
+    '''
+    Compile a blackboard predicate expression into a function.
+
+    Args:
+        predicate (str): Python expression over blackboard variables, e.g.
+            "battery < 20 and mode == 'idle'".
+
+    Returns:
+        (function, tuple): The compiled function, taking one positional
+        argument per variable, and the variable names in argument order.
+
+    Raises:
+        ValueError: If predicate is not a valid expression or uses syntax
+            outside comparisons, boolean logic, arithmetic, literals and
+            attribute/item access (e.g. function calls).
+    '''
+    try:
+        tree = ast.parse(predicate.strip(), mode='eval')
+    except SyntaxError as e:
+        raise ValueError(f'predicate({predicate!r}) is not a valid expression: {e.msg}') from e
+    name_nodes = []
+    for node in ast.walk(tree):
+        if not isinstance(node, _PREDICATE_NODES):
+            raise ValueError(f'predicate({predicate!r}) may not contain {type(node).__name__}.')
+        if isinstance(node, ast.Attribute) and node.attr.startswith('_'):
+            raise ValueError(f'predicate({predicate!r}) may not access private attribute {node.attr}.')
+        if isinstance(node, ast.Name):
+            name_nodes.append(node)
+    # Arguments in order of first appearance in the source.
+    names = []
+    for node in sorted(name_nodes, key=lambda node: (node.lineno, node.col_offset)):
+        if node.id not in names:
+            names.append(node.id)
+    if not names:
+        raise ValueError(f'predicate({predicate!r}) does not reference any blackboard variable.')
+    function = ast.Expression(body=ast.Lambda(
+        args=ast.arguments(posonlyargs=[], args=[ast.arg(arg=name) for name in names],
+                           kwonlyargs=[], kw_defaults=[], defaults=[]),
+        body=tree.body))
+    ast.fix_missing_locations(function)
+    code = compile(function, f'<predicate {predicate!r}>', 'eval')
+    return eval(code, {'__builtins__': {}}), tuple(names)
+
+
+class RunIfBlackboard(_BlackboardGate):
+    '''
+    Runs its child only while a predicate over blackboard variables holds.
+
+    The predicate is a Python expression such as
+    "battery < 20 and mode == 'idle'", compiled once at construction.  Every
+    name in it is read from the blackboard.  If any of them does not exist, or
+    the expression raises (e.g. comparing a str with a float), the child is
+    skipped.  The predicate is not re-run while every variable still holds the
+    same immutable value.
+
+    Args:
+        child (Behaviour): Behavior to gate.
+        name (str): Name of this decorator.
+        predicate (str): Expression to evaluate, see compile_predicate().
+        success_if_skip (bool): Return SUCCESS instead of FAILURE when skipped.
+    '''
+    def __init__(self, child, name: str, predicate: str, success_if_skip: bool=True):
+        super(RunIfBlackboard, self).__init__(child, name, success_if_skip)
+        self._predicate_source = predicate
+        self._predicate, self._variable_names = compile_predicate(predicate)
+        handles = []
+        for variable_name in self._variable_names:
+            self._blackboard.register_key(key=variable_name, access=py_trees.common.Access.READ)
+            handles.append(BlackboardKeyHandle(self._blackboard, variable_name, self.logger))
+        self._watch(handles)
+        self._last_values = None
+        self._last_result = False
+        self._warned = False
+
+    @property
+    def predicate(self) -> str:
+        return self._predicate_source
+
+    @property
+    def variable_names(self) -> tuple:
+        return self._variable_names
+
+    def _should_run(self) -> bool:
+        values = [handle.get() for handle in self._handles]
+        last_values = self._last_values
+        if last_values is not None and all(
+                value is last and type(value) in _IMMUTABLE_TYPES
+                for value, last in zip(values, last_values)):
+            return self._last_result
+        if any(value is None for value in values):
+            result = False
         else:
-            self._run_child = False
-            return self._ret_status_on_failure
+            try:
+                result = bool(self._predicate(*values))
+                self._warned = False
+            except _PREDICATE_ERRORS as e:
+                if not self._warned:
+                    self._warned = True
+                    self.logger.warning(f'Failed to evaluate predicate {self._predicate_source!r}: {e}')
+                result = False
+        self._last_values = values
+        self._last_result = result
+        return result
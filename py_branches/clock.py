@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+'''
+Pluggable time sources for the time-based behaviors.
+
+Every behavior that measures elapsed time (Cooldown, Retry, Timeout,
+RandomDelay, the Pause* family and TimerVisitor) reads the time through a
+Clock instead of calling time.time() directly.  A clock can be passed in at
+construction, installed process-wide with set_default_clock() before the tree
+is built, or swapped in on an existing tree with set_tree_clock().
+
+    MonotonicClock: time.monotonic(), immune to wall-clock adjustments.
+    TickClock: caches the reading of another clock once per tree tick, so a
+        large tree reads the underlying clock once per tick.
+    SimulatedClock: only moves when advance() is called.  Useful for tests and
+        for replaying recorded runs faster than real time.
+'''
+import datetime
+import threading
+import time
+from typing import Optional
+
+import py_trees
+
+
+class Clock(object):
+    '''
+    Base class for all clocks.
+
+    now() returns seconds as a float and is only meaningful relative to other
+    readings of the same clock.  datetime() returns the local wall-clock time
+    and is used by behaviors that care about the time of day.  wait() blocks
+    for a duration measured on this clock.
+    '''
+    def now(self) -> float:
+        raise NotImplementedError
+
+    def datetime(self) -> datetime.datetime:
+        return datetime.datetime.now()
+
+    def wait(self, timeout: Optional[float], event: Optional[threading.Event] = None) -> bool:
+        '''
+        Block for timeout seconds (forever if None) or until event is set.
+
+        Returns:
+            bool: True if woken by event, False if the timeout elapsed.
+        '''
+        if event is not None:
+            return event.wait(timeout)
+        if timeout is None:
+            raise ValueError('timeout can only be None when waiting on an event.')
+        time.sleep(timeout)
+        return False
+
+
+class MonotonicClock(Clock):
+    '''Real-time clock backed by time.monotonic().'''
+    def now(self) -> float:
+        return time.monotonic()
+
+
+class TickClock(Clock):
+    '''
+    Caches the reading of a source clock until the next call to tick().
+
+    Register tick() as a pre-tick handler so every behavior in the tree sees
+    the same timestamp for the whole tick:
+
+        clock = TickClock()
+        tree = py_trees.trees.BehaviourTree(root)
+        tree.add_pre_tick_handler(clock.tick)
+        set_tree_clock(root, clock)
+
+    Args:
+        source (Clock): Clock to sample on each tick.  Defaults to a
+            MonotonicClock.
+    '''
+    def __init__(self, source: Optional[Clock] = None):
+        self._source = source if source is not None else MonotonicClock()
+        self._now = self._source.now()
+        self._datetime = None
+
+    @property
+    def source(self) -> Clock:
+        return self._source
+
+    def tick(self, tree: Optional[py_trees.trees.BehaviourTree] = None) -> None:
+        '''Refresh the cached timestamp.  Signature matches a py_trees tick handler.'''
+        self._now = self._source.now()
+        self._datetime = None
+
+    def now(self) -> float:
+        return self._now
+
+    def datetime(self) -> datetime.datetime:
+        if self._datetime is None:
+            self._datetime = self._source.datetime()
+        return self._datetime
+
+    def wait(self, timeout: Optional[float], event: Optional[threading.Event] = None) -> bool:
+        return self._source.wait(timeout, event)
+
+
+class SimulatedClock(Clock):
+    '''
+    Manually advanced clock.
+
+    Args:
+        start (float): Initial value returned by now().
+        start_datetime (datetime): Wall-clock time corresponding to start.
+            Defaults to the real local time at construction.
+
+    Example:
+        clock = SimulatedClock()
+        timeout = Timeout(child, name="Timeout", duration=5.0, clock=clock)
+        timeout.tick_once()
+        clock.advance(5.0)
+        timeout.tick_once()  # FAILURE, without sleeping
+    '''
+    def __init__(self, start: float = 0.0,
+                       start_datetime: Optional[datetime.datetime] = None):
+        self._start = start
+        self._now = start
+        self._start_datetime = start_datetime if start_datetime is not None else datetime.datetime.now()
+
+    def advance(self, seconds: float) -> None:
+        if seconds < 0.0:
+            raise ValueError(f'seconds({seconds}) must be non-negative.')
+        self._now += seconds
+
+    def set(self, now: float) -> None:
+        if now < self._now:
+            raise ValueError(f'now({now}) can not move the clock backwards from {self._now}.')
+        self._now = now
+
+    def now(self) -> float:
+        return self._now
+
+    def datetime(self) -> datetime.datetime:
+        return self._start_datetime + datetime.timedelta(seconds=self._now - self._start)
+
+    def wait(self, timeout: Optional[float], event: Optional[threading.Event] = None) -> bool:
+        '''Advance by timeout instantly, unless event is already set.'''
+        if event is not None and event.is_set():
+            return True
+        if timeout is None:
+            raise ValueError('SimulatedClock can not wait forever; nothing else can advance it.')
+        self.advance(timeout)
+        return False
+
+
+_default_clock: Clock = MonotonicClock()
+
+
+def get_default_clock() -> Clock:
+    '''Clock used by behaviors constructed without an explicit clock.'''
+    return _default_clock
+
+
+def set_default_clock(clock: Clock) -> None:
+    '''
+    Set the clock used by behaviors constructed without an explicit clock.
+
+    Only affects behaviors constructed afterwards; use set_tree_clock() for an
+    existing tree.
+    '''
+    global _default_clock
+    if not isinstance(clock, Clock):
+        raise TypeError(f'clock must be a Clock, got {type(clock)}')
+    _default_clock = clock
+
+
+def set_tree_clock(root: py_trees.behaviour.Behaviour, clock: Clock) -> int:
+    '''
+    Point every clock-aware behavior under root (inclusive) at clock.
+
+    Returns:
+        int: Number of behaviors that were updated.
+    '''
+    if not isinstance(clock, Clock):
+        raise TypeError(f'clock must be a Clock, got {type(clock)}')
+    updated = 0
+    for node in root.iterate():
+        if isinstance(getattr(node, 'clock', None), Clock):
+            node.clock = clock
+            updated += 1
+    return updated
+
+
+__all__ = ['Clock', 'MonotonicClock', 'TickClock', 'SimulatedClock',
+           'get_default_clock', 'set_default_clock', 'set_tree_clock']
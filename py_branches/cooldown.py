@@ -1,7 +1,11 @@
 #!/usr/bin/env python3
-import time
+from typing import Optional
 import py_trees
 
+from .clock import Clock
+from .clock import get_default_clock
+from .fast import tick_decorator
+
 
 class Cooldown(py_trees.decorators.Decorator):
     '''
@@ -23,6 +27,7 @@ class Cooldown(py_trees.decorators.Decorator):
         duration (float): Cooldown period in seconds after each completion.
         success_if_cooling (bool): Return SUCCESS instead of FAILURE while
             cooling down.  Default False.
+        clock (Clock): Time source.  Defaults to the process default clock.
 
     Example:
         child = py_trees.behaviours.Success(name="Expensive")
@@ -32,7 +37,8 @@ class Cooldown(py_trees.decorators.Decorator):
     def __init__(self, child: py_trees.behaviour.Behaviour,
                        name: str,
                        duration: float,
-                       success_if_cooling: bool = False):
+                       success_if_cooling: bool = False,
+                       clock: Optional[Clock] = None):
         if duration <= 0.0:
             raise ValueError(f'duration({duration}) must be positive.')
         super(Cooldown, self).__init__(name=name, child=child)
@@ -40,26 +46,43 @@ class Cooldown(py_trees.decorators.Decorator):
         self._success_if_cooling = success_if_cooling
         self._cooling = False
         self._cool_start = None
+        self.clock = clock if clock is not None else get_default_clock()
 
-    def tick(self):
+    def _skip_while_cooling(self) -> bool:
         if self._cooling:
-            elapsed = time.time() - self._cool_start
+            elapsed = self.clock.now() - self._cool_start
             if elapsed < self._duration:
                 if self._success_if_cooling:
                     self.stop(py_trees.common.Status.SUCCESS)
                 else:
                     self.stop(py_trees.common.Status.FAILURE)
-                yield self
-                return
+                return True
             else:
                 self._cooling = False
+        return False
+
+    def tick(self):
+        if self._skip_while_cooling():
+            yield self
+            return
 
         for node in super().tick():
             yield node
 
+    def tick_fast(self) -> py_trees.common.Status:
+        if self._skip_while_cooling():
+            return self.status
+        return tick_decorator(self)
+
+    def next_wakeup(self) -> Optional[float]:
+        '''Clock time at which the cooldown expires, or None if not cooling.'''
+        if self._cooling:
+            return self._cool_start + self._duration
+        return None
+
     def update(self) -> py_trees.common.Status:
         status = self.decorated.status
         if status != py_trees.common.Status.RUNNING:
             self._cooling = True
-            self._cool_start = time.time()
+            self._cool_start = self.clock.now()
         return status
@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 import py_trees
 
+from .fast import tick_decorator
+
 
 class Counter(py_trees.decorators.Decorator):
     '''
@@ -56,6 +58,12 @@ class Counter(py_trees.decorators.Decorator):
             for node in super().tick():
                 yield node
 
+    def tick_fast(self) -> py_trees.common.Status:
+        if self._done:
+            self.stop(self._completion_status)
+            return self.status
+        return tick_decorator(self)
+
     def update(self) -> py_trees.common.Status:
         status = self.decorated.status
         if status == py_trees.common.Status.RUNNING:
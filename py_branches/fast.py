@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+'''
+Generator-free ticking.
+
+py_trees ticks a tree by driving one generator per node, so a stack of k
+decorators costs k generator frames per tick.  py_branches behaviors also
+implement tick_fast(), a plain method that does the same work as tick() and
+returns the new status.  fast_tick() ticks any node that way:
+
+    * nodes with a tick_fast() matching their tick() call it directly,
+    * plain leaves and plain decorators (tick() not overridden) are ticked
+      by equivalent functions here,
+    * anything else (py_trees composites, behaviors with a custom tick(), or
+      a tick() patched on the instance, e.g. by TickProfiler) is ticked
+      through its generator, children included.
+
+tick_tree() is a drop-in for BehaviourTree.tick() that uses fast_tick() on
+the root.  Visitors that are not `full` need every node yielded to them, so
+with such a visitor attached the tree is ticked the py_trees way.
+
+    tree = py_trees.trees.BehaviourTree(root)
+    while True:
+        tick_tree(tree)
+'''
+from typing import Callable
+from typing import Dict
+
+import py_trees
+
+_RUNNING = py_trees.common.Status.RUNNING
+_INVALID = py_trees.common.Status.INVALID
+_STATUSES = frozenset(py_trees.common.Status)
+
+
+def _finish(node: py_trees.behaviour.Behaviour, new_status: py_trees.common.Status) -> py_trees.common.Status:
+    if new_status not in _STATUSES:
+        node.logger.error(f'A behaviour returned an invalid status, setting to INVALID [{new_status}][{node.name}]')
+        new_status = _INVALID
+    if new_status != _RUNNING:
+        node.stop(new_status)
+    node.status = new_status
+    return new_status
+
+
+def tick_leaf(node: py_trees.behaviour.Behaviour) -> py_trees.common.Status:
+    '''Equivalent of py_trees.behaviour.Behaviour.tick(), returning the new status.'''
+    if node.status != _RUNNING:
+        node.initialise()
+    return _finish(node, node.update())
+
+
+def tick_decorator(node: py_trees.decorators.Decorator) -> py_trees.common.Status:
+    '''Equivalent of py_trees.decorators.Decorator.tick(), returning the new status.'''
+    if node.status != _RUNNING:
+        node.initialise()
+    fast_tick(node.decorated)
+    return _finish(node, node.update())
+
+
+def _tick_generator(node: py_trees.behaviour.Behaviour) -> py_trees.common.Status:
+    for _ in node.tick():
+        pass
+    return node.status
+
+
+def _owner(cls: type, attribute: str) -> type:
+    return next(klass for klass in cls.__mro__ if attribute in klass.__dict__)
+
+
+def _tick_function(cls: type) -> Callable[[py_trees.behaviour.Behaviour], py_trees.common.Status]:
+    tick = cls.tick
+    if hasattr(cls, 'tick_fast') and issubclass(_owner(cls, 'tick_fast'), _owner(cls, 'tick')):
+        return cls.tick_fast  # a subclass overriding tick() but not tick_fast() falls through
+    if tick is py_trees.decorators.Decorator.tick:
+        return tick_decorator
+    if tick is py_trees.behaviour.Behaviour.tick:
+        return tick_leaf
+    return _tick_generator
+
+
+_TICK_FUNCTIONS: Dict[type, Callable[[py_trees.behaviour.Behaviour], py_trees.common.Status]] = {}
+
+
+def fast_tick(node: py_trees.behaviour.Behaviour) -> py_trees.common.Status:
+    '''Tick node (and its subtree) once without generators where possible; returns its new status.'''
+    if 'tick' in node.__dict__:
+        return _tick_generator(node)
+    cls = type(node)
+    function = _TICK_FUNCTIONS.get(cls)
+    if function is None:
+        function = _TICK_FUNCTIONS[cls] = _tick_function(cls)
+    return function(node)
+
+
+def supports_fast_tick(root: py_trees.behaviour.Behaviour) -> bool:
+    '''True if fast_tick(root) reaches every node without falling back to a generator.'''
+    for node in root.iterate():
+        if 'tick' in node.__dict__ or _tick_function(type(node)) is _tick_generator:
+            return False
+    return True
+
+
+def tick_tree(tree: py_trees.trees.BehaviourTree) -> None:
+    '''
+    Tick tree once, like tree.tick(), using fast_tick() on the root.
+
+    Pre/post tick handlers and `full` visitors run as usual.  If any visitor
+    is not `full`, falls back to tree.tick().
+    '''
+    visitors = tree.visitors
+    if any(not visitor.full for visitor in visitors):
+        tree.tick()
+        return
+
+    for handler in tree.pre_tick_handlers:
+        handler(tree)
+    for visitor in visitors:
+        visitor.initialise()
+
+    fast_tick(tree.root)
+
+    if visitors:
+        for node in tree.root.iterate():
+            for visitor in visitors:
+                node.visit(visitor)
+    for visitor in visitors:
+        visitor.finalise()
+    for handler in tree.post_tick_handlers:
+        handler(tree)
+    tree.count += 1
+
+
+__all__ = ['fast_tick', 'tick_leaf', 'tick_decorator', 'supports_fast_tick', 'tick_tree']
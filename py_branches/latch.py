@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 import py_trees
 
+from .fast import tick_decorator
+
 
 class Latch(py_trees.decorators.Decorator):
     '''
@@ -45,6 +47,12 @@ class Latch(py_trees.decorators.Decorator):
             for node in super().tick():
                 yield node
 
+    def tick_fast(self) -> py_trees.common.Status:
+        if self._latched:
+            self.stop(py_trees.common.Status.SUCCESS)
+            return self.status
+        return tick_decorator(self)
+
     def update(self) -> py_trees.common.Status:
         if self.decorated.status == py_trees.common.Status.SUCCESS:
             self._latched = True
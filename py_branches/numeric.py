@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+'''
+Numeric blackboard namespaces for large sets of counters and metrics.
+
+A NumericNamespace keeps many named numbers in one numpy array with a
+name -> index map.  Behaviors resolve their index once at construction and
+then read and write the array directly, without a py_trees client, and bulk
+operations (reset, decay, snapshot) are single vectorized calls.
+
+    attempts = get_numeric_namespace('attempts')
+    count = IncrementNumericIfCondition(try_target, 'CountAttempts', attempts,
+                                        'target_3', py_trees.common.Status.FAILURE)
+    gate = RunIfNumeric(try_target, 'GiveUp', attempts, 'target_3', '<', 5)
+    ...
+    attempts.decay(0.9)
+
+Namespaces are process-wide, like the py_trees blackboard, and are looked up
+by name with get_numeric_namespace().
+'''
+import operator
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Union
+
+import numpy as np
+import py_trees
+
+from .blackboard import _Gate
+
+
+class NumericNamespace(object):
+    '''
+    Named numbers stored in a single numpy array.
+
+    Keys are added with add() (or implicitly by index()) and never removed.
+    The backing array grows geometrically, so values must be accessed through
+    the namespace rather than through a view held across add() calls.
+
+    Args:
+        name (str): Name of the namespace.
+        keys (iterable of str): Keys to create up front.
+        dtype: numpy dtype of the values.
+        initial (float): Value of newly added keys, and of all keys after reset().
+    '''
+    def __init__(self, name: str,
+                       keys: Iterable[str] = (),
+                       dtype=np.float64,
+                       initial: float = 0.0):
+        self._name = name
+        self._dtype = np.dtype(dtype)
+        self._initial = initial
+        self._index: Dict[str, int] = {}
+        self._keys: List[str] = []
+        self._values = np.full(16, initial, dtype=self._dtype)
+        for key in keys:
+            self.add(key)
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def keys(self) -> List[str]:
+        return list(self._keys)
+
+    @property
+    def values(self) -> np.ndarray:
+        '''View of the current values, ordered like keys.  Invalidated by add().'''
+        return self._values[:len(self._keys)]
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+    def add(self, key: str) -> int:
+        '''Add key (if new) with the initial value and return its index.'''
+        index = self._index.get(key)
+        if index is not None:
+            return index
+        index = len(self._keys)
+        if index == len(self._values):
+            values = np.full(2 * len(self._values), self._initial, dtype=self._dtype)
+            values[:index] = self._values
+            self._values = values
+        self._values[index] = self._initial
+        self._index[key] = index
+        self._keys.append(key)
+        return index
+
+    def index(self, key: str) -> int:
+        '''Index of key in values, adding the key if it does not exist.'''
+        index = self._index.get(key)
+        return index if index is not None else self.add(key)
+
+    def __getitem__(self, key: str):
+        return self._values[self._index[key]].item()
+
+    def __setitem__(self, key: str, value) -> None:
+        index = self.index(key)  # before reading _values, which add() may replace
+        self._values[index] = value
+
+    def increment(self, key: str, by=1) -> None:
+        index = self.index(key)
+        self._values[index] += by
+
+    def reset(self, value: Optional[float] = None) -> None:
+        '''Set every key to value (the initial value if None).'''
+        self._values[:len(self._keys)] = self._initial if value is None else value
+
+    def decay(self, factor: float) -> None:
+        '''Multiply every value by factor.'''
+        values = self._values[:len(self._keys)]
+        if values.dtype.kind == 'f':
+            values *= factor
+        else:
+            values[:] = values * factor
+
+    def snapshot(self) -> Dict[str, Union[int, float]]:
+        '''{key: value} copy of the namespace.'''
+        return dict(zip(self._keys, self._values[:len(self._keys)].tolist()))
+
+    def to_array(self) -> np.ndarray:
+        '''Copy of the current values, ordered like keys.'''
+        return self._values[:len(self._keys)].copy()
+
+
+_namespaces: Dict[str, NumericNamespace] = {}
+
+
+def get_numeric_namespace(name: str, dtype=np.float64, initial: float = 0.0) -> NumericNamespace:
+    '''
+    The process-wide NumericNamespace called name, created on first use.
+
+    dtype and initial only apply when the namespace is created.
+    '''
+    namespace = _namespaces.get(name)
+    if namespace is None:
+        namespace = _namespaces[name] = NumericNamespace(name, dtype=dtype, initial=initial)
+    return namespace
+
+
+def clear_numeric_namespaces() -> None:
+    '''Forget every namespace created by get_numeric_namespace().'''
+    _namespaces.clear()
+
+
+def _resolve(namespace: Union[NumericNamespace, str]) -> NumericNamespace:
+    if isinstance(namespace, NumericNamespace):
+        return namespace
+    return get_numeric_namespace(namespace)
+
+
+class IncrementNumeric(py_trees.behaviour.Behaviour):
+    '''
+    Adds increment_by to a numeric namespace key, then returns SUCCESS.
+
+    Args:
+        name (str): Name of this behavior.
+        namespace (NumericNamespace or str): Namespace, or its name.
+        key (str): Key to increment, created if missing.
+        increment_by (float): Amount to add.
+    '''
+    def __init__(self, name: str, namespace: Union[NumericNamespace, str], key: str, increment_by: float=1.0):
+        super(IncrementNumeric, self).__init__(name)
+        self._namespace = _resolve(namespace)
+        self._key = key
+        self._index = self._namespace.index(key)
+        self._increment_by = increment_by
+
+    def update(self):
+        self._namespace._values[self._index] += self._increment_by
+        return py_trees.common.Status.SUCCESS
+
+
+class IncrementNumericIfCondition(py_trees.decorators.Decorator):
+    '''
+    Adds increment_by to a numeric namespace key whenever the child returns condition.
+
+    Returns the child's status, unchanged.
+    '''
+    def __init__(self, child, name: str, namespace: Union[NumericNamespace, str], key: str,
+                 condition: py_trees.common.Status, increment_by: float=1.0):
+        super(IncrementNumericIfCondition, self).__init__(name=name, child=child)
+        self._namespace = _resolve(namespace)
+        self._key = key
+        self._index = self._namespace.index(key)
+        self._condition = condition
+        self._increment_by = increment_by
+
+    def update(self):
+        if self.decorated.status == self._condition:
+            self._namespace._values[self._index] += self._increment_by
+        return self.decorated.status
+
+
+_COMPARISONS = {
+    '<': operator.lt,
+    '<=': operator.le,
+    '==': operator.eq,
+    '!=': operator.ne,
+    '>': operator.gt,
+    '>=': operator.ge,
+}
+
+
+class RunIfNumeric(_Gate):
+    '''
+    Runs its child only while `namespace[key] <op> value` holds.
+
+    Behaves like the RunIfBlackboardVariable* gates: the comparison is made on
+    each fresh entry and held while the child is RUNNING; when it fails the
+    gate returns SUCCESS or FAILURE without ticking the child.
+
+    Args:
+        child (Behaviour): Behavior to gate.
+        name (str): Name of this decorator.
+        namespace (NumericNamespace or str): Namespace, or its name.
+        key (str): Key to compare, created if missing.
+        op (str): One of '<', '<=', '==', '!=', '>', '>='.
+        value (float): Right-hand side of the comparison.
+        success_if_skip (bool): Return SUCCESS instead of FAILURE when skipped.
+    '''
+    def __init__(self, child, name: str, namespace: Union[NumericNamespace, str], key: str,
+                 op: str, value: float, success_if_skip: bool=True):
+        if op not in _COMPARISONS:
+            raise ValueError(f'op({op!r}) must be one of {list(_COMPARISONS)}.')
+        super(RunIfNumeric, self).__init__(child, name, success_if_skip)
+        self._namespace = _resolve(namespace)
+        self._key = key
+        self._index = self._namespace.index(key)
+        self._compare = _COMPARISONS[op]
+        self._value = value
+
+    def _should_run(self) -> bool:
+        return bool(self._compare(self._namespace._values[self._index], self._value))
+
+
+__all__ = ['NumericNamespace', 'get_numeric_namespace', 'clear_numeric_namespaces',
+           'IncrementNumeric', 'IncrementNumericIfCondition', 'RunIfNumeric']
@@ -1,16 +1,18 @@
 #!/usr/bin/env python3
+import bisect
 import logging
-import time
 import py_trees
 import datetime
 import random
 import yaml
 import os
+import sys
 from typing import Dict
 from typing import List
+from typing import Optional
 
-import numpy as np
-from sklearn.neighbors import KernelDensity
+from .clock import Clock
+from .clock import get_default_clock
 
 
 HOUR2SEC = 3600
@@ -24,24 +26,49 @@ def _create_keyboard_listener(on_press):
 
 
 class PauseUniform(py_trees.behaviour.Behaviour):
-    def __init__(self, name: str, low: float, high: float):
+    def __init__(self, name: str, low: float, high: float, clock: Optional[Clock] = None, rng=None):
         super(PauseUniform, self).__init__(name=name)
         self._high = high
         self._low = low
+        self.clock = clock if clock is not None else get_default_clock()
+        self.rng = rng if rng is not None else random
 
     def initialise(self):
-        self._pause_t = random.uniform(self._low, self._high)
-        self._start_t = time.time()
+        self._pause_t = self.rng.uniform(self._low, self._high)
+        self._start_t = self.clock.now()
+
+    def next_wakeup(self) -> Optional[float]:
+        '''Clock time at which the pause ends, or None if not pausing.'''
+        if self.status == py_trees.common.Status.RUNNING:
+            return self._start_t + self._pause_t
+        return None
 
     def update(self):
-        t_elapse = time.time() - self._start_t
+        t_elapse = self.clock.now() - self._start_t
         if t_elapse < self._pause_t:
             return py_trees.common.Status.RUNNING
         else:
             return py_trees.common.Status.SUCCESS
 
 class PausePDF(py_trees.behaviour.Behaviour):
-    """Pause for a duration sampled from a KDE fit to a file of float samples."""
+    """Pause for a duration sampled from a KDE fit to a file of float samples.
+
+    The file holds one float per line (blank lines and ``#`` comments are
+    ignored), or is a ``.npy`` array, which is memory-mapped rather than parsed.
+    Parsed samples and fitted samplers are cached process-wide per
+    (file, bandwidth, backend) and shared by every PausePDF built from them;
+    the cache notices when a file is modified.  See ``clear_pdf_cache``.
+
+    Pause durations are drawn from the KDE in batches restricted to
+    ``[min_t, max_t]`` and kept in a pool of ``pool_size`` values, so each
+    ``initialise`` just pops the next one.  ``seed`` makes the sequence of
+    pauses reproducible.
+
+    ``backend='numpy'`` (default) samples the Gaussian KDE directly and
+    truncates each kernel to the bounds analytically.  ``backend='sklearn'``
+    fits ``sklearn.neighbors.KernelDensity`` and filters its draws against the
+    bounds instead.
+    """
 
     def __init__(
         self,
@@ -50,40 +77,70 @@ class PausePDF(py_trees.behaviour.Behaviour):
         kernel_bandwidth: float = 1.0,
         min_t: float = 0.0,
         max_t: float = float('inf'),
+        clock: Optional[Clock] = None,
+        pool_size: int = 1024,
+        seed: Optional[int] = None,
+        backend: str = 'numpy',
     ):
+        # numpy (and scikit-learn for that backend) are only needed here; keep them off the
+        # import path of the module.
+        import numpy as np
+        from ._kde import KDE_BACKENDS
+        from ._kde import shared_sampler
+
         super(PausePDF, self).__init__(name=name)
         if not os.path.isfile(filepath):
             raise FileNotFoundError(f'filepath: {filepath} is not a valid file')
+        if pool_size < 1:
+            raise ValueError(f'pool_size({pool_size}) must be greater than 0.')
+        if min_t > max_t:
+            raise ValueError(f'min_t({min_t}) must be <= max_t({max_t}).')
+        if backend not in KDE_BACKENDS:
+            raise ValueError(f'backend({backend}) must be one of {sorted(KDE_BACKENDS)}.')
 
-        samples = []
-        with open(filepath, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if not line or line.startswith('#'):
-                    continue
-                samples.append(float(line))
-        assert len(samples), f'filepath: {filepath} contains no float samples'
+        self._sampler = shared_sampler(filepath, kernel_bandwidth, backend)
+        assert self._sampler is not None, f'filepath: {filepath} contains no float samples'
 
         self._min_t = min_t
         self._max_t = max_t
-        self._model = KernelDensity(bandwidth=kernel_bandwidth, kernel='gaussian')
-        self._model.fit(np.asarray(samples).reshape(-1, 1))
+        self._pool_size = pool_size
+        self._pool = []
+        self._rng = np.random.default_rng(seed)
+        self.clock = clock if clock is not None else get_default_clock()
+
+    def _refill_pool(self):
+        try:
+            pool = self._sampler.sample(self._pool_size, self._rng, self._min_t, self._max_t)
+        except ValueError as e:
+            raise ValueError(f'{self.name}: {e}') from e
+        self._pool = pool.tolist()
 
     def initialise(self):
-        t_wait = self._min_t - 1.0
-        while not (self._min_t <= t_wait <= self._max_t):
-            t_wait = float(self._model.sample(1)[0][0])
-        self._pause_t = t_wait
-        self._start_t = time.time()
+        if not self._pool:
+            self._refill_pool()
+        self._pause_t = self._pool.pop()
+        self._start_t = self.clock.now()
         self.logger.debug(f'{self.name} sampled pause {self._pause_t:.3f} sec')
 
+    def next_wakeup(self) -> Optional[float]:
+        '''Clock time at which the pause ends, or None if not pausing.'''
+        if self.status == py_trees.common.Status.RUNNING:
+            return self._start_t + self._pause_t
+        return None
+
     def update(self):
-        t_elapse = time.time() - self._start_t
+        t_elapse = self.clock.now() - self._start_t
         if t_elapse < self._pause_t:
             return py_trees.common.Status.RUNNING
         return py_trees.common.Status.SUCCESS
 
 
+def clear_pdf_cache() -> None:
+    """Drop the process-wide PausePDF sample and sampler cache."""
+    if 'py_branches._kde' in sys.modules:
+        sys.modules['py_branches._kde'].clear_cache()
+
+
 class PauseUntilKey(py_trees.behaviour.Behaviour):
     """Pause (RUNNING) until the configured key is pressed, then SUCCESS.
 
@@ -131,7 +188,7 @@ class PauseUntilKey(py_trees.behaviour.Behaviour):
             self._listener = None
 
 
-def load_schedule_file(schedule_filepath: str):
+def load_schedule_file(schedule_filepath: str, rng=None):
     if not os.path.isfile(schedule_filepath):
         raise FileNotFoundError(f'schedule_filepath: {schedule_filepath} is not a valid file')
     
@@ -143,43 +200,208 @@ def load_schedule_file(schedule_filepath: str):
         start_pause_time = datetime.datetime.strptime(schedule_element_raw['start_pause_time'], '%H:%M:%S').time()
         stop_pause_time = datetime.datetime.strptime(schedule_element_raw['stop_pause_time'], '%H:%M:%S').time()
         variance_time = datetime.datetime.strptime(schedule_element_raw['variance'], '%H:%M:%S').time()
-        schedule.append({'start_pause_time': start_pause_time,
-                         'stop_pause_time': stop_pause_time,
-                         'variance_time': variance_time,
-                         'start_plus_variance_time': add_variance_to_datetime_time(start_pause_time, variance_time),
-                         'stop_plus_variance_time': add_variance_to_datetime_time(stop_pause_time, variance_time)})
+        schedule.append(_ScheduleElement(
+            {'start_pause_time': start_pause_time,
+             'stop_pause_time': stop_pause_time,
+             'variance_time': variance_time,
+             'start_plus_variance_time': add_variance_to_datetime_time(start_pause_time, variance_time, rng),
+             'stop_plus_variance_time': add_variance_to_datetime_time(stop_pause_time, variance_time, rng)}))
     return schedule
 
 def datetime_time_to_sec(t: datetime.time):
     sec = t.hour*HOUR2SEC+t.minute*MIN2SEC+t.second
     return sec
 
-def add_variance_to_datetime_time(t: datetime.time, variance_time: datetime.time) -> datetime.time:
+def add_variance_to_datetime_time(t: datetime.time, variance_time: datetime.time, rng=None) -> datetime.time:
+    rng = rng if rng is not None else random
     variance_sec = datetime_time_to_sec(variance_time)
-    variance_timedelta = datetime.timedelta(seconds=random.uniform(0.0, variance_sec))
+    variance_timedelta = datetime.timedelta(seconds=rng.uniform(0.0, variance_sec))
     time_to_datetime = datetime.datetime.combine(datetime.date.today(), t)
     time_with_variance = (time_to_datetime + variance_timedelta).time()
     return time_with_variance
 
+def _datetime_time_to_float_sec(t: datetime.time) -> float:
+    return t.hour*HOUR2SEC + t.minute*MIN2SEC + t.second + t.microsecond*1e-6
+
+class _ScheduleIndex(object):
+    '''
+    Seconds-of-day lookup table for the pause windows of a schedule.
+
+    Every window boundary splits the day into elementary open segments and the
+    boundary points between them.  Each segment and point records the lowest
+    schedule index whose window contains it (matching a first-match linear
+    scan), so a lookup is one bisect.  Windows that wrap past midnight cover
+    (start, 24h) and [0, stop).  The segment found last is cached, so repeated
+    lookups that stay between the same two boundaries are O(1).
+    '''
+    def __init__(self, schedule: List[Dict[str, datetime.time]]):
+        windows = []
+        for schedule_element in schedule:
+            windows.append((_datetime_time_to_float_sec(schedule_element['start_plus_variance_time']),
+                            _datetime_time_to_float_sec(schedule_element['stop_plus_variance_time'])))
+        day = float(24*HOUR2SEC)
+        self._bounds = sorted({0.0, day}.union(*windows))
+        n_bounds = len(self._bounds)
+        position = {bound: k for k, bound in enumerate(self._bounds)}
+        self._segment_owner: List[Optional[int]] = [None] * (n_bounds - 1)
+        self._point_owner: List[Optional[int]] = [None] * n_bounds
+        # "Next unassigned slot at or after k", path-compressed, so every slot is assigned once.
+        next_free_segment = list(range(n_bounds))
+        next_free_point = list(range(n_bounds + 1))
+
+        def assign(owner, next_free, first, last, idx):
+            k = self._find(next_free, first)
+            while k <= last:
+                owner[k] = idx
+                next_free[k] = k + 1
+                k = self._find(next_free, k + 1)
+
+        for idx, (start, stop) in enumerate(windows):
+            if start < stop:
+                spans = [(start, stop)]
+            elif start > stop:
+                spans = [(start, day), (0.0, stop)]
+            else:
+                continue
+            for lo, hi in spans:
+                assign(self._segment_owner, next_free_segment, position[lo], position[hi] - 1, idx)
+                assign(self._point_owner, next_free_point, position[lo] + 1, position[hi] - 1, idx)
+            if start > stop and stop > 0.0:
+                # Midnight itself is inside a wrapping window (now < stop).
+                assign(self._point_owner, next_free_point, 0, 0, idx)
+        self._cache = None
+
+    @staticmethod
+    def _find(next_free: List[int], k: int) -> int:
+        root = k
+        while next_free[root] != root:
+            root = next_free[root]
+        while next_free[k] != root:
+            next_free[k], k = root, next_free[k]
+        return root
+
+    def lookup(self, now_sec: float) -> Optional[int]:
+        '''Index of the first window containing now_sec, or None.'''
+        cache = self._cache
+        if cache is not None and cache[0] < now_sec < cache[1]:
+            return cache[2]
+        k = bisect.bisect_right(self._bounds, now_sec) - 1
+        if self._bounds[k] == now_sec:
+            return self._point_owner[k]
+        owner = self._segment_owner[k]
+        self._cache = (self._bounds[k], self._bounds[k + 1], owner)
+        return owner
+
+_WINDOW_KEYS = frozenset(('start_plus_variance_time', 'stop_plus_variance_time'))
+
+
+class _ScheduleElement(dict):
+    '''
+    Schedule entry that marks its schedule's window index stale whenever one
+    of its window times is written, by a PauseSchedule or from outside.
+    '''
+    def __init__(self, *args, **kwargs):
+        super(_ScheduleElement, self).__init__(*args, **kwargs)
+        self._tracker = None
+
+    def _changed(self, key) -> None:
+        if key in _WINDOW_KEYS and self._tracker is not None:
+            self._tracker.index = None
+
+    def __setitem__(self, key, value):
+        super(_ScheduleElement, self).__setitem__(key, value)
+        self._changed(key)
+
+    def __delitem__(self, key):
+        super(_ScheduleElement, self).__delitem__(key)
+        self._changed(key)
+
+    def pop(self, key, *default):
+        value = super(_ScheduleElement, self).pop(key, *default)
+        self._changed(key)
+        return value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+
+class _ScheduleTracker(object):
+    '''
+    Window index shared by every PauseSchedule built on the same schedule list.
+
+    Entries of the list are made _ScheduleElements, so a write to any window
+    time, from any node or from outside, drops the index and the next lookup
+    rebuilds it.  Entries added or removed are noticed through the list's
+    length.
+    '''
+    def __init__(self, schedule: List[Dict[str, datetime.time]]):
+        self.schedule = schedule
+        self.index: Optional[_ScheduleIndex] = None
+        self._length = None
+
+    @staticmethod
+    def of(schedule: List[Dict[str, datetime.time]]) -> '_ScheduleTracker':
+        for schedule_element in schedule:
+            tracker = getattr(schedule_element, '_tracker', None)
+            if tracker is not None and tracker.schedule is schedule:
+                return tracker
+        return _ScheduleTracker(schedule)
+
+    def lookup(self, now_sec: float) -> Optional[int]:
+        if self.index is None or self._length != len(self.schedule):
+            self._rebuild()
+        return self.index.lookup(now_sec)
+
+    def _rebuild(self) -> None:
+        schedule = self.schedule
+        for idx, schedule_element in enumerate(schedule):
+            if not isinstance(schedule_element, _ScheduleElement):
+                schedule_element = schedule[idx] = _ScheduleElement(schedule_element)
+            schedule_element._tracker = self
+        self.index = _ScheduleIndex(schedule)
+        self._length = len(schedule)
+
+
 class PauseSchedule(py_trees.behaviour.Behaviour):
-    def __init__(self, name: str, schedule: List[Dict[str, datetime.time]]):
+    '''
+    Pauses until the end of the schedule window the current time falls in.
+
+    Window lookups go through a precomputed seconds-of-day index shared by
+    every PauseSchedule on the same schedule list.  Plain dicts in the list
+    are replaced by dict subclasses that drop the index when a window time
+    is written, so edits through the list (schedule[i][key] = ...) are picked
+    up on the next entry.  Only after replacing an entry of the list in place
+    (schedule[i] = {...}) is refresh_schedule() needed.
+
+    Variance is re-sampled with rng (e.g. a RandomStream), defaulting to the
+    global random module.
+    '''
+    def __init__(self, name: str, schedule: List[Dict[str, datetime.time]], clock: Optional[Clock] = None,
+                 rng=None):
         self._schedule = schedule
         self._last_schedule_idx = None
+        self.clock = clock if clock is not None else get_default_clock()
+        self.rng = rng if rng is not None else random
+        self._tracker = _ScheduleTracker.of(schedule)
+        self.refresh_schedule()
         super(PauseSchedule, self).__init__(name=name)
 
+    def refresh_schedule(self) -> None:
+        '''Rebuild the window index after entries of the schedule list were replaced.'''
+        self._tracker._rebuild()
+
     def initialise(self):
         super().initialise()
         self._t_wait = None
-        self._t_start = time.time()
-        now_time = datetime.datetime.now().time()
-        matched_idx = None
-        for idx, schedule_element in enumerate(self._schedule):
-            start = schedule_element['start_plus_variance_time']
-            stop = schedule_element['stop_plus_variance_time']
-            if (start < stop and start < now_time < stop) or \
-               (start > stop and (now_time > start or now_time < stop)):
-                matched_idx = idx
-                break
+        self._t_start = self.clock.now()
+        now_time = self.clock.datetime().time()
+        matched_idx = self._tracker.lookup(_datetime_time_to_float_sec(now_time))
 
         # Re-arm once we've left all windows.
         if matched_idx is None:
@@ -201,20 +423,26 @@ class PauseSchedule(py_trees.behaviour.Behaviour):
             self._t_wait = datetime_time_to_sec(datetime.time(23, 59, 59)) + 1 - \
                            datetime_time_to_sec(now_time) + \
                            datetime_time_to_sec(stop)
-        self._t_start = time.time()
+        self._t_start = self.clock.now()
         logging.info(f'Wait has been scheduled for  {self._t_wait:.3f} sec')
         schedule_element['start_plus_variance_time'] = \
-            add_variance_to_datetime_time(schedule_element['start_pause_time'], variance)
+            add_variance_to_datetime_time(schedule_element['start_pause_time'], variance, self.rng)
         schedule_element['stop_plus_variance_time'] = \
-            add_variance_to_datetime_time(schedule_element['stop_pause_time'], variance)
+            add_variance_to_datetime_time(schedule_element['stop_pause_time'], variance, self.rng)
         logging.info(f'new start_plus_variance_time: {schedule_element["start_plus_variance_time"]}')
         logging.info(f'new stop_plus_variance_time: {schedule_element["stop_plus_variance_time"]}')
 
+    def next_wakeup(self) -> Optional[float]:
+        '''Clock time at which the scheduled pause ends, or None if not pausing.'''
+        if self.status == py_trees.common.Status.RUNNING and self._t_wait is not None:
+            return self._t_start + self._t_wait
+        return None
+
     def update(self):
         if self._t_wait is None:
             return py_trees.common.Status.SUCCESS
 
-        t_elapse = time.time() - self._t_start
+        t_elapse = self.clock.now() - self._t_start
         if t_elapse < self._t_wait:
             return py_trees.common.Status.RUNNING
         else:
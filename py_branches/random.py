@@ -3,25 +3,41 @@
 import py_trees
 import random
 import logging
-import time
+import math
+import os
+from typing import Dict
 from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import Union
+
+from .clock import Clock
+from .clock import get_default_clock
+from .fast import fast_tick
+from .fast import tick_decorator
+from .fast import tick_leaf
 
 
 class RandomRun(py_trees.decorators.Decorator):
     '''
     Random chance of running the child of this decorator.
+
+    rng is the source of random numbers (e.g. a RandomStream) and defaults to
+    the global random module.
     '''
-    def __init__(self, child, name, probability: float, success_if_skip: bool = False):
+    def __init__(self, child, name, probability: float, success_if_skip: bool = False, rng=None):
         if not (0 <= probability <= 1.0):
             raise ValueError(f'Probability == {probability} but needs to be in range [0, 1.0]')
         super(RandomRun, self).__init__(name=name, child=child)
         self._probability = probability
         self._run = None  # rolled on first tick; terminate() handles all subsequent rolls
         self._success_if_skip = success_if_skip
+        self.rng = rng if rng is not None else random
 
     def tick(self):
         if self._run is None:
-            self._run = random.random() <= self._probability
+            self._run = self.rng.random() <= self._probability
         if not self._run:
             for node in py_trees.behaviour.Behaviour.tick(self):
                 yield node
@@ -29,6 +45,13 @@ class RandomRun(py_trees.decorators.Decorator):
             for node in super().tick():
                 yield node
 
+    def tick_fast(self) -> py_trees.common.Status:
+        if self._run is None:
+            self._run = self.rng.random() <= self._probability
+        if not self._run:
+            return tick_leaf(self)
+        return tick_decorator(self)
+
     def update(self):
         if self._run:
             return self.decorated.status
@@ -39,7 +62,7 @@ class RandomRun(py_trees.decorators.Decorator):
                 return py_trees.common.Status.FAILURE
 
     def terminate(self, new_status: py_trees.common.Status) -> None:
-        self._run = random.random() <= self._probability
+        self._run = self.rng.random() <= self._probability
 
 class RandomDelay(py_trees.decorators.Decorator):
     '''
@@ -59,6 +82,9 @@ class RandomDelay(py_trees.decorators.Decorator):
         name (str): Name of this decorator.
         low (float): Minimum delay in seconds (>= 0).
         high (float): Maximum delay in seconds (>= low).
+        clock (Clock): Time source.  Defaults to the process default clock.
+        rng: Source of random numbers, e.g. a RandomStream.  Defaults to the
+            global random module.
 
     Example:
         child = py_trees.behaviours.Success(name="Action")
@@ -68,7 +94,9 @@ class RandomDelay(py_trees.decorators.Decorator):
     def __init__(self, child: py_trees.behaviour.Behaviour,
                        name: str,
                        low: float,
-                       high: float):
+                       high: float,
+                       clock: Optional[Clock] = None,
+                       rng=None):
         if low < 0.0:
             raise ValueError(f'low({low}) must be >= 0.')
         if low > high:
@@ -79,28 +107,588 @@ class RandomDelay(py_trees.decorators.Decorator):
         self._delay = 0.0
         self._start_time = None
         self._waiting = False
+        self.clock = clock if clock is not None else get_default_clock()
+        self.rng = rng if rng is not None else random
 
-    def tick(self):
+    def _still_delaying(self) -> bool:
         # Fresh entry: sample a new delay and start the timer.
         if self.status != py_trees.common.Status.RUNNING:
-            self._delay = random.uniform(self._low, self._high)
-            self._start_time = time.time()
+            self._delay = self.rng.uniform(self._low, self._high)
+            self._start_time = self.clock.now()
             self._waiting = True
 
         if self._waiting:
-            if time.time() - self._start_time < self._delay:
+            if self.clock.now() - self._start_time < self._delay:
                 self.status = py_trees.common.Status.RUNNING
-                yield self
-                return
+                return True
             self._waiting = False
+        return False
+
+    def tick(self):
+        if self._still_delaying():
+            yield self
+            return
 
         for node in super().tick():
             yield node
 
+    def tick_fast(self) -> py_trees.common.Status:
+        if self._still_delaying():
+            return self.status
+        return tick_decorator(self)
+
+    def next_wakeup(self) -> Optional[float]:
+        '''Clock time at which the delay ends, or None if not delaying.'''
+        if self._waiting and self.status == py_trees.common.Status.RUNNING:
+            return self._start_time + self._delay
+        return None
+
     def update(self) -> py_trees.common.Status:
         return self.decorated.status
 
 
+class _AliasTable(object):
+    '''
+    Walker/Vose alias table: O(n) to build, O(1) per draw.
+
+    Column i is chosen uniformly, then either i itself or alias[i] is returned
+    depending on threshold[i].  Both decisions come from a single uniform draw.
+    '''
+    def __init__(self, weights: Sequence[float]):
+        n = len(weights)
+        total = float(sum(weights))
+        scaled = [w * n / total for w in weights]
+        self._n = n
+        self._threshold = [1.0] * n
+        self._alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            self._threshold[s] = scaled[s]
+            self._alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        # Whatever is left is 1.0 up to rounding error and keeps threshold 1.0.
+
+    def sample(self, u: float) -> int:
+        '''Index drawn with probability proportional to its weight, for u uniform in [0, 1).'''
+        u *= self._n
+        column = int(u)
+        if column >= self._n:  # u == 1.0 from a non-standard rng
+            column = self._n - 1
+        return column if u - column < self._threshold[column] else self._alias[column]
+
+
+class _SingleChildChooser(py_trees.composites.Composite):
+    '''
+    Composite that picks one child on each fresh entry and mirrors its status.
+
+    Subclasses implement _choose(), returning the index of the child to run.
+    The chosen child is ticked until it returns SUCCESS or FAILURE, which the
+    composite then returns; the other children are not ticked.
+    _child_finished() is called with the child's index and result.
+    '''
+    def _choose(self) -> int:
+        raise NotImplementedError
+
+    def _child_finished(self, index: int, status: py_trees.common.Status) -> None:
+        pass
+
+    def _enter(self) -> Optional[py_trees.behaviour.Behaviour]:
+        if self.status != py_trees.common.Status.RUNNING:
+            previous = self.current_child
+            self.current_child = None
+            self.initialise()
+            if self.children:
+                self._current_index = self._choose()
+                self.current_child = self.children[self._current_index]
+                if (previous is not None and previous is not self.current_child
+                        and previous.status != py_trees.common.Status.INVALID):
+                    previous.stop(py_trees.common.Status.INVALID)
+
+        if self.current_child is None:
+            self.stop(py_trees.common.Status.FAILURE)
+        return self.current_child
+
+    def _leave(self, child: py_trees.behaviour.Behaviour) -> None:
+        if child.status == py_trees.common.Status.RUNNING:
+            self.status = py_trees.common.Status.RUNNING
+        else:
+            self._child_finished(self._current_index, child.status)
+            self.stop(child.status)
+
+    def tick(self):
+        self.logger.debug(f'{self.__class__.__name__}.tick()')
+        child = self._enter()
+        if child is not None:
+            for node in child.tick():
+                yield node
+            self._leave(child)
+        yield self
+
+    def tick_fast(self) -> py_trees.common.Status:
+        child = self._enter()
+        if child is not None:
+            fast_tick(child)
+            self._leave(child)
+        return self.status
+
+
+class WeightedRandomSelector(_SingleChildChooser):
+    '''
+    Runs one child, chosen at random in proportion to its weight, per entry.
+
+    On each fresh entry a child is drawn in O(1) from a Walker/Vose alias table
+    (one rng.random() call regardless of the number of children) and ticked
+    until it finishes; its result is the selector's result.  Unlike
+    random_selector(), a FAILURE from the chosen child is returned as is rather
+    than falling through to another child.
+
+    Weights can be changed at runtime with set_weight()/set_weights(); the
+    table is rebuilt on the next draw, so a batch of updates costs one
+    O(n) rebuild.
+
+    Args:
+        name (str): Name of this composite.
+        children (list of Behaviour): Children to choose from.
+        weights (list of float): Non-negative weight per child, not all zero.
+            Defaults to equal weights.
+        rng: Source of random numbers, e.g. a RandomStream.  Defaults to the
+            global random module.
+
+    Example:
+        selector = WeightedRandomSelector('Pick', [a, b, c], [0.2, 0.3, 0.5])
+        selector.set_weight(c, 0.0)  # never pick c from now on
+    '''
+    def __init__(self, name: str,
+                       children: Optional[List[py_trees.behaviour.Behaviour]] = None,
+                       weights: Optional[Sequence[float]] = None,
+                       rng=None):
+        self._weights: List[float] = []
+        self._table = None
+        self._current_index = None
+        self.rng = rng if rng is not None else random
+        super(WeightedRandomSelector, self).__init__(name=name, children=None)
+        children = list(children) if children is not None else []
+        if weights is None:
+            weights = [1.0] * len(children)
+        if len(weights) != len(children):
+            raise ValueError('len(weights) != len(children), two lists must be of same length.')
+        for child, weight in zip(children, weights):
+            self.add_child(child, weight)
+
+    @property
+    def weights(self) -> List[float]:
+        return list(self._weights)
+
+    @staticmethod
+    def _check_weight(weight: float) -> float:
+        weight = float(weight)
+        if not weight >= 0.0 or weight == float('inf'):
+            raise ValueError(f'weight({weight}) must be finite and >= 0.')
+        return weight
+
+    def _index_of(self, child: Union[int, py_trees.behaviour.Behaviour]) -> int:
+        if isinstance(child, int):
+            return child
+        return self.children.index(child)
+
+    def set_weight(self, child: Union[int, py_trees.behaviour.Behaviour], weight: float) -> None:
+        '''Set the weight of a child (by index or object).  Takes effect on the next draw.'''
+        self._weights[self._index_of(child)] = self._check_weight(weight)
+        self._table = None
+
+    def set_weights(self, weights: Sequence[float]) -> None:
+        if len(weights) != len(self.children):
+            raise ValueError('len(weights) != len(children), two lists must be of same length.')
+        self._weights = [self._check_weight(weight) for weight in weights]
+        self._table = None
+
+    def add_child(self, child: py_trees.behaviour.Behaviour, weight: float = 1.0):
+        weight = self._check_weight(weight)
+        child_id = super(WeightedRandomSelector, self).add_child(child)
+        self._weights.append(weight)
+        self._table = None
+        return child_id
+
+    def insert_child(self, child: py_trees.behaviour.Behaviour, index: int, weight: float = 1.0):
+        weight = self._check_weight(weight)
+        child_id = super(WeightedRandomSelector, self).insert_child(child, index)
+        self._weights.insert(index, weight)
+        self._table = None
+        return child_id
+
+    def prepend_child(self, child: py_trees.behaviour.Behaviour, weight: float = 1.0):
+        return self.insert_child(child, 0, weight)
+
+    def replace_child(self, child: py_trees.behaviour.Behaviour,
+                            replacement: py_trees.behaviour.Behaviour) -> None:
+        '''Replace child with replacement, which takes over its weight.'''
+        index = self.children.index(child)
+        weight = self._weights[index]
+        super(WeightedRandomSelector, self).replace_child(child, replacement)
+        self._weights[index] = weight
+
+    def remove_child(self, child: py_trees.behaviour.Behaviour) -> int:
+        index = super(WeightedRandomSelector, self).remove_child(child)
+        del self._weights[index]
+        self._table = None
+        return index
+
+    def remove_all_children(self) -> None:
+        super(WeightedRandomSelector, self).remove_all_children()
+        self._weights = []
+        self._table = None
+
+    def _choose(self) -> int:
+        if self._table is None:
+            if not sum(self._weights) > 0.0:
+                raise ValueError(f'{self.name}: at least one weight must be positive.')
+            self._table = _AliasTable(self._weights)
+        return self._table.sample(self.rng.random())
+
+
+class BanditSelector(_SingleChildChooser):
+    '''
+    Runs one child per entry, preferring the children that succeed most often.
+
+    Each child's SUCCESS/FAILURE results are counted in numpy arrays (an O(1)
+    update when the child finishes) and the next child is picked by one of:
+
+        'thompson': Sample each child's success rate from its
+            Beta(successes + prior, failures + prior) posterior and take the best.
+        'epsilon_greedy': With probability epsilon pick a child uniformly at
+            random, otherwise the one with the best mean success rate.
+        'ucb1': Run every child once, then take the best
+            mean + sqrt(2 ln(total) / trials).
+
+    Like WeightedRandomSelector, the chosen child's result is returned as is
+    and no other child is tried, so the parent sees each failure and the next
+    entry can pick differently.
+
+    Statistics are keyed by child name when saved, so they survive restarts
+    as long as names are stable.  With statistics_path set they are loaded in
+    setup() (if the file exists) and saved in shutdown().
+
+    Args:
+        name (str): Name of this composite.
+        children (list of Behaviour): Children to choose from.
+        strategy (str): 'thompson', 'epsilon_greedy' or 'ucb1'.
+        epsilon (float): Exploration rate of 'epsilon_greedy', in [0, 1].
+        prior (float): Pseudo-count added to both successes and failures, > 0.
+        statistics_path (str): File the statistics persist to, as an .npz archive.
+        rng: Source of random numbers, e.g. a RandomStream.  Defaults to the
+            global random module.
+
+    Example:
+        selector = BanditSelector('Approach', [left, right, over], strategy='ucb1')
+    '''
+    STRATEGIES = ('thompson', 'epsilon_greedy', 'ucb1')
+
+    def __init__(self, name: str,
+                       children: Optional[List[py_trees.behaviour.Behaviour]] = None,
+                       strategy: str = 'thompson',
+                       epsilon: float = 0.1,
+                       prior: float = 1.0,
+                       statistics_path: Optional[str] = None,
+                       rng=None):
+        # numpy is only needed by this class; keep it off the import path of the module.
+        import numpy as np
+        self._np = np
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f'strategy({strategy!r}) must be one of {list(self.STRATEGIES)}.')
+        if not (0.0 <= epsilon <= 1.0):
+            raise ValueError(f'epsilon({epsilon}) must be in range [0, 1.0].')
+        if not prior > 0.0:
+            raise ValueError(f'prior({prior}) must be > 0.')
+        self._strategy = strategy
+        self._epsilon = epsilon
+        self._prior = prior
+        self._statistics_path = statistics_path
+        self._successes = np.zeros(0)
+        self._failures = np.zeros(0)
+        self._total = 0
+        self._current_index = None
+        self._generator = None
+        self._generator_source = None
+        self.rng = rng if rng is not None else random
+        super(BanditSelector, self).__init__(name=name, children=children)
+
+    @property
+    def strategy(self) -> str:
+        return self._strategy
+
+    @property
+    def successes(self) -> 'np.ndarray':
+        '''Copy of the per-child success counts, ordered like children.'''
+        return self._successes.copy()
+
+    @property
+    def failures(self) -> 'np.ndarray':
+        '''Copy of the per-child failure counts, ordered like children.'''
+        return self._failures.copy()
+
+    def expected_success(self) -> 'np.ndarray':
+        '''Posterior mean success rate of each child.'''
+        return (self._successes + self._prior) / (self._successes + self._failures + 2.0 * self._prior)
+
+    def record(self, child: Union[int, py_trees.behaviour.Behaviour], success: bool) -> None:
+        '''Count a result for a child (by index or object) that was not observed by ticking.'''
+        index = child if isinstance(child, int) else self.children.index(child)
+        if success:
+            self._successes[index] += 1.0
+        else:
+            self._failures[index] += 1.0
+        self._total += 1
+
+    def reset_statistics(self) -> None:
+        self._successes[:] = 0.0
+        self._failures[:] = 0.0
+        self._total = 0
+
+    def statistics(self) -> Dict[str, Tuple[int, int]]:
+        '''{child name: (successes, failures)}.'''
+        return {child.name: (int(s), int(f))
+                for child, s, f in zip(self.children, self._successes.tolist(), self._failures.tolist())}
+
+    def save_statistics(self, path: str) -> None:
+        '''
+        Write the statistics, keyed by child name, to an .npz archive at path.
+
+        The archive is written to a temporary file and moved into place, so
+        path never holds a partial archive.  No extension is added to path.
+        '''
+        temporary_path = f'{path}.tmp'
+        # An open file keeps numpy from appending '.npz' to the name.
+        with open(temporary_path, 'wb') as statistics_file:
+            self._np.savez(statistics_file,
+                           names=self._np.array([child.name for child in self.children], dtype=str),
+                           successes=self._successes,
+                           failures=self._failures)
+        os.replace(temporary_path, path)
+
+    def load_statistics(self, path: str) -> int:
+        '''
+        Restore statistics saved by save_statistics().
+
+        Children are matched by name; saved names with no child are ignored
+        and children with no saved entry keep their current counts.
+
+        Returns:
+            int: Number of children whose statistics were restored.
+        '''
+        with self._np.load(path) as data:
+            saved = {name: (s, f) for name, s, f in
+                     zip(data['names'].tolist(), data['successes'].tolist(), data['failures'].tolist())}
+        restored = 0
+        for index, child in enumerate(self.children):
+            if child.name in saved:
+                self._successes[index], self._failures[index] = saved[child.name]
+                restored += 1
+        self._total = int(self._successes.sum() + self._failures.sum())
+        return restored
+
+    def setup(self, **kwargs) -> None:
+        if self._statistics_path is not None and os.path.exists(self._statistics_path):
+            self.load_statistics(self._statistics_path)
+
+    def shutdown(self) -> None:
+        if self._statistics_path is not None:
+            self.save_statistics(self._statistics_path)
+
+    def add_child(self, child: py_trees.behaviour.Behaviour):
+        child_id = super(BanditSelector, self).add_child(child)
+        self._successes = self._np.append(self._successes, 0.0)
+        self._failures = self._np.append(self._failures, 0.0)
+        return child_id
+
+    def insert_child(self, child: py_trees.behaviour.Behaviour, index: int):
+        child_id = super(BanditSelector, self).insert_child(child, index)
+        index = self.children.index(child)
+        self._successes = self._np.insert(self._successes, index, 0.0)
+        self._failures = self._np.insert(self._failures, index, 0.0)
+        return child_id
+
+    def prepend_child(self, child: py_trees.behaviour.Behaviour):
+        return self.insert_child(child, 0)
+
+    def remove_child(self, child: py_trees.behaviour.Behaviour) -> int:
+        index = super(BanditSelector, self).remove_child(child)
+        self._total -= int(self._successes[index] + self._failures[index])
+        self._successes = self._np.delete(self._successes, index)
+        self._failures = self._np.delete(self._failures, index)
+        return index
+
+    def remove_all_children(self) -> None:
+        super(BanditSelector, self).remove_all_children()
+        self._successes = self._np.zeros(0)
+        self._failures = self._np.zeros(0)
+        self._total = 0
+
+    def _numpy_generator(self) -> 'np.random.Generator':
+        # rng may be replaced (e.g. by set_tree_rng), so follow it.
+        if self._generator_source is not self.rng:
+            generator = getattr(self.rng, 'generator', None)
+            if not isinstance(generator, self._np.random.Generator):
+                generator = self._np.random.default_rng(int(self.rng.random() * 2**53))
+            self._generator = generator
+            self._generator_source = self.rng
+        return self._generator
+
+    def _child_finished(self, index: int, status: py_trees.common.Status) -> None:
+        if status == py_trees.common.Status.SUCCESS:
+            self._successes[index] += 1.0
+        else:
+            self._failures[index] += 1.0
+        self._total += 1
+
+    def _choose(self) -> int:
+        np = self._np
+        n = len(self.children)
+        if self._strategy == 'thompson':
+            samples = self._numpy_generator().beta(self._successes + self._prior, self._failures + self._prior)
+            return int(np.argmax(samples))
+        if self._strategy == 'epsilon_greedy':
+            if self.rng.random() < self._epsilon:
+                return min(int(self.rng.random() * n), n - 1)
+            return int(np.argmax(self.expected_success()))
+        trials = self._successes + self._failures
+        untried = np.flatnonzero(trials == 0.0)
+        if untried.size:
+            return int(untried[0])
+        bonus = np.sqrt(2.0 * math.log(self._total) / trials)
+        return int(np.argmax(self._successes / trials + bonus))
+
+
+def load_transition_matrix(filepath: str) -> Union[List[List[float]], Dict[str, Dict[str, float]]]:
+    '''
+    Load transitions for a MarkovSequencer.
+
+    A .npy file holds a square float array; row i gives the relative weights
+    of moving from child i to each child.  Any other file is read as YAML,
+    either as a list of rows or as a mapping keyed by child name:
+
+        approach: {scan: 3, approach: 1}
+        scan: {approach: 1, report: 1}
+        report: {approach: 1}
+    '''
+    if not os.path.isfile(filepath):
+        raise FileNotFoundError(f'filepath: {filepath} is not a valid file')
+    if filepath.endswith('.npy'):
+        import numpy as np
+        return np.load(filepath).tolist()
+
+    import yaml
+    with open(filepath, 'r') as transitions_file:
+        transitions = yaml.safe_load(transitions_file)
+    if not isinstance(transitions, (list, dict)):
+        raise ValueError(f'{filepath} must hold a list of rows or a mapping of child names')
+    return transitions
+
+
+class MarkovSequencer(_SingleChildChooser):
+    '''
+    Runs one child per entry, choosing it from the previous one with a Markov chain.
+
+    Row i of the transition matrix holds the relative weights of running
+    each child after child i.  Every row gets its own Walker/Vose alias table
+    up front, so each transition is O(1) (one rng.random() call) however
+    many children there are.  The first entry runs the start child.
+
+    The chosen child's result is returned as is, like WeightedRandomSelector.
+    The transition matrix refers to children by position, so set new
+    transitions with set_transitions() after adding or removing children.
+
+    Args:
+        name (str): Name of this composite.
+        children (list of Behaviour): The states of the chain.
+        transitions: Square matrix (nested lists or numpy array), a mapping
+            {from name: {to name: weight}} (missing entries are 0), or a file
+            for load_transition_matrix().
+        start (int or str): Index or name of the child to run first.
+        seed (int): Seed for a private random.Random, if rng is not given.
+        rng: Source of random numbers, e.g. a RandomStream.  Defaults to the
+            global random module.
+
+    Example:
+        # After A, usually B, sometimes C
+        sequencer = MarkovSequencer('Plan', [a, b, c], [[0, 4, 1], [1, 0, 0], [1, 0, 0]], seed=7)
+    '''
+    def __init__(self, name: str,
+                       children: List[py_trees.behaviour.Behaviour],
+                       transitions,
+                       start: Union[int, str] = 0,
+                       seed: Optional[int] = None,
+                       rng=None):
+        self._current_index = None
+        self._state = None
+        super(MarkovSequencer, self).__init__(name=name, children=children)
+        if rng is None:
+            rng = random.Random(seed) if seed is not None else random
+        self.rng = rng
+        self._start = self._index_of(start)
+        self.set_transitions(transitions)
+
+    def _index_of(self, child: Union[int, str]) -> int:
+        if isinstance(child, str):
+            indices = [index for index, behavior in enumerate(self.children) if behavior.name == child]
+            if len(indices) != 1:
+                raise ValueError(f'child name({child!r}) must match exactly one child, matched {len(indices)}.')
+            return indices[0]
+        if not 0 <= child < len(self.children):
+            raise ValueError(f'child index({child}) out of range for {len(self.children)} children.')
+        return child
+
+    @property
+    def state(self) -> Optional[int]:
+        '''Index of the child chosen last, None before the first entry.'''
+        return self._state
+
+    @state.setter
+    def state(self, state: Optional[Union[int, str]]) -> None:
+        self._state = None if state is None else self._index_of(state)
+
+    def set_transitions(self, transitions) -> None:
+        '''Replace the transition matrix.  Accepts the same forms as the constructor.'''
+        if isinstance(transitions, str):
+            transitions = load_transition_matrix(transitions)
+        n = len(self.children)
+        if isinstance(transitions, dict):
+            matrix = [[0.0] * n for _ in range(n)]
+            for from_child, row in transitions.items():
+                for to_child, weight in row.items():
+                    matrix[self._index_of(from_child)][self._index_of(to_child)] = weight
+        else:
+            matrix = transitions.tolist() if hasattr(transitions, 'tolist') else [list(row) for row in transitions]
+        if len(matrix) != n or any(len(row) != n for row in matrix):
+            raise ValueError(f'transitions must be a {n}x{n} matrix, one row and column per child.')
+        tables = []
+        for index, row in enumerate(matrix):
+            row = [float(weight) for weight in row]
+            if any(not weight >= 0.0 or weight == float('inf') for weight in row):
+                raise ValueError(f'row {index} of transitions must be finite and >= 0, got {row}.')
+            if not sum(row) > 0.0:
+                raise ValueError(f'row {index} of transitions must have a positive weight.')
+            tables.append(_AliasTable(row))
+        self._matrix = matrix
+        self._tables = tables
+
+    def transition_probabilities(self) -> List[List[float]]:
+        '''Transition matrix with each row normalised to sum to 1.'''
+        return [[weight / sum(row) for weight in row] for row in self._matrix]
+
+    def _choose(self) -> int:
+        if len(self._tables) != len(self.children):
+            raise ValueError(f'{self.name}: children changed, call set_transitions() first.')
+        if self._state is None:
+            self._state = self._start
+        else:
+            self._state = self._tables[self._state].sample(self.rng.random())
+        return self._state
+
+
 def random_selector(name, behaviors: List[py_trees.behaviour.Behaviour], probabilities: List[float]):
     if abs(sum(probabilities) - 1.0) >= 1e-9:
         raise ValueError(f'sum(probabilities) must add up to 1.0, got {sum(probabilities)}')
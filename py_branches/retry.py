@@ -1,7 +1,11 @@
 #!/usr/bin/env python3
-import time
+from typing import Optional
 import py_trees
 
+from .clock import Clock
+from .clock import get_default_clock
+from .fast import tick_decorator
+
 
 class Retry(py_trees.decorators.Decorator):
     '''
@@ -16,6 +20,7 @@ class Retry(py_trees.decorators.Decorator):
         name (str): Name of this decorator.
         max_attempts (int): Maximum number of times to attempt the child.
         delay (float): Seconds to wait between retry attempts. Default 0.0.
+        clock (Clock): Time source.  Defaults to the process default clock.
 
     Example:
         child = py_trees.behaviours.Failure(name="Flaky")
@@ -29,7 +34,8 @@ class Retry(py_trees.decorators.Decorator):
     def __init__(self, child: py_trees.behaviour.Behaviour,
                        name: str,
                        max_attempts: int,
-                       delay: float = 0.0):
+                       delay: float = 0.0,
+                       clock: Optional[Clock] = None):
         if max_attempts < 1:
             raise ValueError(f'max_attempts({max_attempts}) must be greater than 0.')
         if delay < 0.0:
@@ -40,25 +46,46 @@ class Retry(py_trees.decorators.Decorator):
         self._attempts = 0
         self._waiting = False
         self._wait_start = None
+        self.clock = clock if clock is not None else get_default_clock()
 
     def initialise(self) -> None:
         self._attempts = 0
         self._waiting = False
         self._wait_start = None
 
-    def tick(self):
+    def terminate(self, new_status: py_trees.common.Status) -> None:
+        if new_status == py_trees.common.Status.INVALID:
+            self._waiting = False  # interrupted mid-delay; nothing left to wait for
+
+    def next_wakeup(self) -> Optional[float]:
+        '''Clock time at which the next attempt may start, or None if not waiting.'''
+        if self._waiting:
+            return self._wait_start + self._delay
+        return None
+
+    def _still_waiting(self) -> bool:
         if self._waiting:
-            elapsed = time.time() - self._wait_start
+            elapsed = self.clock.now() - self._wait_start
             if elapsed < self._delay:
                 self.status = py_trees.common.Status.RUNNING
-                yield self
-                return
+                return True
             else:
                 self._waiting = False
                 self.decorated.stop(py_trees.common.Status.INVALID)
+        return False
+
+    def tick(self):
+        if self._still_waiting():
+            yield self
+            return
         for node in super().tick():
             yield node
 
+    def tick_fast(self) -> py_trees.common.Status:
+        if self._still_waiting():
+            return self.status
+        return tick_decorator(self)
+
     def update(self) -> py_trees.common.Status:
         if self.decorated.status == py_trees.common.Status.SUCCESS:
             return py_trees.common.Status.SUCCESS
@@ -69,7 +96,7 @@ class Retry(py_trees.decorators.Decorator):
             if self._attempts < self._max_attempts:
                 if self._delay > 0.0:
                     self._waiting = True
-                    self._wait_start = time.time()
+                    self._wait_start = self.clock.now()
                 else:
                     self.decorated.stop(py_trees.common.Status.INVALID)
                 return py_trees.common.Status.RUNNING
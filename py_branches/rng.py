@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+'''
+Seedable random streams for the random behaviors.
+
+Every behavior that draws random numbers (RandomRun, RandomDelay,
+WeightedRandomSelector, RunEveryX, PauseUniform, PauseSchedule) takes an
+`rng` argument and otherwise uses the global random module.  A RandomStream
+can be passed instead, or installed on an existing tree with set_tree_rng():
+
+    rng = RandomStream(seed=42)
+    set_tree_rng(root, rng, spawn=True)
+
+A RandomStream is backed by a numpy.random.Generator and pre-draws uniforms in
+blocks, handing them out one at a time.  A tree with its own stream is
+reproducible from a single seed in any process and does not share state with
+other trees or threads.  A stream itself is not thread-safe; give each thread
+its own with spawn().
+'''
+from typing import Optional
+from typing import Union
+
+import numpy as np
+import py_trees
+
+
+class RandomStream(object):
+    '''
+    Buffered uniform random numbers from a numpy Generator.
+
+    Offers the subset of the random module's interface used by py_branches
+    (random(), uniform(), randint()), so it can be passed wherever a behavior
+    accepts rng.
+
+    Args:
+        seed (int or numpy.random.SeedSequence): Seed.  None seeds from the OS.
+        block_size (int): Uniforms drawn from the generator per refill.
+    '''
+    def __init__(self, seed: Union[None, int, np.random.SeedSequence] = None,
+                       block_size: int = 1024):
+        if block_size < 1:
+            raise ValueError(f'block_size({block_size}) must be greater than 0.')
+        self._seed_sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+        self._generator = np.random.default_rng(self._seed_sequence)
+        self._block_size = block_size
+        self._buffer = []
+        self._index = 0
+
+    @property
+    def generator(self) -> np.random.Generator:
+        '''Underlying generator, for vectorized draws.  Skips nothing in the buffer.'''
+        return self._generator
+
+    def _refill(self) -> None:
+        self._buffer = self._generator.random(self._block_size).tolist()
+        self._index = 0
+
+    def random(self) -> float:
+        '''Uniform float in [0, 1).'''
+        index = self._index
+        if index == len(self._buffer):
+            self._refill()
+            index = 0
+        self._index = index + 1
+        return self._buffer[index]
+
+    def uniform(self, a: float, b: float) -> float:
+        '''Uniform float between a and b.'''
+        return a + (b - a) * self.random()
+
+    def randint(self, a: int, b: int) -> int:
+        '''Uniform integer in [a, b], both inclusive.'''
+        if a > b:
+            raise ValueError(f'empty range for randint({a}, {b})')
+        return a + min(int(self.random() * (b - a + 1)), b - a)
+
+    def spawn(self) -> 'RandomStream':
+        '''New stream, statistically independent of this one and of other spawns.'''
+        return RandomStream(self._seed_sequence.spawn(1)[0], self._block_size)
+
+
+def _has_rng(node: py_trees.behaviour.Behaviour) -> bool:
+    return callable(getattr(getattr(node, 'rng', None), 'random', None))
+
+
+def set_tree_rng(root: py_trees.behaviour.Behaviour,
+                 rng: RandomStream,
+                 spawn: bool = False) -> int:
+    '''
+    Point every random behavior under root (inclusive) at rng.
+
+    Args:
+        root (Behaviour): Root of the (sub)tree.
+        rng (RandomStream): Stream to install.
+        spawn (bool): Give each behavior its own rng.spawn() instead of sharing
+            rng, so each behavior's draws do not depend on how often the others
+            draw.  Spawn order follows root.iterate(), so the tree must be
+            built the same way for runs to match.
+
+    Returns:
+        int: Number of behaviors that were updated.
+    '''
+    updated = 0
+    for node in root.iterate():
+        if _has_rng(node):
+            node.rng = rng.spawn() if spawn else rng
+            updated += 1
+    return updated
+
+
+__all__ = ['RandomStream', 'set_tree_rng']
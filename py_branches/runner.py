@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+import threading
+from typing import Callable
+from typing import Optional
+
+import py_trees
+
+from .clock import Clock
+from .clock import TickClock
+from .clock import get_default_clock
+from .fast import tick_tree
+
+
+class EventDrivenRunner(object):
+    '''
+    Ticks a behaviour tree only when something can have changed.
+
+    After every tick the runner asks each behavior for its next_wakeup() (the
+    clock time of its next deadline, published by Cooldown, Retry, Timeout,
+    RandomDelay and the Pause* behaviors) and sleeps until the earliest one, or
+    until wake() is called from another thread.  A RUNNING leaf that publishes
+    no deadline still has to be polled, so it caps the sleep at poll_period.
+    A deadline that has already passed on a node that is not RUNNING is stale
+    (e.g. a Cooldown whose branch is no longer ticked) and is ignored.
+
+    Sleeping instead of ticking changes the behavior of nodes that count ticks
+    (e.g. RunEveryX): they advance once per actual tick.
+
+    Args:
+        tree (BehaviourTree): Tree to run.
+        clock (Clock): Clock the tree's behaviors use.  Defaults to the process
+            default clock.  A TickClock is refreshed before every tick.
+        poll_period (float): Longest sleep while a RUNNING leaf has no deadline.
+        idle_period (float): Longest sleep when nothing in the tree has a
+            deadline or is RUNNING.  None sleeps until wake() is called.
+        fast (bool): Tick with fast.tick_tree(), which skips the generators
+            of nodes that implement tick_fast().
+
+    Example:
+        tree = py_trees.trees.BehaviourTree(root)
+        runner = EventDrivenRunner(tree, poll_period=0.1, idle_period=5.0)
+        # From a message callback: runner.wake()
+        runner.run()
+    '''
+    def __init__(self, tree: py_trees.trees.BehaviourTree,
+                       clock: Optional[Clock] = None,
+                       poll_period: float = 0.1,
+                       idle_period: Optional[float] = 1.0,
+                       fast: bool = False):
+        if poll_period <= 0.0:
+            raise ValueError(f'poll_period({poll_period}) must be positive.')
+        if idle_period is not None and idle_period <= 0.0:
+            raise ValueError(f'idle_period({idle_period}) must be positive or None.')
+        self._tree = tree
+        self._clock = clock if clock is not None else get_default_clock()
+        self._poll_period = poll_period
+        self._idle_period = idle_period
+        self._fast = fast
+        self._event = threading.Event()
+        self._stopped = False
+
+    def wake(self) -> None:
+        '''Cut the current sleep short and tick again.  Safe to call from any thread.'''
+        self._event.set()
+
+    def stop(self) -> None:
+        '''Make run() return after the current tick or sleep.'''
+        self._stopped = True
+        self._event.set()
+
+    def next_wakeup(self) -> Optional[float]:
+        '''
+        Clock time at which the tree next needs a tick.
+
+        Returns:
+            float or None: None means nothing is pending and the runner will
+            sleep for idle_period (or until woken).
+        '''
+        now = self._clock.now()
+        wakeup = None
+        for node in self._tree.root.iterate():
+            next_wakeup = getattr(node, 'next_wakeup', None)
+            deadline = next_wakeup() if next_wakeup is not None else None
+            if deadline is None:
+                if node.status != py_trees.common.Status.RUNNING or node.children:
+                    continue
+                deadline = now + self._poll_period
+            elif deadline <= now and node.status != py_trees.common.Status.RUNNING:
+                continue  # stale: the node's branch stopped being ticked before its deadline
+            if wakeup is None or deadline < wakeup:
+                wakeup = deadline
+        return wakeup
+
+    def tick(self) -> None:
+        if isinstance(self._clock, TickClock):
+            self._clock.tick()
+        if self._fast:
+            tick_tree(self._tree)
+        else:
+            self._tree.tick()
+
+    def sleep(self) -> bool:
+        '''
+        Sleep until the tree's next wake-up time.
+
+        Returns:
+            bool: True if woken early by wake() or stop().
+        '''
+        wakeup = self.next_wakeup()
+        if wakeup is None:
+            timeout = self._idle_period
+        else:
+            # A TickClock's cached reading is from the start of the tick; measure from the source.
+            source = self._clock.source if isinstance(self._clock, TickClock) else self._clock
+            timeout = max(wakeup - source.now(), 0.0)
+        if timeout == 0.0:
+            return False
+        woken = self._clock.wait(timeout, self._event)
+        self._event.clear()
+        return woken
+
+    def run(self, num_ticks: Optional[int] = None,
+                  until: Optional[Callable[[py_trees.trees.BehaviourTree], bool]] = None) -> int:
+        '''
+        Tick and sleep until stop() is called, num_ticks ticks have run, or
+        until(tree) returns True after a tick.
+
+        Returns:
+            int: Number of ticks run.
+        '''
+        self._stopped = False
+        ticks = 0
+        while not self._stopped and (num_ticks is None or ticks < num_ticks):
+            self.tick()
+            ticks += 1
+            if until is not None and until(self._tree):
+                break
+            if num_ticks is not None and ticks >= num_ticks:
+                break
+            self.sleep()
+        return ticks
+
+
+__all__ = ['EventDrivenRunner']
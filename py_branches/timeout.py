@@ -1,7 +1,10 @@
 #!/usr/bin/env python3
-import time
+from typing import Optional
 import py_trees
 
+from .clock import Clock
+from .clock import get_default_clock
+
 
 class Timeout(py_trees.decorators.Decorator):
     '''
@@ -16,6 +19,7 @@ class Timeout(py_trees.decorators.Decorator):
         child (Behaviour): The child behavior to wrap with a timeout.
         name (str): Name of this decorator.
         duration (float): Maximum seconds the child may remain RUNNING.
+        clock (Clock): Time source.  Defaults to the process default clock.
 
     Example:
         child = LongRunningBehavior(name="Slow")
@@ -24,21 +28,29 @@ class Timeout(py_trees.decorators.Decorator):
     '''
     def __init__(self, child: py_trees.behaviour.Behaviour,
                        name: str,
-                       duration: float):
+                       duration: float,
+                       clock: Optional[Clock] = None):
         if duration <= 0.0:
             raise ValueError(f'duration({duration}) must be positive.')
         super(Timeout, self).__init__(name=name, child=child)
         self._duration = duration
         self._start_time = None
+        self.clock = clock if clock is not None else get_default_clock()
 
     def initialise(self) -> None:
-        self._start_time = time.time()
+        self._start_time = self.clock.now()
+
+    def next_wakeup(self) -> Optional[float]:
+        '''Clock time at which a still-RUNNING child times out, or None.'''
+        if self.status == py_trees.common.Status.RUNNING:
+            return self._start_time + self._duration
+        return None
 
     def update(self) -> py_trees.common.Status:
         if self.decorated.status != py_trees.common.Status.RUNNING:
             return self.decorated.status
 
-        elapsed = time.time() - self._start_time
+        elapsed = self.clock.now() - self._start_time
         if elapsed >= self._duration:
             self.decorated.stop(py_trees.common.Status.INVALID)
             return py_trees.common.Status.FAILURE
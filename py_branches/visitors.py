@@ -1,12 +1,16 @@
 """Visitors for py_trees behavior trees."""
 
 import logging
+import math
 import time
 import uuid
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Set
 
 import py_trees
 
+from .clock import Clock
+from .clock import get_default_clock
+
 
 _ANSI_RESET = '\033[0m'
 _ANSI_BY_STATUS = {
@@ -49,32 +53,355 @@ class StatusTransitionVisitor(py_trees.visitors.VisitorBase):
         self._logger.log(self._level, msg)
 
 
+# Status -> compact code, keyed by id() because Status members are singletons and an int key
+# hashes faster than an Enum.
+_STATUS_BY_CODE = list(py_trees.common.Status)
+_CODE_BY_STATUS_ID = {id(status): code for code, status in enumerate(_STATUS_BY_CODE)}
+_NO_STATUS = 255
+
+
+class BatchStatusTransitionVisitor(py_trees.visitors.VisitorBase):
+    """Log leaf status transitions as one record per tick.
+
+    Same output as :class:`StatusTransitionVisitor`, but each behaviour gets a
+    dense integer index the first time it is seen (keyed by the behaviour
+    object itself, no UUID-to-string conversion) and its last status is kept in
+    a ``bytearray``.  Transitions found while visiting are collected and
+    emitted as a single log record from ``finalise()``, which
+    ``BehaviourTree.tick()`` calls after visiting.  When driving ``run()`` by
+    hand, call ``finalise()`` once per tick.
+
+    Nothing is formatted when the logger is not enabled for ``level``.
+    Behaviours seen by the visitor are referenced until ``reset()``.
+    """
+
+    def __init__(
+        self,
+        logger: Optional[logging.Logger] = None,
+        level: int = logging.INFO,
+    ) -> None:
+        super().__init__(full=True)
+        self._logger = logger if logger is not None else logging.getLogger(__name__)
+        self._level = level
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget every behaviour and its last status."""
+        self._index: Dict[py_trees.behaviour.Behaviour, int] = {}
+        self._behaviours: List[py_trees.behaviour.Behaviour] = []
+        self._last = bytearray()
+        self._pending: List[int] = []
+
+    def initialise(self) -> None:
+        self._pending = []
+
+    def run(self, behaviour: py_trees.behaviour.Behaviour) -> None:
+        if behaviour.children:
+            return
+        idx = self._index.get(behaviour)
+        if idx is None:
+            idx = len(self._behaviours)
+            self._index[behaviour] = idx
+            self._behaviours.append(behaviour)
+            self._last.append(_NO_STATUS)
+        code = _CODE_BY_STATUS_ID[id(behaviour.status)]
+        if self._last[idx] == code:
+            return
+        self._last[idx] = code
+        if behaviour.status != py_trees.common.Status.INVALID:
+            self._pending.append(idx)
+
+    def finalise(self) -> None:
+        pending = self._pending
+        self._pending = []
+        if not pending or not self._logger.isEnabledFor(self._level):
+            return
+        lines = []
+        for idx in pending:
+            status = _STATUS_BY_CODE[self._last[idx]]
+            color = _ANSI_BY_STATUS.get(status, '')
+            lines.append(f'{color}[{self._behaviours[idx].name}] {status.name}{_ANSI_RESET}')
+        self._logger.log(self._level, '\n'.join(lines))
+
+
+# TimerVisitor histograms: log-spaced buckets with <= 1% relative error on reported quantiles.
+# Durations below _HIST_MIN_DURATION share bucket 0, so a histogram never holds more than
+# ~1400 buckets for durations up to 1e6 s.
+_HIST_RELATIVE_ACCURACY = 0.01
+_HIST_GAMMA = (1.0 + _HIST_RELATIVE_ACCURACY) / (1.0 - _HIST_RELATIVE_ACCURACY)
+_HIST_LOG_GAMMA = math.log(_HIST_GAMMA)
+_HIST_MIN_DURATION = 1e-6
+_HIST_OFFSET = -math.floor(math.log(_HIST_MIN_DURATION) / _HIST_LOG_GAMMA)
+
+
+class DurationStats(object):
+    """Streaming count/mean/min/max and approximate quantiles of durations.
+
+    Quantiles come from a sparse histogram with logarithmically spaced buckets,
+    accurate to 1% of the true value (durations under a microsecond are
+    reported as the minimum).
+    """
+
+    __slots__ = ('count', 'total', 'min', 'max', '_buckets')
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._buckets: Dict[int, int] = {}
+
+    def add(self, duration: float) -> None:
+        self.count += 1
+        self.total += duration
+        if duration < self.min:
+            self.min = duration
+        if duration > self.max:
+            self.max = duration
+        if duration > _HIST_MIN_DURATION:
+            bucket = math.ceil(math.log(duration) / _HIST_LOG_GAMMA) + _HIST_OFFSET
+        else:
+            bucket = 0
+        self._buckets[bucket] = self._buckets.get(bucket, 0) + 1
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else math.nan
+
+    def quantile(self, q: float) -> float:
+        """Approximate ``q``-quantile (0 <= q <= 1), clamped to [min, max]."""
+        if not 0.0 <= q <= 1.0:
+            raise ValueError(f'q({q}) must be in [0, 1].')
+        if not self.count:
+            return math.nan
+        rank = q * (self.count - 1)
+        seen = 0
+        for bucket in sorted(self._buckets):
+            seen += self._buckets[bucket]
+            if seen > rank:
+                break
+        if bucket == 0:
+            return self.min
+        value = 2.0 * _HIST_GAMMA ** (bucket - _HIST_OFFSET) / (_HIST_GAMMA + 1.0)
+        return min(max(value, self.min), self.max)
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            'count': self.count,
+            'total': self.total,
+            'mean': self.mean,
+            'min': self.min if self.count else math.nan,
+            'max': self.max if self.count else math.nan,
+            'p50': self.quantile(0.50),
+            'p95': self.quantile(0.95),
+            'p99': self.quantile(0.99),
+        }
+
+
 class TimerVisitor(py_trees.visitors.VisitorBase):
     """Record wall-clock time each behaviour spends in the RUNNING state.
 
     Measures the duration from when a behaviour first ticks RUNNING until it
     transitions out (SUCCESS, FAILURE, or INVALID). Keyed by behaviour id so
     duplicate names in a tree are handled correctly.
+
+    Durations are accumulated per behaviour in a :class:`DurationStats`
+    (count, mean, min/max, p50/p95/p99) and read back with ``snapshot()`` or
+    logged on demand with ``dump()``.  Set ``log_completions`` to also log one
+    line per completion.
+
+    Times are read from ``clock`` (the process default clock if omitted).
     """
 
     def __init__(
         self,
         level: int = logging.INFO,
+        clock: Optional[Clock] = None,
+        log_completions: bool = False,
     ) -> None:
         super().__init__(full=False)
         self._running_starts: Dict[uuid.UUID, float] = {}
+        self._stats: Dict[uuid.UUID, DurationStats] = {}
+        self._names: Dict[uuid.UUID, str] = {}
         self._logger = logging.getLogger(__name__)
         self._level = level
+        self._log_completions = log_completions
+        self.clock = clock if clock is not None else get_default_clock()
 
     def run(self, behaviour: py_trees.behaviour.Behaviour) -> None:
         is_running = behaviour.status == py_trees.common.Status.RUNNING
 
         if is_running and behaviour.id not in self._running_starts:
-            self._running_starts[behaviour.id] = time.time()
+            self._running_starts[behaviour.id] = self.clock.now()
         elif not is_running and behaviour.id in self._running_starts:
             start = self._running_starts.pop(behaviour.id)
-            duration = time.time() - start
-            self._logger.log(self._level, f'[timer] {behaviour.name} ran for {duration:.3f}s')
+            duration = self.clock.now() - start
+            stats = self._stats.get(behaviour.id)
+            if stats is None:
+                stats = self._stats[behaviour.id] = DurationStats()
+                self._names[behaviour.id] = behaviour.name
+            stats.add(duration)
+            if self._log_completions:
+                self._logger.log(self._level, f'[timer] {behaviour.name} ran for {duration:.3f}s')
+
+    def stats(self, behaviour: py_trees.behaviour.Behaviour) -> Optional[DurationStats]:
+        """Accumulated durations for ``behaviour``, or None if it has not completed a run."""
+        return self._stats.get(behaviour.id)
+
+    def snapshot(self) -> List[Dict[str, object]]:
+        """One row per timed behaviour, e.g. for ``pandas.DataFrame(visitor.snapshot())``.
+
+        Each row has ``id``, ``name``, ``count``, ``total``, ``mean``, ``min``,
+        ``max``, ``p50``, ``p95`` and ``p99``; durations are in seconds.
+        """
+        rows = []
+        for behaviour_id, stats in self._stats.items():
+            row: Dict[str, object] = {'id': behaviour_id, 'name': self._names[behaviour_id]}
+            row.update(stats.as_dict())
+            rows.append(row)
+        return rows
+
+    def dump(self, level: Optional[int] = None) -> str:
+        """Log the snapshot as a single table record and return the text."""
+        lines = [f'{"name":<32} {"count":>8} {"mean":>9} {"min":>9} {"p50":>9} '
+                 f'{"p95":>9} {"p99":>9} {"max":>9}']
+        for row in sorted(self.snapshot(), key=lambda r: r['total'], reverse=True):
+            lines.append(
+                f'{row["name"]:<32} {row["count"]:>8} {row["mean"]:>9.3f} {row["min"]:>9.3f} '
+                f'{row["p50"]:>9.3f} {row["p95"]:>9.3f} {row["p99"]:>9.3f} {row["max"]:>9.3f}')
+        text = '\n'.join(lines)
+        self._logger.log(self._level if level is None else level, f'[timer]\n{text}')
+        return text
+
+    def reset_stats(self) -> None:
+        """Drop accumulated durations.  Behaviours currently RUNNING keep their start time."""
+        self._stats.clear()
+        self._names.clear()
+
+
+class _NodeProfile(object):
+    __slots__ = ('node', 'path', 'ticks', 'inclusive_ns', 'exclusive_ns')
+
+    def __init__(self, node: py_trees.behaviour.Behaviour, path: str) -> None:
+        self.node = node
+        self.path = path
+        self.ticks = 0
+        self.inclusive_ns = 0
+        self.exclusive_ns = 0
+
+
+class TickProfiler(object):
+    """Measure CPU time spent ticking each node of a tree.
+
+    A visitor only sees a node after it has ticked, so instead ``attach()``
+    wraps every node's ``tick()`` generator and times each step with
+    ``time.perf_counter_ns``.  Inclusive time covers the node and everything it
+    ticked; exclusive (self) time subtracts the time spent in its children.
+    ``write_collapsed()`` exports exclusive times as collapsed stacks for
+    flamegraph.pl, speedscope and similar tools.
+
+    Nodes added to the tree after ``attach()`` are not profiled until
+    ``attach()`` is called again.
+
+    Example:
+        profiler = TickProfiler()
+        profiler.attach(tree.root)
+        for _ in range(1000):
+            tree.tick()
+        profiler.detach()
+        profiler.write_collapsed('tree.folded')
+    """
+
+    def __init__(self) -> None:
+        self._profiles: Dict[py_trees.behaviour.Behaviour, _NodeProfile] = {}
+        self._attached: Set[py_trees.behaviour.Behaviour] = set()
+        # One [child_ns] accumulator per tick() step in progress, innermost last.
+        self._stack: List[List[int]] = []
+
+    def attach(self, root: py_trees.behaviour.Behaviour) -> None:
+        """Instrument ``root`` and every node below it.  Re-attaching keeps earlier results."""
+        for node in root.iterate():
+            if node in self._attached:
+                continue
+            profile = self._profiles.get(node)
+            if profile is None:
+                names = []
+                ancestor = node
+                while ancestor is not None:
+                    names.append(ancestor.name.replace(';', ':'))
+                    ancestor = None if ancestor is root else ancestor.parent
+                profile = _NodeProfile(node, ';'.join(reversed(names)))
+                self._profiles[node] = profile
+            node.tick = self._profiled_tick(profile, node.tick)
+            self._attached.add(node)
+
+    def detach(self) -> None:
+        """Restore the original ``tick()`` of every instrumented node.  Results are kept."""
+        for node in self._attached:
+            node.__dict__.pop('tick', None)
+        self._attached.clear()
+
+    def _profiled_tick(self, profile: _NodeProfile, tick):
+        stack = self._stack
+        clock = time.perf_counter_ns
+
+        def profiled_tick():
+            profile.ticks += 1
+            steps = tick()
+            try:
+                while True:
+                    frame = [0]
+                    stack.append(frame)
+                    start = clock()
+                    try:
+                        node = next(steps)
+                    except StopIteration:
+                        return
+                    finally:
+                        elapsed = clock() - start
+                        stack.pop()
+                        profile.inclusive_ns += elapsed
+                        profile.exclusive_ns += elapsed - frame[0]
+                        if stack:
+                            stack[-1][0] += elapsed
+                    yield node
+            finally:
+                steps.close()
+
+        return profiled_tick
+
+    def snapshot(self) -> List[Dict[str, object]]:
+        """One row per instrumented node, most exclusive time first.
+
+        Each row has ``name``, ``path``, ``ticks``, ``inclusive_ns`` and
+        ``exclusive_ns``.
+        """
+        rows = [{
+            'name': profile.node.name,
+            'path': profile.path,
+            'ticks': profile.ticks,
+            'inclusive_ns': profile.inclusive_ns,
+            'exclusive_ns': profile.exclusive_ns,
+        } for profile in self._profiles.values()]
+        rows.sort(key=lambda row: row['exclusive_ns'], reverse=True)
+        return rows
+
+    def write_collapsed(self, filepath: str) -> None:
+        """Write ``root;parent;node <exclusive microseconds>`` lines, one per stack."""
+        totals: Dict[str, int] = {}
+        for profile in self._profiles.values():
+            totals[profile.path] = totals.get(profile.path, 0) + profile.exclusive_ns
+        with open(filepath, 'w') as f:
+            for path, exclusive_ns in totals.items():
+                if exclusive_ns >= 1000:
+                    f.write(f'{path} {exclusive_ns // 1000}\n')
+
+    def reset(self) -> None:
+        """Zero every counter, keeping nodes instrumented."""
+        for profile in self._profiles.values():
+            profile.ticks = 0
+            profile.inclusive_ns = 0
+            profile.exclusive_ns = 0
 
 
-__all__ = ['StatusTransitionVisitor', 'TimerVisitor']
+__all__ = ['StatusTransitionVisitor', 'BatchStatusTransitionVisitor', 'DurationStats', 'TimerVisitor', 'TickProfiler']
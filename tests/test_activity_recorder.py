@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+import sys
+import threading
+
+import py_trees
+import pytest
+
+from py_branches.activity import ActivityRecorder
+from py_branches.activity import enable_activity_recorder
+from py_branches.clock import SimulatedClock
+
+
+@pytest.fixture
+def recorder():
+    recorder = enable_activity_recorder(capacity=8, text_size=16, clock=SimulatedClock())
+    yield recorder
+    recorder.uninstall_crash_dump()
+    py_trees.blackboard.Blackboard.disable_activity_stream()
+
+
+def _client(*keys):
+    client = py_trees.blackboard.Client(name='recorder_test')
+    for key in keys:
+        client.register_key(key=key, access=py_trees.common.Access.WRITE)
+    return client
+
+
+def test_recorder_captures_blackboard_activity(recorder):
+    client = _client('rec_a', 'rec_b')
+    client.rec_a = 1
+    client.rec_a = 2.5
+    client.rec_b = 'hello'
+    client.rec_b = {'n': [1, 2]}
+    assert client.rec_a == 2.5
+
+    items = recorder.data
+    assert [item.key for item in items] == ['/rec_a', '/rec_a', '/rec_b', '/rec_b', '/rec_a']
+    assert [item.activity_type for item in items] == ['INITIALISED', 'WRITE', 'INITIALISED', 'WRITE', 'READ']
+    assert items[1].previous_value == 1 and type(items[1].previous_value) is int
+    assert items[1].current_value == 2.5
+    assert items[2].current_value == 'hello'
+    assert items[3].current_value == "{'n': [1, 2]}"
+    assert items[0].client_name == 'recorder_test'
+    assert items[0].client_id == client.unique_identifier
+    assert recorder.keys == ['/rec_a', '/rec_b']
+
+
+def test_recorder_keeps_only_the_newest_activities(recorder):
+    client = _client('rec_counter')
+    for i in range(20):
+        client.rec_counter = i
+
+    assert len(recorder) == 8
+    assert recorder.dropped == 12
+    assert [item.current_value for item in recorder.data] == list(range(12, 20))
+    assert list(recorder.records()['seq']) == list(range(12, 20))
+
+    recorder.clear()
+    assert recorder.data == []
+
+
+def test_recorder_truncates_text_values(recorder):
+    client = _client('rec_text')
+    client.rec_text = 'x' * 100
+    client.rec_text = b'\x00\x01'
+    items = recorder.data
+    assert items[0].current_value == 'x' * 16
+    assert items[1].current_value == b'\x00\x01'
+
+
+def test_recorder_dump_and_load_round_trip(recorder, tmp_path):
+    client = _client('rec_dump', 'rec_flag')
+    for i in range(10):
+        client.rec_dump = i * 1.5
+        recorder.clock.advance(1.0)
+    client.rec_flag = True
+    client.rec_flag = None
+
+    filepath = str(tmp_path / 'activity.bin')
+    assert recorder.dump(filepath) == 8
+    loaded = ActivityRecorder.load(filepath)
+    assert loaded.keys == recorder.keys
+    original = [(i.key, i.client_id, i.activity_type, i.previous_value, i.current_value) for i in recorder.data]
+    restored = [(i.key, i.client_id, i.activity_type, i.previous_value, i.current_value) for i in loaded.data]
+    assert restored == original
+    assert list(loaded.records()['time']) == list(recorder.records()['time'])
+
+
+def test_recorder_dumps_on_unhandled_exception(recorder, tmp_path, monkeypatch):
+    seen = []
+    monkeypatch.setattr(sys, 'excepthook', lambda *args: seen.append(args[0]))
+    monkeypatch.setattr(threading, 'excepthook', lambda args: seen.append(args.exc_type))
+    filepath = tmp_path / 'crash.bin'
+    recorder.install_crash_dump(str(filepath))
+    _client('rec_crash').rec_crash = 1
+
+    try:
+        raise RuntimeError('boom')
+    except RuntimeError:
+        sys.excepthook(*sys.exc_info())
+    assert seen == [RuntimeError]
+    assert len(ActivityRecorder.load(str(filepath)).data) == 1
+
+    filepath.unlink()
+    thread = threading.Thread(target=lambda: 1 / 0)
+    thread.start()
+    thread.join()
+    assert filepath.exists()
+    assert seen == [RuntimeError, ZeroDivisionError]
+
+    recorder.uninstall_crash_dump()
+    assert sys.excepthook is not recorder._excepthook
+
+
+def test_recorder_logs_failed_crash_dump(recorder, tmp_path, monkeypatch, caplog):
+    monkeypatch.setattr(sys, 'excepthook', lambda *args: None)
+    recorder.install_crash_dump(str(tmp_path / 'missing' / 'crash.bin'))
+    try:
+        raise RuntimeError('boom')
+    except RuntimeError:
+        sys.excepthook(*sys.exc_info())
+    assert any('Failed to dump blackboard activity' in record.getMessage() for record in caplog.records)
@@ -5,7 +5,12 @@ import py_trees
 import py_trees.console as console
 import random
 from py_branches.alternating import ActivateBehavior
+from py_branches.alternating import AlternatingSelector
+from py_branches.alternating import FairShareSelector
 from py_branches.alternating import RunEveryRange
+from py_branches.alternating import RunLengthPattern
+from py_branches.alternating import RunLengthSelector
+from py_branches.alternating import load_pattern_file
 from py_branches.alternating import run_alternating
 from py_branches.alternating import RunEveryX
 
@@ -233,3 +238,248 @@ def test_run_every_range_decorator():
         else:
             check_guarded_behavior(guarded_behavior, False, False, _i)
             assert run_every_range_behavior.status == _f
+
+
+def _pattern(decorator, ticks):
+    pattern = []
+    for _ in range(ticks):
+        pattern.append(decorator.ticks_until_next_run())
+        decorator.tick_once()
+    return pattern
+
+
+def test_ticks_until_next_run_predicts_the_pattern():
+    every_x = RunEveryX(GuardedBehavior(), 'every_x', (4, 4))
+    assert _pattern(every_x, 8) == [3, 2, 1, 0, 3, 2, 1, 0]
+
+    every_range = RunEveryRange(GuardedBehavior(), 'every_range', 6, (4, 5))
+    assert _pattern(every_range, 8) == [3, 2, 1, 0, 0, 4, 3, 2]
+
+
+def test_skip_ticks_matches_ticking():
+    ticked = RunEveryRange(GuardedBehavior(), 'ticked', 5, (2, 2), success_if_skip=True)
+    skipped = RunEveryRange(GuardedBehavior(), 'skipped', 5, (2, 2), success_if_skip=True)
+    for _ in range(3):
+        ticked.tick_once()
+        ticked.tick_once()
+        while ticked.ticks_until_next_run():
+            ticked.tick_once()
+        skipped.tick_once()
+        skipped.tick_once()
+        skipped.skip_ticks(skipped.ticks_until_next_run())
+        assert skipped.status == ticked.status == _s
+        assert skipped._iteration == ticked._iteration
+
+    every_x = RunEveryX(GuardedBehavior(), 'every_x', (10, 10))
+    every_x.skip_ticks(9)
+    assert every_x.status == _f
+    every_x.tick_once()
+    assert every_x.decorated.updated
+    with pytest.raises(ValueError):
+        every_x.skip_ticks(10)
+
+
+def test_skipped_ticks_do_not_stop_idle_children(monkeypatch):
+    every_x = RunEveryX(GuardedBehavior(), 'every_x', (3, 3))
+    monkeypatch.setattr(every_x, 'stop', lambda new_status: pytest.fail('stop() on an idle skip'))
+    every_x.tick_once()
+    every_x.tick_once()
+    assert every_x.status == _f
+
+
+def test_skip_stops_running_child():
+    child = py_trees.behaviours.Running('running')
+    every_x = RunEveryX(child, 'every_x', (2, 2))
+    every_x.tick_once()
+    every_x.tick_once()
+    assert child.status == _r
+    every_x.tick_once()
+    assert every_x.status == _f
+    assert child.status == _i
+
+
+class _CountingBehavior(py_trees.behaviour.Behaviour):
+    def __init__(self, name, status=_s):
+        super().__init__(name=name)
+        self.result = status
+        self.ticks = 0
+
+    def update(self):
+        self.ticks += 1
+        return self.result
+
+
+def test_alternating_selector_matches_run_alternating():
+    counts = [3, 1, 2]
+    legacy_children = [_CountingBehavior(str(i), _f if i == 1 else _s) for i in range(3)]
+    native_children = [_CountingBehavior(str(i), _f if i == 1 else _s) for i in range(3)]
+    legacy = run_alternating('legacy', legacy_children, counts)
+    native = AlternatingSelector('native', native_children, counts)
+    for _ in range(20):
+        legacy.tick_once()
+        native.tick_once()
+        assert native.status == legacy.status
+        assert [c.ticks for c in native_children] == [c.ticks for c in legacy_children]
+
+
+def test_alternating_selector_ticks_only_the_active_child():
+    children = [_CountingBehavior(str(i)) for i in range(50)]
+    selector = AlternatingSelector('rotation', children, [2] * 50)
+    visited = [len(list(selector.tick())) for _ in range(100)]
+    assert visited == [2] * 100  # the active child and the selector
+    assert all(child.ticks == 2 for child in children)
+    assert selector.cursor == (49, 2)
+
+
+def test_alternating_selector_stops_running_child_on_rotation():
+    running = py_trees.behaviours.Running('running')
+    other = _CountingBehavior('other')
+    selector = AlternatingSelector('rotation', [running, other], [2, 1])
+    selector.tick_once()
+    selector.tick_once()
+    assert selector.status == _r
+    selector.tick_once()
+    assert running.status == _i
+    assert selector.status == _s
+    selector.tick_once()
+    assert running.status == _r
+
+
+def test_alternating_selector_tracks_child_changes():
+    a, b, c = (_CountingBehavior(name) for name in 'abc')
+    selector = AlternatingSelector('rotation', [a, b], [1, 2])
+    selector.tick_once()
+    selector.tick_once()
+    assert selector.current_child is b
+    selector.prepend_child(c, 5)
+    assert selector.counts == [5, 1, 2]
+    selector.tick_once()
+    assert selector.current_child is b
+    selector.remove_child(b)
+    selector.tick_once()
+    assert selector.current_child is c
+    with pytest.raises(ValueError):
+        selector.add_child(_CountingBehavior('d'), 0)
+    with pytest.raises(ValueError):
+        AlternatingSelector('rotation', [_CountingBehavior('e')], [1, 2])
+
+
+def _expand(segments):
+    return [child for child, count in segments for _ in range(count)]
+
+
+def test_run_length_pattern_locates_any_tick():
+    segments = [('a', 3), ('b', 1), ('a', 2), ('c', 7)]
+    pattern = RunLengthPattern(segments)
+    expanded = _expand(segments)
+    assert pattern.period == len(expanded) == 13
+    assert [pattern.child_at(t) for t in range(40)] == [expanded[t % 13] for t in range(40)]
+    assert pattern.locate(4) == (2, 0)
+    assert pattern.locate(12) == (3, 6)
+    with pytest.raises(ValueError):
+        RunLengthPattern([('a', 0)])
+
+
+def test_run_length_selector_follows_pattern_and_seeks():
+    children = [_CountingBehavior(name) for name in 'abc']
+    segments = [('a', 3), ('b', 1), ('a', 2), ('c', 7)]
+    selector = RunLengthSelector('patrol', children, segments)
+    order = []
+    for _ in range(30):
+        selector.tick_once()
+        order.append(selector.current_child.name)
+    assert order == [_expand(segments)[t % 13] for t in range(30)]
+    assert selector.tick_index == 30
+
+    resumed = RunLengthSelector('patrol', [_CountingBehavior(name) for name in 'abc'], segments,
+                                tick_index=selector.tick_index)
+    resumed.tick_once()
+    selector.tick_once()
+    assert resumed.current_child.name == selector.current_child.name
+
+    selector.skip_ticks(1000)
+    selector.tick_once()
+    assert selector.current_child.name == _expand(segments)[(31 + 1000) % 13]
+
+
+def test_run_length_selector_resolves_pattern_after_child_changes():
+    a, b, c = (_CountingBehavior(name) for name in 'abc')
+    selector = RunLengthSelector('patrol', [a, b], [('a', 1), ('b', 1)])
+    selector.insert_child(c, 0)  # names keep pointing at their child
+    selector.tick_once()
+    assert selector.current_child is a
+    selector.tick_once()
+    assert selector.current_child is b
+
+    replacement = _CountingBehavior('b')
+    selector.replace_child(b, replacement)
+    selector.tick_once()
+    selector.tick_once()
+    assert selector.current_child is replacement
+
+    selector.remove_child(replacement)
+    with pytest.raises(ValueError):
+        selector.tick_once()
+
+
+def test_pattern_files_round_trip(tmp_path):
+    by_index = RunLengthPattern([(0, 3), (1, 1), (0, 2), (2, 7)])
+    npy = str(tmp_path / 'pattern.npy')
+    by_index.save(npy)
+    assert load_pattern_file(npy).segments == by_index.segments
+
+    by_name = RunLengthPattern([('a', 3), ('b', 1)])
+    yml = str(tmp_path / 'pattern.yaml')
+    by_name.save(yml)
+    assert load_pattern_file(yml).segments == by_name.segments
+
+    selector = RunLengthSelector('patrol', [_CountingBehavior(name) for name in 'ab'], yml)
+    assert selector.pattern.period == 4
+    with pytest.raises(ValueError):
+        by_name.save(str(tmp_path / 'names.npy'))
+    with pytest.raises(ValueError):
+        RunLengthSelector('patrol', [_CountingBehavior('a')], by_name)
+
+
+def _shares(selector, ticks):
+    for _ in range(ticks):
+        selector.tick_once()
+    return [child.ticks for child in selector.children]
+
+
+def test_fair_share_selector_is_proportional_and_smooth():
+    children = [_CountingBehavior(name) for name in 'abc']
+    selector = FairShareSelector('share', children, [5, 3, 2])
+    for window in range(1, 101):
+        counts = _shares(selector, 1)
+        assert all(abs(count - window * w / 10) < 1.5 for count, w in zip(counts, [5, 3, 2]))
+    assert [child.ticks for child in children] == [50, 30, 20]
+
+
+def test_fair_share_selector_many_children():
+    weights = [(i % 7) + 1 for i in range(300)]
+    selector = FairShareSelector('share', [_CountingBehavior(str(i)) for i in range(300)], weights)
+    counts = _shares(selector, 10 * sum(weights))
+    assert counts == [10 * w for w in weights]
+
+
+def test_fair_share_selector_runtime_weight_changes():
+    a, b = _CountingBehavior('a'), _CountingBehavior('b')
+    selector = FairShareSelector('share', [a, b])
+    assert _shares(selector, 10) == [5, 5]
+    selector.set_weight(b, 3.0)
+    assert _shares(selector, 40) == [15, 35]
+    selector.set_weight(0, 0.0)
+    assert _shares(selector, 10) == [15, 45]
+    assert selector.weights == [0.0, 3.0]
+
+    c = _CountingBehavior('c')
+    selector.replace_child(b, c)
+    selector.add_child(_CountingBehavior('d'), weight=3.0)
+    counts = _shares(selector, 20)
+    assert counts == [15, 10, 10]
+    assert len(selector._heap) <= 2 * len(selector.children) + 16
+
+    selector.set_weights([0.0, 0.0, 0.0])
+    with pytest.raises(ValueError):
+        selector.tick_once()
@@ -1,12 +1,21 @@
 #!/usr/bin/env python
+import logging
+
 import py_trees
+import pytest
 
+from py_branches.blackboard import BlackboardKeyHandle
+from py_branches.blackboard import BlackboardWriteBuffer
+from py_branches.blackboard import compile_predicate
 from py_branches.blackboard import IncrementBlackboardVariable
 from py_branches.blackboard import IncrementBlackboardVariableIfCondition
 from py_branches.blackboard import SetBlackboardVariableIfCondition
+from py_branches.blackboard import RunIfBlackboard
 from py_branches.blackboard import RunIfBlackboardVariableEquals
 from py_branches.blackboard import RunIfBlackboardVariableLessThan
 from py_branches.blackboard import RunIfBlackboardVariableGreaterThan
+from py_branches.blackboard import WatchedStorage
+from py_branches.blackboard import watch_blackboard
 
 
 _r = py_trees.common.Status.RUNNING
@@ -230,3 +239,292 @@ def test_run_if_blackboard_variable_greater_than():
     # Missing variable, skip with success.
     ribgt = _create_ribgt(count, 'missing_gt_var', 0.0, True)
     _tick_and_check_status(ribgt, [_s, _s])
+
+
+def test_blackboard_key_handle_reads_remapped_key_and_warns_once(caplog):
+    blackboard = py_trees.blackboard.Client()
+    blackboard.register_key(key='handle_target', access=py_trees.common.Access.WRITE)
+    client = py_trees.blackboard.Client(namespace='ns')
+    client.register_key(key='alias', access=py_trees.common.Access.READ, remap_to='/handle_target')
+    handle = BlackboardKeyHandle(client, 'alias', logging.getLogger('handle_test'))
+
+    with caplog.at_level(logging.WARNING, logger='handle_test'):
+        assert handle.get() is None
+        assert handle.get() is None
+        assert len(caplog.records) == 1
+
+        blackboard.handle_target = 7
+        assert handle.get() == 7
+        blackboard.unset('handle_target')
+        assert handle.get() is None
+        assert len(caplog.records) == 2
+
+
+def test_blackboard_key_handle_reuses_result_for_same_value():
+    blackboard = py_trees.blackboard.Client()
+    blackboard.register_key(key='cached_var', access=py_trees.common.Access.WRITE)
+    blackboard.cached_var = 'idle'
+    handle = BlackboardKeyHandle(blackboard, 'cached_var', logging.getLogger('handle_test'))
+    calls = []
+
+    def predicate(value):
+        calls.append(value)
+        return value == 'idle'
+
+    assert handle.evaluate(predicate)
+    assert handle.evaluate(predicate)
+    assert calls == ['idle']
+    blackboard.cached_var = 'busy'
+    assert not handle.evaluate(predicate)
+    assert calls == ['idle', 'busy']
+
+    blackboard.cached_var = [1]  # mutable values are always re-evaluated
+    handle.evaluate(predicate)
+    handle.evaluate(predicate)
+    assert len(calls) == 4
+
+
+def test_run_if_blackboard_variable_records_activity_when_enabled():
+    py_trees.blackboard.Blackboard.enable_activity_stream()
+    try:
+        blackboard = py_trees.blackboard.Client()
+        blackboard.register_key(key='streamed_var', access=py_trees.common.Access.WRITE)
+        blackboard.streamed_var = 1
+        gate = RunIfBlackboardVariableEquals(
+            py_trees.behaviours.Success('s'), 'gate', 'streamed_var', 1)
+        py_trees.blackboard.Blackboard.activity_stream.clear()
+        gate.tick_once()
+        assert gate.status == _s
+        reads = [item for item in py_trees.blackboard.Blackboard.activity_stream.data
+                 if item.key == '/streamed_var' and item.activity_type == 'READ']
+        assert len(reads) == 1
+    finally:
+        py_trees.blackboard.Blackboard.disable_activity_stream()
+
+
+def test_run_if_blackboard_variable_missing_warns_once(capsys):
+    gate = RunIfBlackboardVariableLessThan(
+        py_trees.behaviours.Success('s'), 'gate', 'never_set_var', 1.0)
+    _tick_and_check_status(gate, [_s, _s, _s])
+    assert capsys.readouterr().out.count('never_set_var') == 1
+
+
+def test_run_if_blackboard_predicate_over_several_keys():
+    blackboard = py_trees.blackboard.Client()
+    blackboard.register_key(key='battery', access=py_trees.common.Access.WRITE)
+    blackboard.register_key(key='mode', access=py_trees.common.Access.WRITE)
+    blackboard.battery = 10.0
+    blackboard.mode = 'idle'
+    count = py_trees.behaviours.TickCounter('tick_counter', 2, py_trees.common.Status.SUCCESS)
+
+    gate = RunIfBlackboard(count, 'gate', "battery < 20 and mode == 'idle'", success_if_skip=False)
+    assert gate.variable_names == ('battery', 'mode')
+    _tick_and_check_status(gate, [_r, _r, _s])
+    assert count.counter == 3
+
+    # Condition is held while the child is RUNNING.
+    blackboard.mode = 'busy'
+    _tick_and_check_status(gate, [_f, _f])
+    blackboard.mode = 'idle'
+    blackboard.battery = 50.0
+    _tick_and_check_status(gate, [_f])
+    blackboard.battery = 5.0
+    _tick_and_check_status(gate, [_r])
+    blackboard.battery = 50.0
+    _tick_and_check_status(gate, [_r, _s])
+
+
+def test_run_if_blackboard_missing_or_mistyped_variables_skip(capsys):
+    blackboard = py_trees.blackboard.Client()
+    blackboard.register_key(key='level', access=py_trees.common.Access.WRITE)
+    success = py_trees.behaviours.Success('success')
+
+    gate = RunIfBlackboard(success, 'gate', 'level > 3 and unset_predicate_var', success_if_skip=False)
+    blackboard.level = 5
+    _tick_and_check_status(gate, [_f, _f])
+
+    gate = RunIfBlackboard(success, 'gate', 'level > 3', success_if_skip=False)
+    blackboard.level = 'high'
+    _tick_and_check_status(gate, [_f, _f, _f])
+    assert capsys.readouterr().out.count('Failed to evaluate predicate') == 1
+    blackboard.level = 4
+    _tick_and_check_status(gate, [_s])
+
+
+def test_run_if_blackboard_rejects_unsafe_predicates():
+    for predicate in ('__import__("os")', 'x.__class__', 'len(x) > 1', 'x = 1', 'lambda: 1', '3 > 1'):
+        with pytest.raises(ValueError):
+            RunIfBlackboard(py_trees.behaviours.Success('s'), 'gate', predicate)
+
+
+def test_compile_predicate_supports_attribute_and_membership():
+    predicate, names = compile_predicate("pose.x >= 1.5 and mode in ('a', 'b') and not -limit > 0")
+    assert names == ('pose', 'mode', 'limit')
+
+    class _Pose(object):
+        x = 2.0
+    assert predicate(_Pose(), 'a', 1)
+    assert not predicate(_Pose(), 'c', 1)
+
+
+def _count_evaluations(gate):
+    calls = []
+    should_run = gate._should_run
+
+    def counting_should_run():
+        calls.append(None)
+        return should_run()
+    gate._should_run = counting_should_run
+    return calls
+
+
+def test_blackboard_gate_reevaluates_only_after_writes():
+    blackboard = py_trees.blackboard.Client()
+    blackboard.register_key(key='watched_a', access=py_trees.common.Access.WRITE)
+    blackboard.register_key(key='watched_b', access=py_trees.common.Access.WRITE)
+    blackboard.watched_a = 0
+    blackboard.watched_b = 0
+    gate = RunIfBlackboard(py_trees.behaviours.Success('s'), 'gate', 'watched_a >= 2', success_if_skip=False)
+    calls = _count_evaluations(gate)
+
+    _tick_and_check_status(gate, [_f, _f, _f])
+    assert len(calls) == 1
+
+    blackboard.watched_b = 5  # unrelated key
+    _tick_and_check_status(gate, [_f])
+    assert len(calls) == 1
+
+    increment = IncrementBlackboardVariable('increment', 'watched_a', increment_by=1)
+    increment.tick_once()
+    _tick_and_check_status(gate, [_f])
+    increment.tick_once()
+    _tick_and_check_status(gate, [_s, _s])
+    assert len(calls) == 3
+
+    blackboard.unset('watched_a')
+    _tick_and_check_status(gate, [_f, _f])
+    assert len(calls) == 4
+
+
+def test_blackboard_gate_reevaluates_mutable_values_every_tick():
+    blackboard = py_trees.blackboard.Client()
+    blackboard.register_key(key='watched_list', access=py_trees.common.Access.WRITE)
+    blackboard.watched_list = []
+    gate = RunIfBlackboard(py_trees.behaviours.Success('s'), 'gate', 'len_ok in watched_list',
+                           success_if_skip=False)
+    blackboard.register_key(key='len_ok', access=py_trees.common.Access.WRITE)
+    blackboard.len_ok = 1
+    calls = _count_evaluations(gate)
+
+    _tick_and_check_status(gate, [_f])
+    blackboard.watched_list.append(1)  # in-place mutation, not a write
+    _tick_and_check_status(gate, [_s])
+    assert len(calls) == 2
+
+
+def test_watched_storage_notifies_on_every_kind_of_write():
+    class _Subscriber(object):
+        def __init__(self):
+            self.keys = []
+
+        def blackboard_changed(self, key):
+            self.keys.append(key)
+
+    storage = WatchedStorage({'x': 1})
+    subscriber = _Subscriber()
+    storage.subscribe('x', subscriber)
+    storage['x'] = 2
+    storage.update(x=3, y=4)
+    storage.setdefault('x', 0)  # no write
+    storage.pop('x')
+    storage.setdefault('x', 5)
+    del storage['x']
+    storage['x'] = 6
+    storage.clear()
+    assert subscriber.keys == ['x'] * 7
+
+    storage.unsubscribe('x', subscriber)
+    storage['x'] = 7
+    assert len(subscriber.keys) == 7
+
+
+def test_watch_blackboard_keeps_contents():
+    blackboard = py_trees.blackboard.Client()
+    blackboard.register_key(key='kept_var', access=py_trees.common.Access.WRITE)
+    blackboard.kept_var = 'kept'
+    storage = watch_blackboard()
+    assert py_trees.blackboard.Blackboard.storage is storage
+    assert watch_blackboard() is storage
+    assert blackboard.kept_var == 'kept'
+
+
+def test_write_buffer_coalesces_writes_per_tick():
+    blackboard = py_trees.blackboard.Client()
+    blackboard.register_key(key='buffered_count', access=py_trees.common.Access.WRITE)
+    blackboard.register_key(key='buffered_flag', access=py_trees.common.Access.WRITE)
+    blackboard.buffered_count = 0
+    buffer = BlackboardWriteBuffer()
+
+    children = [
+        IncrementBlackboardVariableIfCondition(
+            py_trees.behaviours.Success(f's{i}'), f'inc{i}', 'buffered_count', _s, 2, write_buffer=buffer)
+        for i in range(3)
+    ]
+    children.append(IncrementBlackboardVariable('inc', 'buffered_count', 1, write_buffer=buffer))
+    children.append(SetBlackboardVariableIfCondition(
+        py_trees.behaviours.Success('a'), 'set_a', 'buffered_flag', _s, 'first', write_buffer=buffer))
+    children.append(SetBlackboardVariableIfCondition(
+        py_trees.behaviours.Success('b'), 'set_b', 'buffered_flag', _s, 'second', write_buffer=buffer))
+    root = py_trees.composites.Sequence('root', memory=False, children=children)
+    tree = py_trees.trees.BehaviourTree(root)
+    tree.add_post_tick_handler(buffer.flush)
+
+    py_trees.blackboard.Blackboard.enable_activity_stream()
+    try:
+        tree.tick()
+        writes = [item for item in py_trees.blackboard.Blackboard.activity_stream.data
+                  if item.activity_type in ('WRITE', 'INITIALISED')]
+        reads = [item for item in py_trees.blackboard.Blackboard.activity_stream.data
+                 if item.activity_type == 'READ']
+    finally:
+        py_trees.blackboard.Blackboard.disable_activity_stream()
+    assert blackboard.buffered_count == 7
+    assert blackboard.buffered_flag == 'second'
+    assert sorted(item.key for item in writes) == ['/buffered_count', '/buffered_flag']
+    assert [item.key for item in reads] == ['/buffered_count']  # once, by the flush
+    assert len(buffer) == 0
+
+    tree.tick()
+    assert blackboard.buffered_count == 14
+
+
+def test_buffered_increment_fails_on_missing_variable():
+    buffer = BlackboardWriteBuffer()
+    increment = IncrementBlackboardVariable('inc', 'buffered_missing', 1, write_buffer=buffer)
+    increment.tick_once()
+    assert increment.status == _f
+    assert len(buffer) == 0
+
+
+def test_write_buffer_set_then_increment_and_discard():
+    blackboard = py_trees.blackboard.Client()
+    blackboard.register_key(key='buffered_total', access=py_trees.common.Access.WRITE)
+    blackboard.buffered_total = 100
+    buffer = BlackboardWriteBuffer()
+
+    buffer.increment(blackboard, 'buffered_total', 5)
+    buffer.set(blackboard, 'buffered_total', 10)
+    buffer.increment(blackboard, 'buffered_total', 1)
+    assert blackboard.buffered_total == 100  # nothing applied before the flush
+    assert buffer.flush() == 1
+    assert blackboard.buffered_total == 11
+
+    buffer.increment(blackboard, 'buffered_total', 1)
+    buffer.discard()
+    assert buffer.flush() == 0
+    assert blackboard.buffered_total == 11
+
+    blackboard.buffered_total = 'text'
+    buffer.increment(blackboard, 'buffered_total', 1)
+    assert buffer.flush() == 0
+    assert blackboard.buffered_total == 'text'
@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+import datetime
+
+import py_trees
+import pytest
+
+from py_branches import clock as clock_module
+from py_branches.clock import MonotonicClock
+from py_branches.clock import SimulatedClock
+from py_branches.clock import TickClock
+from py_branches.clock import set_tree_clock
+from py_branches.cooldown import Cooldown
+from py_branches.pause import PauseUniform
+from py_branches.retry import Retry
+
+
+_r = py_trees.common.Status.RUNNING
+_s = py_trees.common.Status.SUCCESS
+_f = py_trees.common.Status.FAILURE
+
+
+def test_simulated_clock_advance_and_datetime():
+    start_dt = datetime.datetime(2024, 1, 1, 23, 59, 0)
+    clock = SimulatedClock(start=10.0, start_datetime=start_dt)
+    assert clock.now() == 10.0
+    assert clock.datetime() == start_dt
+
+    clock.advance(120.0)
+    assert clock.now() == 130.0
+    assert clock.datetime() == datetime.datetime(2024, 1, 2, 0, 1, 0)
+
+    with pytest.raises(ValueError):
+        clock.advance(-1.0)
+    with pytest.raises(ValueError):
+        clock.set(0.0)
+
+
+def test_tick_clock_caches_until_tick():
+    source = SimulatedClock()
+    clock = TickClock(source)
+    source.advance(5.0)
+    assert clock.now() == 0.0  # still the cached reading
+    clock.tick()
+    assert clock.now() == 5.0
+
+
+def test_tick_clock_as_pre_tick_handler():
+    source = SimulatedClock()
+    clock = TickClock(source)
+    pause = PauseUniform('pause', 1.0, 1.0, clock=clock)
+    tree = py_trees.trees.BehaviourTree(pause)
+    tree.add_pre_tick_handler(clock.tick)
+
+    tree.tick()
+    assert pause.status == _r
+    source.advance(1.5)
+    tree.tick()
+    assert pause.status == _s
+
+
+def test_cooldown_with_simulated_clock():
+    clock = SimulatedClock()
+    child = py_trees.behaviours.Success(name='success')
+    cooldown = Cooldown(child, name='cooldown', duration=10.0, clock=clock)
+
+    cooldown.tick_once()
+    assert cooldown.status == _s
+    clock.advance(9.9)
+    cooldown.tick_once()
+    assert cooldown.status == _f
+    clock.advance(0.2)
+    cooldown.tick_once()
+    assert cooldown.status == _s
+
+
+def test_set_tree_clock():
+    clock = SimulatedClock()
+    retry = Retry(py_trees.behaviours.Failure(name='failure'), name='retry', max_attempts=2, delay=60.0)
+    cooldown = Cooldown(retry, name='cooldown', duration=1.0)
+    root = py_trees.composites.Sequence('root', memory=False, children=[cooldown])
+
+    assert set_tree_clock(root, clock) == 2
+    assert retry.clock is clock
+    assert cooldown.clock is clock
+
+    root.tick_once()
+    assert retry.status == _r  # waiting out the retry delay
+    clock.advance(61.0)
+    root.tick_once()
+    assert retry.status == _f
+
+
+def test_set_default_clock():
+    clock = SimulatedClock()
+    previous = clock_module.get_default_clock()
+    clock_module.set_default_clock(clock)
+    try:
+        pause = PauseUniform('pause', 1.0, 1.0)
+        assert pause.clock is clock
+    finally:
+        clock_module.set_default_clock(previous)
+    assert isinstance(PauseUniform('pause', 1.0, 1.0).clock, MonotonicClock)
+    with pytest.raises(TypeError):
+        clock_module.set_default_clock(object())
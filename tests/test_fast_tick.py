@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+import logging
+
+import py_trees
+
+from py_branches.alternating import ActivateBehavior
+from py_branches.alternating import AlternatingSelector
+from py_branches.alternating import FairShareSelector
+from py_branches.alternating import RunEveryRange
+from py_branches.alternating import RunEveryX
+from py_branches.blackboard import RunIfBlackboard
+from py_branches.clock import SimulatedClock
+from py_branches.cooldown import Cooldown
+from py_branches.counter import Counter
+from py_branches.fast import fast_tick
+from py_branches.fast import supports_fast_tick
+from py_branches.fast import tick_tree
+from py_branches.latch import Latch
+from py_branches.random import BanditSelector
+from py_branches.random import MarkovSequencer
+from py_branches.random import RandomDelay
+from py_branches.random import RandomRun
+from py_branches.retry import Retry
+from py_branches.rng import RandomStream
+from py_branches.runner import EventDrivenRunner
+from py_branches.timeout import Timeout
+from py_branches.visitors import StatusTransitionVisitor
+from py_branches.visitors import TickProfiler
+
+
+_r = py_trees.common.Status.RUNNING
+_s = py_trees.common.Status.SUCCESS
+_f = py_trees.common.Status.FAILURE
+
+
+class _Cycle(py_trees.behaviour.Behaviour):
+    def __init__(self, name, statuses):
+        super().__init__(name=name)
+        self.statuses = statuses
+        self.ticks = 0
+
+    def update(self):
+        self.ticks += 1
+        return self.statuses[(self.ticks - 1) % len(self.statuses)]
+
+
+def _build_tree(clock, rng):
+    bb = py_trees.blackboard.Client(name='fast_tick_test')
+    bb.register_key(key='fast_tick_gate', access=py_trees.common.Access.WRITE)
+    bb.fast_tick_gate = 1
+    branches = [
+        Counter(RunEveryX(_Cycle('a', [_r, _s]), 'every_x', (1, 3), rng=rng), 'counter', 4),
+        Cooldown(RandomRun(_Cycle('b', [_s, _f]), 'random_run', 0.5, rng=rng), 'cooldown', 0.25, clock=clock),
+        Retry(_Cycle('c', [_f, _f, _r, _s]), 'retry', 3, delay=0.1, clock=clock),
+        Latch(RunEveryRange(_Cycle('d', [_f, _s]), 'every_range', 4, (2, 3)), 'latch'),
+        RunIfBlackboard(ActivateBehavior(py_trees.decorators.Inverter('inverter', _Cycle('e', [_s, _r])),
+                                         'activate', True), 'gate', 'fast_tick_gate > 0'),
+        BanditSelector('bandit', [_Cycle('g', [_f]), _Cycle('h', [_s, _f])], rng=rng),
+        MarkovSequencer('markov', [_Cycle('i', [_s]), _Cycle('j', [_r, _f])], [[1, 2], [1, 0]], rng=rng),
+    ]
+    delay = RandomDelay(Timeout(_Cycle('f', [_r, _r, _s]), 'timeout', 0.12, clock=clock),
+                        'delay', 0.0, 0.08, clock=clock, rng=rng)
+    sequence = py_trees.composites.Sequence('sequence', memory=False,
+                                            children=[_Cycle('l', [_s]), _Cycle('m', [_r, _s])])
+    share = FairShareSelector('share', branches, [3, 1, 2, 1, 1, 2, 1])
+    return AlternatingSelector('root', [share, delay, sequence], [5, 4, 3])
+
+
+def _statuses(root):
+    return [(node.name, node.status) for node in root.iterate()]
+
+
+def test_fast_tick_matches_generator_ticks():
+    slow_clock, fast_clock = SimulatedClock(), SimulatedClock()
+    slow = py_trees.trees.BehaviourTree(_build_tree(slow_clock, RandomStream(1)))
+    fast = py_trees.trees.BehaviourTree(_build_tree(fast_clock, RandomStream(1)))
+    for _ in range(500):
+        slow.tick()
+        tick_tree(fast)
+        assert _statuses(fast.root) == _statuses(slow.root)
+        slow_clock.advance(0.05)
+        fast_clock.advance(0.05)
+    assert fast.count == slow.count == 500
+
+
+def test_fast_tick_falls_back_to_generators():
+    class CustomTick(py_trees.behaviours.Success):
+        def tick(self):
+            self.custom = True
+            yield from super().tick()
+
+    class CustomLatch(Latch):
+        def tick(self):
+            self.custom = True
+            yield from super().tick()
+
+    leaf = CustomTick('leaf')
+    assert fast_tick(leaf) == _s and leaf.custom
+    latch = CustomLatch(py_trees.behaviours.Success('child'), 'latch')
+    assert fast_tick(latch) == _s and latch.custom
+
+    root = Latch(py_trees.composites.Sequence('sequence', memory=False,
+                                              children=[py_trees.behaviours.Success('a')]), 'latch')
+    assert not supports_fast_tick(root)
+    assert supports_fast_tick(Latch(RunEveryX(py_trees.behaviours.Success('b'), 'every_x', (1, 1)), 'latch'))
+
+    profiled = Counter(py_trees.behaviours.Success('c'), 'counter', 2)
+    profiler = TickProfiler()
+    profiler.attach(profiled)
+    assert not supports_fast_tick(profiled)
+    fast_tick(profiled)
+    assert all(row['ticks'] == 1 for row in profiler.snapshot())
+
+
+def test_tick_tree_runs_handlers_and_respects_visitors(caplog):
+    tree = py_trees.trees.BehaviourTree(Latch(py_trees.behaviours.Success('a'), 'latch'))
+    calls = []
+    tree.add_pre_tick_handler(lambda t: calls.append('pre'))
+    tree.add_post_tick_handler(lambda t: calls.append(('post', t.root.status)))
+    tick_tree(tree)
+    assert calls == ['pre', ('post', _s)]
+    assert tree.count == 1
+
+    caplog.set_level(logging.INFO, logger='py_branches.visitors')
+    tree.add_visitor(StatusTransitionVisitor())  # not full, so needs the generators
+    tree.root.reset()
+    tree.root.stop(py_trees.common.Status.INVALID)
+    tick_tree(tree)
+    assert any('[a] SUCCESS' in record.getMessage() for record in caplog.records)
+    assert tree.count == 2
+
+
+def test_runner_fast_mode():
+    clock = SimulatedClock()
+    leaf = _Cycle('leaf', [_s])
+    tree = py_trees.trees.BehaviourTree(RunEveryX(leaf, 'every_x', (2, 2)))
+    runner = EventDrivenRunner(tree, clock=clock, idle_period=1.0, fast=True)
+    assert runner.run(num_ticks=6) == 6
+    assert leaf.ticks == 3
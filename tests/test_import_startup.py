@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+import json
+import subprocess
+import sys
+
+
+# Seconds allowed for `import py_branches.latch` on top of py_trees itself.
+_LATCH_IMPORT_BUDGET = 0.1
+
+_HEAVY_MODULES = ('numpy', 'sklearn', 'yaml')
+
+
+def _run_fresh(code):
+    out = subprocess.run([sys.executable, '-c', code], check=True, capture_output=True, text=True)
+    return json.loads(out.stdout)
+
+
+def test_import_package_loads_no_submodules():
+    result = _run_fresh(
+        'import json, sys\n'
+        'import py_branches\n'
+        'print(json.dumps(sorted(m for m in sys.modules if m.startswith("py_branches."))))\n'
+    )
+    assert result == []
+
+
+def test_submodules_load_on_attribute_access():
+    import py_branches
+    assert py_branches.latch.Latch is not None
+    assert 'latch' in dir(py_branches)
+
+
+def test_import_latch_startup_budget():
+    result = _run_fresh(
+        'import json, sys, time\n'
+        'import py_trees\n'
+        'start = time.perf_counter()\n'
+        'import py_branches.latch\n'
+        'elapsed = time.perf_counter() - start\n'
+        f'heavy = [m for m in {_HEAVY_MODULES!r} if m in sys.modules]\n'
+        'print(json.dumps({"elapsed": elapsed, "heavy": heavy}))\n'
+    )
+    assert result['heavy'] == []
+    assert result['elapsed'] < _LATCH_IMPORT_BUDGET, f'import took {result["elapsed"]:.3f}s'
+
+
+def test_import_pause_defers_numpy_and_sklearn():
+    result = _run_fresh(
+        'import json, sys\n'
+        'import py_branches.pause\n'
+        'print(json.dumps([m for m in ("numpy", "sklearn") if m in sys.modules]))\n'
+    )
+    assert result == []
+
+
+def test_import_random_defers_numpy():
+    result = _run_fresh(
+        'import json, sys\n'
+        'import py_branches.random\n'
+        'print(json.dumps("numpy" in sys.modules))\n'
+    )
+    assert result is False
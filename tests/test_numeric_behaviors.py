@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+import numpy as np
+import py_trees
+import pytest
+
+from py_branches.numeric import IncrementNumeric
+from py_branches.numeric import IncrementNumericIfCondition
+from py_branches.numeric import NumericNamespace
+from py_branches.numeric import RunIfNumeric
+from py_branches.numeric import clear_numeric_namespaces
+from py_branches.numeric import get_numeric_namespace
+
+
+_r = py_trees.common.Status.RUNNING
+_s = py_trees.common.Status.SUCCESS
+_f = py_trees.common.Status.FAILURE
+
+
+def _tick_and_check_status(behavior, expected_status_list):
+    for i, expected_status in enumerate(expected_status_list):
+        behavior.tick_once()
+        assert behavior.status == expected_status, \
+            f'i == {i}, {behavior.status} != {expected_status}'
+
+
+def test_numeric_namespace_grows_and_keeps_values():
+    namespace = NumericNamespace('scores', keys=['a', 'b'], initial=1.0)
+    namespace['a'] = 5.0
+    for i in range(100):
+        namespace.increment(f'target_{i}', i)
+
+    assert len(namespace) == 102
+    assert namespace['a'] == 5.0
+    assert namespace['b'] == 1.0
+    assert namespace['target_99'] == 100.0
+    assert namespace.keys[:3] == ['a', 'b', 'target_0']
+    assert namespace.values.shape == (102,)
+    with pytest.raises(KeyError):
+        namespace['missing']
+
+
+def test_numeric_namespace_bulk_operations():
+    namespace = NumericNamespace('counts', keys=['x', 'y', 'z'], dtype=np.int64)
+    namespace['x'] = 10
+    namespace['y'] = 3
+    namespace.decay(0.5)
+    assert namespace.snapshot() == {'x': 5, 'y': 1, 'z': 0}
+    assert type(namespace['x']) is int
+
+    array = namespace.to_array()
+    namespace.reset()
+    assert list(array) == [5, 1, 0]
+    assert namespace.snapshot() == {'x': 0, 'y': 0, 'z': 0}
+    namespace.reset(7)
+    assert list(namespace.values) == [7, 7, 7]
+
+
+def test_numeric_namespace_registry():
+    clear_numeric_namespaces()
+    attempts = get_numeric_namespace('attempts')
+    assert get_numeric_namespace('attempts') is attempts
+    IncrementNumeric('inc', 'attempts', 'target').tick_once()
+    assert attempts['target'] == 1.0
+    clear_numeric_namespaces()
+    assert get_numeric_namespace('attempts') is not attempts
+
+
+def test_increment_numeric_if_condition():
+    namespace = NumericNamespace('failures')
+    failure = py_trees.behaviours.Failure('failure')
+    count = IncrementNumericIfCondition(failure, 'count', namespace, 'target', _f, 2.0)
+    skip = IncrementNumericIfCondition(failure, 'skip', namespace, 'target', _s, 100.0)
+
+    _tick_and_check_status(count, [_f, _f, _f])
+    _tick_and_check_status(skip, [_f])
+    assert namespace['target'] == 6.0
+
+
+def test_run_if_numeric():
+    namespace = NumericNamespace('gates')
+    count = py_trees.behaviours.TickCounter('tick_counter', 2, _s)
+    gate = RunIfNumeric(count, 'gate', namespace, 'attempts', '<', 2, success_if_skip=False)
+    assert not hasattr(gate, '_blackboard')  # no py_trees client is created
+
+    _tick_and_check_status(gate, [_r])
+    namespace['attempts'] = 5  # held while the child is RUNNING
+    _tick_and_check_status(gate, [_r, _s, _f])
+    namespace.reset()
+    _tick_and_check_status(gate, [_r])
+
+    with pytest.raises(ValueError):
+        RunIfNumeric(count, 'gate', namespace, 'attempts', '=>', 2)
@@ -2,15 +2,19 @@
 import py_trees
 import time
 import datetime
+import os
 import random
 
 import numpy as np
 import pytest
 
+from py_branches.clock import SimulatedClock
 from py_branches.pause import PauseUniform
 from py_branches.pause import PauseSchedule
 from py_branches.pause import PausePDF
 from py_branches.pause import PauseUntilKey
+from py_branches.pause import clear_pdf_cache
+from py_branches.pause import _ScheduleIndex
 
 
 class FakeKeyboardListener:
@@ -51,7 +55,10 @@ def test_pause_uniform():
 
 
 def test_pause_schedule_pauses_at_scheduled_time():
-    now_dt = datetime.datetime.now()
+    now_dt = datetime.datetime.now().replace(microsecond=0)
+    if now_dt.time() > datetime.time(23, 59, 0):
+        now_dt = now_dt.replace(hour=12)
+    clock = SimulatedClock(start_datetime=now_dt)
     start_dt = now_dt + datetime.timedelta(seconds=3)
     stop_dt = now_dt + datetime.timedelta(seconds=6)
     start_t = start_dt.time()
@@ -65,32 +72,33 @@ def test_pause_schedule_pauses_at_scheduled_time():
         'stop_plus_variance_time': stop_t,
     }]
 
-    pause_schedule = PauseSchedule('pause_schedule', schedule)
+    pause_schedule = PauseSchedule('pause_schedule', schedule, clock=clock)
 
     # Before the scheduled window, should immediately succeed (not pause).
     pause_schedule.tick_once()
     assert pause_schedule.status == py_trees.common.Status.SUCCESS
 
-    # Wait until we are inside the scheduled window, then tick.
-    sleep_until_window = (start_dt - datetime.datetime.now()).total_seconds() + 0.05
-    if sleep_until_window > 0:
-        time.sleep(sleep_until_window)
-
+    # Move inside the scheduled window, then tick.
+    clock.advance(3.05)
     pause_schedule.tick_once()
     assert pause_schedule.status == py_trees.common.Status.RUNNING
-    pause_start_ts = time.time()
+    pause_start_ts = clock.now()
 
     # Tick until SUCCESS and confirm the pause lasted ~3 seconds.
     while pause_schedule.status == py_trees.common.Status.RUNNING:
-        time.sleep(0.05)
+        clock.advance(0.05)
         pause_schedule.tick_once()
-    pause_duration = time.time() - pause_start_ts
+    pause_duration = clock.now() - pause_start_ts
     assert pause_schedule.status == py_trees.common.Status.SUCCESS
     assert 2.5 < pause_duration < 3.5, f'pause_duration={pause_duration}'
 
 
 def test_pause_schedule_rearms_after_window_end():
-    now = datetime.datetime.now().time()
+    now_dt = datetime.datetime.now()
+    if not datetime.time(0, 2, 0) < now_dt.time() < datetime.time(23, 58, 0):
+        now_dt = now_dt.replace(hour=12)
+    clock = SimulatedClock(start_datetime=now_dt)
+    now = now_dt.time()
     one_second_ago = (datetime.datetime.combine(datetime.date.today(), now) -
                       datetime.timedelta(seconds=1)).time()
     one_second_later = (datetime.datetime.combine(datetime.date.today(), now) +
@@ -108,14 +116,14 @@ def test_pause_schedule_rearms_after_window_end():
         'stop_plus_variance_time': one_second_later,
     }]
 
-    pause_schedule = PauseSchedule('pause_schedule', schedule)
+    pause_schedule = PauseSchedule('pause_schedule', schedule, clock=clock)
 
     # First tick in active window should pause (RUNNING).
     pause_schedule.tick_once()
     assert pause_schedule.status == py_trees.common.Status.RUNNING
 
     # Wait out the window and let it complete.
-    time.sleep(1.2)
+    clock.advance(1.2)
     pause_schedule.tick_once()
     assert pause_schedule.status == py_trees.common.Status.SUCCESS
 
@@ -138,6 +146,34 @@ def test_pause_schedule_rearms_after_window_end():
     assert pause_schedule.status == py_trees.common.Status.RUNNING
 
 
+class _MaxVariance:
+    def uniform(self, low, high):
+        return high
+
+
+def test_pause_schedule_nodes_share_a_schedule():
+    clock = SimulatedClock(start_datetime=datetime.datetime(2024, 1, 1, 10, 30, 0))
+    schedule = [{
+        'start_pause_time': datetime.time(10, 0, 0),
+        'stop_pause_time': datetime.time(11, 0, 0),
+        'variance_time': datetime.time(0, 45, 0),
+        'start_plus_variance_time': datetime.time(10, 0, 0),
+        'stop_plus_variance_time': datetime.time(11, 0, 0),
+    }]
+    first = PauseSchedule('first', schedule, clock=clock, rng=_MaxVariance())
+    second = PauseSchedule('second', schedule, clock=clock, rng=_MaxVariance())
+
+    first.tick_once()
+    assert first.status == py_trees.common.Status.RUNNING
+    assert schedule[0]['start_plus_variance_time'] == datetime.time(10, 45, 0)
+    second.tick_once()  # the re-sampled window no longer covers 10:30
+    assert second.status == py_trees.common.Status.SUCCESS
+
+    clock.advance(20 * 60)  # 10:50, inside the re-sampled window
+    second.tick_once()
+    assert second.status == py_trees.common.Status.RUNNING
+
+
 def test_pause_until_key():
     b = PauseUntilKey('pause_until_key', 'a', listener_factory=FakeKeyboardListener)
     b.tick_once()
@@ -218,3 +254,143 @@ def test_pause_pdf_empty_file_raises(tmp_path):
     fp.write_text('# only a comment\n\n')
     with pytest.raises(AssertionError):
         PausePDF('pause_pdf', str(fp))
+
+
+def test_pause_pdf_seed_is_reproducible(tmp_path):
+    fp = tmp_path / 'waits.txt'
+    _write_floats(fp, np.linspace(0.2, 1.0, 50).tolist())
+    pauses = []
+    for _ in range(2):
+        pause = PausePDF('pause_pdf', str(fp), kernel_bandwidth=0.05, pool_size=8, seed=7)
+        draws = []
+        for _ in range(20):
+            pause.initialise()
+            draws.append(pause._pause_t)
+        pauses.append(draws)
+    assert pauses[0] == pauses[1]
+
+
+def test_pause_pdf_draws_in_batches(tmp_path):
+    fp = tmp_path / 'waits.txt'
+    _write_floats(fp, np.linspace(0.5, 2.5, 40).tolist())
+    pause = PausePDF('pause_pdf', str(fp), kernel_bandwidth=0.3, min_t=1.4, max_t=1.6,
+                     pool_size=100, seed=0, backend='sklearn')
+    sample_calls = []
+    model = pause._sampler._model
+    model_sample = model.sample
+
+    def counting_sample(n_samples=1, random_state=None):
+        sample_calls.append(n_samples)
+        return model_sample(n_samples, random_state=random_state)
+
+    model.sample = counting_sample
+    for _ in range(100):
+        pause.initialise()
+        assert 1.4 <= pause._pause_t <= 1.6
+    # One refill covers all 100 entries despite the ~10% acceptance rate.
+    assert 1 <= len(sample_calls) <= 3
+
+
+def test_pause_pdf_unreachable_bounds_raise(tmp_path):
+    fp = tmp_path / 'waits.txt'
+    _write_floats(fp, [0.25] * 30)
+    pause = PausePDF('pause_pdf', str(fp), kernel_bandwidth=0.01, min_t=100.0, max_t=101.0, pool_size=4)
+    with pytest.raises(ValueError):
+        pause.initialise()
+
+
+def test_pause_pdf_numpy_backend_matches_sklearn(tmp_path):
+    fp = tmp_path / 'waits.txt'
+    _write_floats(fp, np.random.default_rng(0).normal(5.0, 2.0, size=500).tolist())
+    moments = {}
+    for backend in ('numpy', 'sklearn'):
+        pause = PausePDF('pause_pdf', str(fp), kernel_bandwidth=0.5, min_t=3.0, max_t=4.0,
+                         pool_size=20000, seed=1, backend=backend)
+        pause.initialise()
+        draws = np.asarray(pause._pool + [pause._pause_t])
+        assert draws.min() >= 3.0 and draws.max() <= 4.0
+        moments[backend] = (draws.mean(), draws.std())
+    assert abs(moments['numpy'][0] - moments['sklearn'][0]) < 0.01
+    assert abs(moments['numpy'][1] - moments['sklearn'][1]) < 0.01
+
+
+def test_kde_truncation_cache_is_bounded():
+    from py_branches import _kde
+    sampler = _kde.GaussianKDESampler(np.linspace(0.0, 10.0, 50), 0.5)
+    rng = np.random.default_rng(0)
+    for i in range(3 * _kde._MAX_TRUNCATIONS):
+        sampler.sample(4, rng, 0.0, 1.0)  # reused bounds stay cached
+        sampler.sample(4, rng, 0.1 * i, 0.1 * i + 5.0)
+    assert len(sampler._truncations) == _kde._MAX_TRUNCATIONS
+    assert (0.0, 1.0) in sampler._truncations
+
+
+def test_pause_pdf_invalid_backend_raises(tmp_path):
+    fp = tmp_path / 'waits.txt'
+    _write_floats(fp, [0.25] * 30)
+    with pytest.raises(ValueError):
+        PausePDF('pause_pdf', str(fp), backend='scipy')
+
+
+def test_pause_pdf_shares_cached_sampler(tmp_path):
+    fp = tmp_path / 'waits.txt'
+    _write_floats(fp, np.linspace(0.2, 1.0, 50).tolist())
+    a = PausePDF('a', str(fp), kernel_bandwidth=0.05)
+    b = PausePDF('b', str(fp), kernel_bandwidth=0.05)
+    c = PausePDF('c', str(fp), kernel_bandwidth=0.1)
+    assert a._sampler is b._sampler
+    assert a._sampler is not c._sampler
+
+    # Rewriting the file invalidates the cached entry.
+    _write_floats(fp, np.linspace(5.0, 6.0, 60).tolist())
+    os.utime(fp, ns=(0, os.stat(fp).st_mtime_ns + 10**9))
+    d = PausePDF('d', str(fp), kernel_bandwidth=0.05, min_t=0.0, max_t=100.0)
+    assert d._sampler is not a._sampler
+    d.initialise()
+    assert d._pause_t > 4.0
+
+    clear_pdf_cache()
+    e = PausePDF('e', str(fp), kernel_bandwidth=0.05)
+    assert e._sampler is not d._sampler
+
+
+def test_pause_pdf_loads_npy_memory_mapped(tmp_path):
+    fp = tmp_path / 'waits.npy'
+    np.save(fp, np.linspace(1.0, 2.0, 1000))
+    pause = PausePDF('pause_pdf', str(fp), kernel_bandwidth=0.05, min_t=1.0, max_t=2.0, seed=0)
+    # The sampler reads straight from the mapped file rather than a parsed copy.
+    assert not pause._sampler._samples.flags.owndata
+    for _ in range(10):
+        pause.initialise()
+        assert 1.0 <= pause._pause_t <= 2.0
+
+
+def _linear_schedule_match(schedule, now_time):
+    for idx, schedule_element in enumerate(schedule):
+        start = schedule_element['start_plus_variance_time']
+        stop = schedule_element['stop_plus_variance_time']
+        if (start < stop and start < now_time < stop) or \
+           (start > stop and (now_time > start or now_time < stop)):
+            return idx
+    return None
+
+
+def test_schedule_index_matches_linear_scan():
+    rng = random.Random(3)
+
+    def random_time():
+        return datetime.time(rng.randrange(24), rng.randrange(60), rng.randrange(60))
+
+    for _ in range(20):
+        schedule = []
+        for _ in range(rng.randrange(1, 30)):
+            start, stop = random_time(), random_time()
+            schedule.append({'start_plus_variance_time': start, 'stop_plus_variance_time': stop})
+        index = _ScheduleIndex(schedule)
+        probes = [datetime.time(0, 0, 0), datetime.time(23, 59, 59, 999999)]
+        for element in schedule:
+            probes += [element['start_plus_variance_time'], element['stop_plus_variance_time']]
+        probes += [random_time() for _ in range(200)]
+        for now_time in probes:
+            now_sec = now_time.hour*3600 + now_time.minute*60 + now_time.second + now_time.microsecond*1e-6
+            assert index.lookup(now_sec) == _linear_schedule_match(schedule, now_time), now_time
@@ -3,8 +3,13 @@
 import random
 random.seed(0)
 import py_trees
+import pytest
 
+from py_branches.random import BanditSelector
+from py_branches.random import MarkovSequencer
 from py_branches.random import RandomRun
+from py_branches.random import WeightedRandomSelector
+from py_branches.random import _AliasTable
 from py_branches.random import random_selector
 
 
@@ -127,4 +132,222 @@ def test_random_selector_locks_branch_while_running():
         assert ran_first ^ ran_second, (
             f'seed={seed}: exactly one branch should run per selection cycle, '
             f'but first._ticked={first._ticked} second._ticked={second._ticked}'
-        )
\ No newline at end of file
+        )
+
+def test_alias_table_matches_weights():
+    weights = [0.0, 1.0, 2.0, 7.0, 0.5, 0.0, 3.5]
+    table = _AliasTable(weights)
+    draws = 200000
+    counts = [0] * len(weights)
+    for i in range(draws):
+        counts[table.sample((i + 0.5) / draws)] += 1
+    total = sum(weights)
+    for count, weight in zip(counts, weights):
+        assert abs(count / draws - weight / total) < 1e-3
+
+
+def test_weighted_random_selector_distribution():
+    random.seed(1)
+    children = [py_trees.behaviours.Success(f'c{i}') for i in range(200)]
+    weights = [float(i % 4) for i in range(200)]
+    selector = WeightedRandomSelector('selector', children, weights)
+
+    counts = {}
+    for _ in range(20000):
+        selector.tick_once()
+        counts[selector.current_child.name] = counts.get(selector.current_child.name, 0) + 1
+        assert selector.status == py_trees.common.Status.SUCCESS
+    assert all(int(name[1:]) % 4 != 0 for name in counts)
+    by_weight = {w: sum(c for name, c in counts.items() if int(name[1:]) % 4 == w) for w in (1, 2, 3)}
+    assert abs(by_weight[1] / 20000 - 1 / 6) < 0.02
+    assert abs(by_weight[3] / 20000 - 3 / 6) < 0.02
+
+
+def test_weighted_random_selector_holds_running_child_and_returns_its_result():
+    running = _RunningThenSuccess('running', 1)
+    failure = py_trees.behaviours.Failure('failure')
+    selector = WeightedRandomSelector('selector', [running, failure], [1.0, 0.0])
+
+    selector.tick_once()
+    assert selector.status == py_trees.common.Status.RUNNING
+    selector.set_weights([0.0, 1.0])  # does not interrupt the running child
+    selector.tick_once()
+    assert selector.status == py_trees.common.Status.SUCCESS
+    assert running.status == py_trees.common.Status.SUCCESS
+
+    selector.tick_once()
+    assert selector.current_child is failure
+    assert selector.status == py_trees.common.Status.FAILURE
+    assert running.status == py_trees.common.Status.INVALID
+
+
+def test_weighted_random_selector_tracks_child_changes():
+    a = py_trees.behaviours.Success('a')
+    b = py_trees.behaviours.Success('b')
+    c = py_trees.behaviours.Success('c')
+    selector = WeightedRandomSelector('selector', [a], [0.0])
+    selector.add_child(b, 2.0)
+    selector.prepend_child(c, 3.0)
+    assert selector.weights == [3.0, 0.0, 2.0]
+
+    selector.set_weight(c, 0.0)
+    selector.tick_once()
+    assert selector.current_child is b
+
+    d = py_trees.behaviours.Success('d')
+    selector.replace_child(b, d)
+    assert selector.weights == [0.0, 0.0, 2.0]
+    selector.tick_once()
+    assert selector.current_child is d
+
+    selector.remove_child(d)
+    with pytest.raises(ValueError):
+        selector.tick_once()
+    with pytest.raises(ValueError):
+        selector.set_weight(a, -1.0)
+    with pytest.raises(ValueError):
+        WeightedRandomSelector('bad', [a], [1.0, 2.0])
+
+    empty = WeightedRandomSelector('empty')
+    empty.tick_once()
+    assert empty.status == py_trees.common.Status.FAILURE
+
+
+class _FixedResult(py_trees.behaviour.Behaviour):
+    def __init__(self, name, succeed):
+        super().__init__(name=name)
+        self.succeed = succeed
+        self.ticks = 0
+
+    def update(self):
+        self.ticks += 1
+        return py_trees.common.Status.SUCCESS if self.succeed else py_trees.common.Status.FAILURE
+
+
+@pytest.mark.parametrize('strategy', ['thompson', 'epsilon_greedy', 'ucb1'])
+def test_bandit_selector_learns_to_avoid_failing_children(strategy):
+    random.seed(0)
+    children = [_FixedResult('fail_a', False), _FixedResult('good', True), _FixedResult('fail_b', False)]
+    selector = BanditSelector('bandit', children, strategy=strategy)
+    for _ in range(300):
+        selector.tick_once()
+        assert selector.status == children[selector._current_index].status
+
+    assert children[1].ticks > 250
+    assert selector.statistics()['good'] == (children[1].ticks, 0)
+    assert selector.expected_success().argmax() == 1
+
+
+def test_bandit_selector_ucb1_tries_every_child_first():
+    children = [_FixedResult(str(i), True) for i in range(4)]
+    selector = BanditSelector('bandit', children, strategy='ucb1')
+    for _ in range(4):
+        selector.tick_once()
+    assert [child.ticks for child in children] == [1, 1, 1, 1]
+
+
+def test_bandit_selector_holds_running_child():
+    slow = _RunningThenSuccess('slow', running_ticks=2)
+    selector = BanditSelector('bandit', [slow, _FixedResult('other', True)], strategy='epsilon_greedy', epsilon=0.0)
+    selector.tick_once()
+    selector.tick_once()
+    assert selector.status == py_trees.common.Status.RUNNING
+    assert selector.successes.sum() == 0
+    selector.tick_once()
+    assert selector.status == py_trees.common.Status.SUCCESS
+    assert selector.statistics()['slow'] == (1, 0)
+
+
+def test_bandit_selector_statistics_persist_by_name(tmp_path):
+    path = str(tmp_path / 'bandit.npz')
+    first = BanditSelector('bandit', [_FixedResult('a', True), _FixedResult('b', False)],
+                           strategy='ucb1', statistics_path=path)
+    first.setup()  # nothing saved yet
+    for _ in range(10):
+        first.tick_once()
+    first.shutdown()
+
+    second = BanditSelector('bandit', [_FixedResult('new', True), _FixedResult('b', False), _FixedResult('a', True)],
+                            strategy='ucb1', statistics_path=path)
+    second.setup()
+    assert second.statistics() == {'new': (0, 0), 'b': first.statistics()['b'], 'a': first.statistics()['a']}
+    assert second.load_statistics(path) == 2
+
+
+def test_bandit_selector_statistics_path_without_extension(tmp_path):
+    path = str(tmp_path / 'stats')
+    first = BanditSelector('bandit', [_FixedResult('a', True), _FixedResult('b', False)],
+                           strategy='ucb1', statistics_path=path)
+    for _ in range(6):
+        first.tick_once()
+    first.shutdown()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['stats']
+
+    second = BanditSelector('bandit', [_FixedResult('a', True), _FixedResult('b', False)],
+                            strategy='ucb1', statistics_path=path)
+    second.setup()
+    assert second.statistics() == first.statistics() == {'a': (5, 0), 'b': (0, 1)}
+
+
+def test_bandit_selector_tracks_child_changes():
+    a, b, c = (_FixedResult(name, True) for name in 'abc')
+    selector = BanditSelector('bandit', [a, b])
+    selector.record(b, success=False)
+    selector.insert_child(c, 0)
+    assert selector.statistics() == {'c': (0, 0), 'a': (0, 0), 'b': (0, 1)}
+    selector.remove_child(a)
+    assert selector.failures.tolist() == [0.0, 1.0]
+    with pytest.raises(ValueError):
+        BanditSelector('bandit', strategy='greedy')
+
+
+def _walk(sequencer, entries):
+    names = []
+    for _ in range(entries):
+        sequencer.tick_once()
+        names.append(sequencer.current_child.name)
+    return names
+
+
+def test_markov_sequencer_follows_transitions():
+    children = [_FixedResult(name, True) for name in 'abc']
+    sequencer = MarkovSequencer('plan', children, [[0, 4, 1], [1, 0, 0], [1, 0, 0]], start='b', seed=3)
+    names = _walk(sequencer, 2000)
+    assert names[0] == 'b'
+    pairs = list(zip(names, names[1:]))
+    assert all(after == 'a' for before, after in pairs if before == 'b')
+    after_a = [after for before, after in pairs if before == 'a']
+    assert 'a' not in after_a
+    assert after_a.count('b') / len(after_a) == pytest.approx(0.8, abs=0.05)
+
+
+def test_markov_sequencer_is_seedable():
+    def run(seed):
+        children = [_FixedResult(str(i), True) for i in range(200)]
+        transitions = [[(i * j) % 5 + 1 for j in range(200)] for i in range(200)]
+        return _walk(MarkovSequencer('plan', children, transitions, seed=seed), 100)
+
+    assert run(1) == run(1)
+    assert run(1) != run(2)
+
+
+def test_markov_sequencer_loads_named_transitions(tmp_path):
+    filepath = tmp_path / 'plan.yaml'
+    filepath.write_text('a: {b: 1}\nb: {a: 1}\n')
+    children = [_FixedResult('a', True), _FixedResult('b', False)]
+    sequencer = MarkovSequencer('plan', children, str(filepath))
+    assert _walk(sequencer, 4) == ['a', 'b', 'a', 'b']
+    assert sequencer.status == py_trees.common.Status.FAILURE
+    assert sequencer.transition_probabilities() == [[0.0, 1.0], [1.0, 0.0]]
+
+    numpy = pytest.importorskip('numpy')
+    npy = str(tmp_path / 'plan.npy')
+    numpy.save(npy, numpy.array([[1.0, 1.0], [0.0, 2.0]]))
+    sequencer.set_transitions(npy)
+    sequencer.state = 'b'
+    assert _walk(sequencer, 3) == ['b', 'b', 'b']
+
+    with pytest.raises(ValueError):
+        sequencer.set_transitions([[1.0, 0.0], [0.0, 0.0]])
+    with pytest.raises(ValueError):
+        MarkovSequencer('plan', [_FixedResult('c', True)], [[1.0, 1.0]])
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+import random
+
+import py_trees
+import pytest
+
+from py_branches.alternating import RunEveryX
+from py_branches.random import RandomRun
+from py_branches.random import WeightedRandomSelector
+from py_branches.rng import RandomStream
+from py_branches.rng import set_tree_rng
+
+
+def test_stream_is_reproducible_across_block_boundaries():
+    a = RandomStream(seed=7, block_size=3)
+    b = RandomStream(seed=7, block_size=1000)
+    assert [a.random() for _ in range(10)] == [b.random() for _ in range(10)]
+    assert all(0.0 <= x < 1.0 for x in (a.random() for _ in range(100)))
+
+
+def test_stream_uniform_and_randint_ranges():
+    rng = RandomStream(seed=1)
+    assert all(2.0 <= rng.uniform(2.0, 5.0) <= 5.0 for _ in range(1000))
+    draws = {rng.randint(3, 5) for _ in range(1000)}
+    assert draws == {3, 4, 5}
+    assert rng.randint(4, 4) == 4
+    with pytest.raises(ValueError):
+        rng.randint(5, 3)
+
+
+def test_spawned_streams_are_independent_and_reproducible():
+    parent = RandomStream(seed=3)
+    first, second = parent.spawn(), parent.spawn()
+    assert [first.random() for _ in range(5)] != [second.random() for _ in range(5)]
+
+    again = RandomStream(seed=3)
+    assert again.spawn().random() == RandomStream(seed=3).spawn().random()
+
+
+def _build_tree():
+    children = [py_trees.behaviours.Success(str(i)) for i in range(3)]
+    selector = WeightedRandomSelector('selector', children=children, weights=[1, 2, 3])
+    run = RandomRun(selector, 'run', 0.5)
+    root = py_trees.composites.Sequence('root', memory=False, children=[run])
+    return root, selector, run
+
+
+def _trace(seed, ticks=50):
+    root, selector, run = _build_tree()
+    assert set_tree_rng(root, RandomStream(seed), spawn=True) == 2
+    trace = []
+    for _ in range(ticks):
+        root.tick_once()
+        trace.append((run.status, selector._current_index))
+    return trace
+
+
+def test_set_tree_rng_makes_tree_reproducible():
+    assert _trace(11) == _trace(11)
+    assert _trace(11) != _trace(12)
+
+
+def test_behaviors_default_to_global_random_and_accept_rng():
+    run = RandomRun(py_trees.behaviours.Success('s'), 'run', 0.5)
+    assert run.rng is random
+
+    rng = RandomStream(seed=5)
+    every = RunEveryX(py_trees.behaviours.Success('s'), 'every', (2, 4), rng=rng)
+    assert every.rng is rng
+
+
+def _every_x_trace(global_seed, ticks=40):
+    random.seed(global_seed)
+    leaf = py_trees.behaviours.Success('s')
+    every = RunEveryX(leaf, 'every', (1, 6))
+    set_tree_rng(every, RandomStream(123))
+    trace = []
+    for _ in range(ticks):
+        every.tick_once()
+        trace.append(leaf.status)
+    return trace
+
+
+def test_run_every_x_first_draw_uses_installed_rng():
+    assert _every_x_trace(1) == _every_x_trace(2)
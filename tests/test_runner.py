@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+import threading
+import time
+
+import py_trees
+
+from py_branches.clock import MonotonicClock
+from py_branches.clock import SimulatedClock
+from py_branches.clock import TickClock
+from py_branches.clock import set_tree_clock
+from py_branches.cooldown import Cooldown
+from py_branches.pause import PauseUniform
+from py_branches.retry import Retry
+from py_branches.runner import EventDrivenRunner
+
+
+_r = py_trees.common.Status.RUNNING
+_s = py_trees.common.Status.SUCCESS
+
+
+class _CountingSuccess(py_trees.behaviour.Behaviour):
+    def __init__(self, name):
+        super().__init__(name=name)
+        self.ticks = 0
+
+    def update(self):
+        self.ticks += 1
+        return _s
+
+
+class _Toggle(py_trees.behaviour.Behaviour):
+    def __init__(self, name):
+        super().__init__(name=name)
+        self.passing = True
+
+    def update(self):
+        return _s if self.passing else py_trees.common.Status.FAILURE
+
+
+def test_runner_sleeps_until_pause_ends():
+    clock = SimulatedClock()
+    pause = PauseUniform('pause', 30.0, 30.0, clock=clock)
+    tree = py_trees.trees.BehaviourTree(pause)
+    runner = EventDrivenRunner(tree, clock=clock, poll_period=0.01)
+
+    ticks = runner.run(until=lambda t: pause.status == _s)
+    assert ticks == 2  # enter the pause, then wake exactly at its end
+    assert clock.now() == 30.0
+
+
+def test_runner_wakes_for_cooldown_expiry():
+    clock = SimulatedClock()
+    child = _CountingSuccess('child')
+    cooldown = Cooldown(child, name='cooldown', duration=10.0, clock=clock)
+    tree = py_trees.trees.BehaviourTree(cooldown)
+    runner = EventDrivenRunner(tree, clock=clock, idle_period=None)
+
+    runner.run(num_ticks=4)
+    assert child.ticks == 4
+    assert clock.now() == 30.0
+
+
+def test_runner_ignores_deadlines_of_branches_no_longer_ticked():
+    clock = SimulatedClock()
+    condition = _Toggle('condition')
+    child = _CountingSuccess('child')
+    retry = Retry(py_trees.behaviours.Failure('flaky'), name='retry', max_attempts=3, delay=2.0, clock=clock)
+    cooldown = Cooldown(child, name='cooldown', duration=5.0, clock=clock)
+    root = py_trees.composites.Sequence('root', memory=False, children=[condition, cooldown, retry])
+    runner = EventDrivenRunner(py_trees.trees.BehaviourTree(root), clock=clock, idle_period=100.0)
+
+    runner.tick()
+    assert runner.next_wakeup() == 2.0  # retry delay, then the cooldown at 5.0
+    condition.passing = False
+    clock.advance(10.0)
+    runner.tick()
+    assert retry.status == py_trees.common.Status.INVALID
+    assert runner.next_wakeup() is None  # neither past deadline makes the runner spin
+    assert not runner.sleep() and clock.now() == 110.0
+
+
+def test_runner_polls_running_leaves_without_deadline():
+    clock = SimulatedClock()
+    running = py_trees.behaviours.Running(name='running')
+    tree = py_trees.trees.BehaviourTree(running)
+    runner = EventDrivenRunner(tree, clock=clock, poll_period=0.5)
+
+    runner.run(num_ticks=3)
+    assert clock.now() == 1.0
+
+
+def test_runner_next_wakeup_is_earliest_deadline():
+    clock = SimulatedClock()
+    long_pause = PauseUniform('long', 20.0, 20.0)
+    short_pause = PauseUniform('short', 5.0, 5.0)
+    root = py_trees.composites.Parallel(
+        'root', policy=py_trees.common.ParallelPolicy.SuccessOnAll(), children=[long_pause, short_pause])
+    set_tree_clock(root, clock)
+    runner = EventDrivenRunner(py_trees.trees.BehaviourTree(root), clock=clock)
+
+    runner.tick()
+    assert runner.next_wakeup() == 5.0
+    clock.advance(5.0)
+    runner.tick()
+    assert runner.next_wakeup() == 20.0
+
+
+def test_runner_wake_interrupts_sleep():
+    clock = TickClock(MonotonicClock())
+    child = _CountingSuccess('child')
+    tree = py_trees.trees.BehaviourTree(child)
+    runner = EventDrivenRunner(tree, clock=clock, idle_period=None)
+
+    waker = threading.Timer(0.05, runner.stop)
+    start = time.monotonic()
+    waker.start()
+    runner.run()
+    waker.join()
+    assert time.monotonic() - start < 2.0
+    assert child.ticks == 1
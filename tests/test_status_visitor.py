@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+import logging
+
+import py_trees
+
+from py_branches.visitors import BatchStatusTransitionVisitor
+from py_branches.visitors import StatusTransitionVisitor
+
+
+def _build_tree():
+    a = py_trees.behaviours.Success('a')
+    b = py_trees.behaviours.TickCounter('b', 2, py_trees.common.Status.SUCCESS)
+    c = py_trees.behaviours.Running('c')
+    root = py_trees.composites.Parallel(
+        'root', policy=py_trees.common.ParallelPolicy.SuccessOnAll(), children=[a, b, c])
+    return py_trees.trees.BehaviourTree(root)
+
+
+def _messages(caplog):
+    return [r.getMessage() for r in caplog.records if r.name == 'py_branches.visitors']
+
+
+def test_batch_visitor_logs_one_record_per_tick(caplog):
+    caplog.set_level(logging.INFO, logger='py_branches.visitors')
+    tree = _build_tree()
+    tree.add_visitor(BatchStatusTransitionVisitor())
+
+    tree.tick()
+    messages = _messages(caplog)
+    assert len(messages) == 1
+    lines = messages[0].split('\n')
+    assert len(lines) == 3
+    assert '[a] SUCCESS' in lines[0]
+    assert '[b] RUNNING' in lines[1]
+    assert '[c] RUNNING' in lines[2]
+
+
+def test_batch_visitor_only_logs_transitions(caplog):
+    caplog.set_level(logging.INFO, logger='py_branches.visitors')
+    tree = _build_tree()
+    tree.add_visitor(BatchStatusTransitionVisitor())
+
+    tree.tick()
+    caplog.clear()
+    tree.tick()
+    assert _messages(caplog) == []  # a, b and c unchanged
+
+    tree.tick()
+    messages = _messages(caplog)
+    assert len(messages) == 1
+    assert '[b] SUCCESS' in messages[0]
+    assert '[a]' not in messages[0]
+
+
+def test_batch_visitor_matches_per_node_visitor(caplog):
+    caplog.set_level(logging.INFO, logger='py_branches.visitors')
+    batch_tree = _build_tree()
+    batch_tree.add_visitor(BatchStatusTransitionVisitor())
+    for _ in range(4):
+        batch_tree.tick()
+    batch_lines = [line for message in _messages(caplog) for line in message.split('\n')]
+
+    caplog.clear()
+    plain_tree = _build_tree()
+    plain_tree.add_visitor(StatusTransitionVisitor())
+    for _ in range(4):
+        plain_tree.tick()
+    assert batch_lines == _messages(caplog)
+
+
+def test_batch_visitor_skips_invalid_and_reuses_indices(caplog):
+    caplog.set_level(logging.INFO, logger='py_branches.visitors')
+    success = py_trees.behaviours.Success('s')
+    visitor = BatchStatusTransitionVisitor()
+
+    visitor.run(success)  # INVALID before the first tick
+    visitor.finalise()
+    assert _messages(caplog) == []
+
+    success.tick_once()
+    visitor.initialise()
+    visitor.run(success)
+    visitor.finalise()
+    assert len(_messages(caplog)) == 1
+    assert len(visitor._behaviours) == 1
+
+    visitor.reset()
+    assert len(visitor._behaviours) == 0
+
+
+def test_batch_visitor_quiet_when_level_disabled(caplog):
+    caplog.set_level(logging.WARNING, logger='py_branches.visitors')
+    tree = _build_tree()
+    visitor = BatchStatusTransitionVisitor(level=logging.DEBUG)
+    tree.add_visitor(visitor)
+
+    tree.tick()
+    assert _messages(caplog) == []
+    assert bytes(visitor._last) != b'\xff\xff\xff'  # statuses are still tracked
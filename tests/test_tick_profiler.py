@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+import time
+
+import py_trees
+
+from py_branches.visitors import TickProfiler
+
+
+_s = py_trees.common.Status.SUCCESS
+
+
+class _Busy(py_trees.behaviour.Behaviour):
+    def __init__(self, name, busy_s):
+        super().__init__(name=name)
+        self.busy_s = busy_s
+
+    def update(self):
+        end = time.perf_counter() + self.busy_s
+        while time.perf_counter() < end:
+            pass
+        return _s
+
+
+def _build_tree():
+    fast = _Busy('fast', 0.001)
+    slow = _Busy('slow', 0.004)
+    inverter = py_trees.decorators.Inverter('inverter', _Busy('inner', 0.002))
+    root = py_trees.composites.Parallel(
+        'root', policy=py_trees.common.ParallelPolicy.SuccessOnOne(), children=[fast, slow, inverter])
+    return py_trees.trees.BehaviourTree(root)
+
+
+def test_profiler_inclusive_and_exclusive_times():
+    tree = _build_tree()
+    profiler = TickProfiler()
+    profiler.attach(tree.root)
+    for _ in range(5):
+        tree.tick()
+
+    rows = {row['name']: row for row in profiler.snapshot()}
+    assert all(row['ticks'] == 5 for row in rows.values())
+    assert rows['slow']['exclusive_ns'] >= 5 * 4_000_000
+    assert rows['fast']['exclusive_ns'] >= 5 * 1_000_000
+    assert rows['inverter']['inclusive_ns'] >= rows['inner']['inclusive_ns']
+    assert rows['inverter']['exclusive_ns'] < rows['inner']['exclusive_ns']
+
+    root = rows['root']
+    children = sum(rows[name]['inclusive_ns'] for name in ('fast', 'slow', 'inverter'))
+    assert root['inclusive_ns'] == root['exclusive_ns'] + children
+    assert profiler.snapshot()[0]['name'] == 'slow'
+
+
+def test_profiler_detach_and_reset():
+    tree = _build_tree()
+    profiler = TickProfiler()
+    profiler.attach(tree.root)
+    tree.tick()
+    profiler.detach()
+    tree.tick()
+
+    assert all('tick' not in node.__dict__ for node in tree.root.iterate())
+    assert all(row['ticks'] == 1 for row in profiler.snapshot())
+    assert tree.count == 2
+
+    profiler.reset()
+    assert all(row['ticks'] == 0 and row['inclusive_ns'] == 0 for row in profiler.snapshot())
+
+
+def test_profiler_reattach_after_detach():
+    tree = _build_tree()
+    profiler = TickProfiler()
+    profiler.attach(tree.root)
+    tree.tick()
+    profiler.detach()
+    tree.tick()
+    profiler.attach(tree.root)
+    profiler.attach(tree.root)  # already attached; must not wrap twice
+    tree.tick()
+
+    assert all(row['ticks'] == 2 for row in profiler.snapshot())
+    profiler.detach()
+    assert all('tick' not in node.__dict__ for node in tree.root.iterate())
+
+
+def test_profiler_writes_collapsed_stacks(tmp_path):
+    tree = _build_tree()
+    profiler = TickProfiler()
+    profiler.attach(tree.root)
+    tree.tick()
+
+    filepath = tmp_path / 'tree.folded'
+    profiler.write_collapsed(str(filepath))
+    stacks = {}
+    for line in filepath.read_text().splitlines():
+        stack, value = line.rsplit(' ', 1)
+        stacks[stack] = int(value)
+    assert stacks['root;slow'] >= 4000
+    assert stacks['root;inverter;inner'] >= 2000
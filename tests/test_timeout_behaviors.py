@@ -1,8 +1,8 @@
 #!/usr/bin/env python
 
-import time
 import py_trees
 
+from py_branches.clock import SimulatedClock
 from py_branches.timeout import Timeout
 
 
@@ -70,12 +70,13 @@ def test_timeout_expires_while_running():
     '''Child stays RUNNING past the timeout; Timeout returns FAILURE.'''
     child = RunningThenBehavior('child', run_ticks=100, final_status=_s)
     duration = 0.05
-    timeout = Timeout(child, name='timeout', duration=duration)
+    clock = SimulatedClock()
+    timeout = Timeout(child, name='timeout', duration=duration, clock=clock)
 
     timeout.tick_once()
     assert timeout.status == _r
 
-    time.sleep(duration + 0.01)
+    clock.advance(duration + 0.01)
 
     timeout.tick_once()
     assert timeout.status == _f
@@ -86,12 +87,13 @@ def test_timeout_resets_on_reinitialise():
     '''After a timeout, the timer resets when the decorator is re-entered.'''
     child = RunningThenBehavior('child', run_ticks=100, final_status=_s)
     duration = 0.05
-    timeout = Timeout(child, name='timeout', duration=duration)
+    clock = SimulatedClock()
+    timeout = Timeout(child, name='timeout', duration=duration, clock=clock)
 
     # First run: let the timeout expire
     timeout.tick_once()
     assert timeout.status == _r
-    time.sleep(duration + 0.01)
+    clock.advance(duration + 0.01)
     timeout.tick_once()
     assert timeout.status == _f
 
@@ -102,5 +104,6 @@ def test_timeout_resets_on_reinitialise():
     timeout.tick_once()
     assert timeout.status == _r  # not timed out on fresh entry
 
+    clock.advance(5.0)
     timeout.tick_once()
     assert timeout.status == _r  # still RUNNING, well within 10s
@@ -5,8 +5,11 @@ import time
 import random
 
 import py_trees
+import pytest
 
+from py_branches.clock import SimulatedClock
 from py_branches.pause import PauseUniform
+from py_branches.visitors import DurationStats
 from py_branches.visitors import TimerVisitor
 
 
@@ -26,7 +29,7 @@ def test_timer_visitor_measures_pause_uniform_running_duration(caplog):
     caplog.set_level(logging.INFO, logger='py_branches.visitors')
     random.seed(0)
     pause = PauseUniform('pause', 0.2, 0.3)
-    visitor = TimerVisitor()
+    visitor = TimerVisitor(log_completions=True)
 
     while pause.status != py_trees.common.Status.SUCCESS:
         pause.tick_once()
@@ -43,7 +46,7 @@ def test_timer_visitor_measures_pause_uniform_running_duration(caplog):
 def test_timer_visitor_does_not_log_for_never_running_behaviour(caplog):
     caplog.set_level(logging.INFO, logger='py_branches.visitors')
     success = py_trees.behaviours.Success('s')
-    visitor = TimerVisitor()
+    visitor = TimerVisitor(log_completions=True)
 
     success.tick_once()
     visitor.run(success)
@@ -54,7 +57,7 @@ def test_timer_visitor_does_not_log_for_never_running_behaviour(caplog):
 def test_timer_visitor_accumulates_across_running_ticks(caplog):
     caplog.set_level(logging.INFO, logger='py_branches.visitors')
     counter = py_trees.behaviours.TickCounter('tc', 3, py_trees.common.Status.SUCCESS)
-    visitor = TimerVisitor()
+    visitor = TimerVisitor(log_completions=True)
 
     sleep_per_tick = 0.1
     while counter.status != py_trees.common.Status.SUCCESS:
@@ -75,7 +78,7 @@ def test_timer_visitor_integrates_with_behaviour_tree(caplog):
     random.seed(1)
     pause = PauseUniform('pause', 0.1, 0.2)
     tree = py_trees.trees.BehaviourTree(pause)
-    visitor = TimerVisitor()
+    visitor = TimerVisitor(log_completions=True)
     tree.add_visitor(visitor)
 
     while pause.status != py_trees.common.Status.SUCCESS:
@@ -87,3 +90,71 @@ def test_timer_visitor_integrates_with_behaviour_tree(caplog):
     duration = _extract_duration(caplog, 'pause')
     assert duration is not None
     assert 0.05 < duration < 0.35, f'duration={duration}'
+
+
+def _run_for(visitor, clock, behaviour, duration):
+    behaviour.status = py_trees.common.Status.RUNNING
+    visitor.run(behaviour)
+    clock.advance(duration)
+    behaviour.status = py_trees.common.Status.SUCCESS
+    visitor.run(behaviour)
+
+
+def test_timer_visitor_accumulates_stats_without_logging(caplog):
+    caplog.set_level(logging.INFO, logger='py_branches.visitors')
+    clock = SimulatedClock()
+    behaviour = py_trees.behaviours.Success('b')
+    visitor = TimerVisitor(clock=clock)
+
+    for duration in range(1, 101):
+        _run_for(visitor, clock, behaviour, duration / 100.0)
+
+    assert caplog.records == []
+    stats = visitor.stats(behaviour)
+    assert stats.count == 100
+    assert stats.min == pytest.approx(0.01)
+    assert stats.max == pytest.approx(1.0)
+    assert stats.mean == pytest.approx(0.505)
+    assert stats.quantile(0.5) == pytest.approx(0.505, rel=0.02)
+    assert stats.quantile(0.95) == pytest.approx(0.95, rel=0.02)
+    assert stats.quantile(0.99) == pytest.approx(0.99, rel=0.02)
+
+
+def test_timer_visitor_snapshot_and_dump(caplog):
+    caplog.set_level(logging.INFO, logger='py_branches.visitors')
+    clock = SimulatedClock()
+    fast = py_trees.behaviours.Success('fast')
+    slow = py_trees.behaviours.Success('slow')
+    visitor = TimerVisitor(clock=clock)
+
+    _run_for(visitor, clock, fast, 0.0)
+    _run_for(visitor, clock, slow, 2.0)
+    _run_for(visitor, clock, slow, 4.0)
+
+    rows = {row['name']: row for row in visitor.snapshot()}
+    assert rows['fast']['count'] == 1
+    assert rows['fast']['p99'] == 0.0
+    assert rows['slow']['count'] == 2
+    assert rows['slow']['total'] == pytest.approx(6.0)
+    assert rows['slow']['id'] == slow.id
+
+    text = visitor.dump()
+    assert len(caplog.records) == 1
+    assert text.split('\n')[1].startswith('slow')
+
+    visitor.reset_stats()
+    assert visitor.snapshot() == []
+    assert visitor.stats(slow) is None
+
+
+def test_duration_stats_quantile_accuracy():
+    rng = random.Random(3)
+    durations = [rng.lognormvariate(-3.0, 1.5) for _ in range(5000)]
+    stats = DurationStats()
+    for duration in durations:
+        stats.add(duration)
+    durations.sort()
+    for q in (0.5, 0.95, 0.99):
+        exact = durations[int(q * (len(durations) - 1))]
+        assert stats.quantile(q) == pytest.approx(exact, rel=0.011)
+    assert len(stats._buckets) < 2000